@@ -0,0 +1,38 @@
+"""Сравнение скорости чтения .csv в DataSet: csv.reader против MmapCsvReader
+
+MmapCsvReader быстрее только на файлах с лишними широкими столбцами, на узких файлах быстрее csv.reader
+
+Запуск из корня репозитория: python Benchmarks/csv_reader.py <файл .csv> [количество повторов]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from DataSet import DataSet
+
+
+def measure(file_name: str, backend: str, repeat: int) -> tuple:
+    """Лучшее время полного чтения очищенных строк файла
+
+    :param file_name: Имя файла
+    :param backend: Способ чтения DataSet
+    :param repeat: Количество повторов
+    :return: Кортеж (время в секундах, количество строк)
+    """
+    best, count = float('inf'), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = sum(1 for _ in DataSet(file_name, '', 0, 9999, is_stream=True, backend=backend).iter_rows())
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+if __name__ == '__main__':
+    file_name = sys.argv[1]
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    size = os.path.getsize(file_name) / (1 << 20)
+    for backend in ('csv', 'mmap'):
+        seconds, count = measure(file_name, backend, repeat)
+        print(f'{backend}: {seconds:.2f} с, {count} строк, {size / seconds:.1f} МБ/с')
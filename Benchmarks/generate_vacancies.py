@@ -0,0 +1,80 @@
+"""Детерминированный генератор .csv вакансий со схемой реальной выгрузки
+
+Одинаковые количество строк и seed всегда дают побайтно одинаковый файл. Даты публикации идут по возрастанию
+с 2003 по 2022 год, как в выгрузке, поэтому каждая профессия встречается в каждом году уже на 10 тыс. строк.
+Часть строк содержит html теги, лишние пробелы, переносы строк и пустые оклады, которые DataSet отбрасывает.
+Строки пишутся порциями, память не растёт с размером файла
+
+Запуск из корня репозитория: python Benchmarks/generate_vacancies.py <файл .csv> <количество строк> [seed]
+"""
+import csv
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+titles = ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
+names = ['Программист Python', 'Аналитик данных', 'Системный администратор', 'Менеджер по продажам',
+         'Ведущий аналитик', 'Программист 1С', 'Водитель категории B', 'Бухгалтер', 'Инженер-конструктор',
+         'Специалист службы поддержки', 'Frontend-разработчик', 'Оператор call-центра']
+areas = ['Москва'] * 12 + ['Санкт-Петербург'] * 5 + ['Екатеринбург', 'Казань', 'Новосибирск', 'Нижний Новгород',
+                                                       'Краснодар', 'Самара', 'Воронеж', 'Челябинск', 'Курган',
+                                                       'Тюмень', 'Омск', 'Пермь', 'Уфа', 'Томск']
+currencies = ['RUR'] * 40 + ['USD', 'USD', 'EUR', 'KZT', 'UAH', 'BYR', 'AZN', 'UZS', 'KGS', 'GEL']
+first_date = datetime(2003, 1, 1, tzinfo=timezone(timedelta(hours=3)))
+last_date = datetime(2022, 12, 31, 23, 59, 59, tzinfo=timezone(timedelta(hours=3)))
+batch_size = 10000
+
+
+def generate_rows(count: int, seed=42):
+    """Генератор строк вакансий
+
+    :param count: Количество строк
+    :param seed: Начальное значение генератора случайных чисел
+    :return: Генератор списков значений в порядке titles
+    >>> list(generate_rows(3)) == list(generate_rows(3))
+    True
+    >>> [row[5][:4] for row in generate_rows(2)]
+    ['2003', '2022']
+    """
+    rnd = random.Random(seed)
+    step = (last_date - first_date) / max(count - 1, 1)
+    for index in range(count):
+        name = rnd.choice(names)
+        salary_from = rnd.randint(2, 40) * 5000
+        salary_to = salary_from + rnd.randint(0, 12) * 5000
+        salary_from, salary_to = f'{salary_from}.0', f'{salary_to}.0'
+        area_name = rnd.choice(areas)
+        noise = rnd.random()
+        if noise < 0.02:
+            salary_from = ''
+        elif noise < 0.04:
+            salary_to = ''
+        elif noise < 0.06:
+            name = f'<b>{name}</b>'
+        elif noise < 0.07:
+            name = name.replace(' ', '\n', 1)
+        elif noise < 0.08:
+            area_name = f' {area_name} '
+        published_at = first_date + step * index
+        yield [name, salary_from, salary_to, rnd.choice(currencies), area_name,
+               published_at.strftime('%Y-%m-%dT%H:%M:%S%z')]
+
+
+def write_vacancies(file_name: str, count: int, seed=42):
+    """Запись .csv вакансий порциями по batch_size строк
+
+    :param file_name: Имя файла
+    :param count: Количество строк
+    :param seed: Начальное значение генератора случайных чисел
+    :return:
+    """
+    rows = generate_rows(count, seed)
+    with open(file_name, 'w', encoding='utf-8-sig', newline='') as write_file:
+        writer = csv.writer(write_file)
+        writer.writerow(titles)
+        for _ in range(0, count, batch_size):
+            writer.writerows(row for _, row in zip(range(batch_size), rows))
+
+
+if __name__ == '__main__':
+    write_vacancies(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]) if len(sys.argv) > 3 else 42)
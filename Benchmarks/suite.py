@@ -0,0 +1,208 @@
+"""Набор замеров производительности на синтетических данных generate_vacancies.py
+
+Результат сохраняется в .json вместе с коммитом, версией Python и параметрами данных, два результата
+сравниваются ключом --compare.
+
+Запуск из корня репозитория:
+    python Benchmarks/suite.py [--rows 10000] [--repeat 3] [--output файл.json]
+    python Benchmarks/suite.py --compare старый.json новый.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from functools import lru_cache
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Benchmarks.generate_vacancies import write_vacancies
+from DataSet import DataSet
+from DateIndex import DateIndex
+from InputConnect import InputConnect
+from Report import Report
+from StatisticsByCities import StatisticsByCities
+from StatisticsByYear import StatisticsByYear
+from TaskExecutor import TaskExecutor
+from VacancyFrame import VacancyFrame
+
+profession = 'Аналитик'
+
+
+def get_commit() -> dict:
+    """Коммит, на котором выполнены замеры
+
+    :return: Словарь {'commit': хэш или None вне git, 'dirty': есть ли незакоммиченные изменения}
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                                text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+    return {'commit': commit.strip(), 'dirty': bool(status.strip())}
+
+
+def measure(func, repeat: int) -> dict:
+    """Замер времени функции, setup и очистка выполняются внутри func и входят в замер
+
+    :param func: Функция без аргументов
+    :param repeat: Количество повторов
+    :return: Словарь с лучшим, медианным и всеми временами в секундах
+    """
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - start)
+    return {'best_seconds': min(seconds), 'median_seconds': statistics.median(seconds), 'seconds': seconds}
+
+
+def get_statistics_by_year(file_name: str, backend: str, is_quantiles=False) -> StatisticsByYear:
+    """Статистика по годам по одному .csv, пул исполнителя создаётся и завершается внутри замера
+
+    :param file_name: Имя .csv с синтетическими вакансиями
+    :param backend: Бэкенд TaskExecutor
+    :param is_quantiles: Собирать ли эскизы квантилей зарплат
+    :return: Статистика по годам
+    """
+    with TaskExecutor(backend) as executor:
+        return StatisticsByYear.from_csv(profession, file_name, executor=executor, is_quantiles=is_quantiles)
+
+
+def get_benchmarks(file_name: str, output_path: str, backend: str) -> dict:
+    """Замеряемые операции: для каждой - подготовка, которая строит нужные ей данные и возвращает замеряемую функцию
+
+    Общие данные строятся при первой подготовке, которой они нужны, поэтому с --only строится только нужное,
+    а время подготовки не входит в замер
+
+    :param file_name: Имя .csv с синтетическими вакансиями
+    :param output_path: Папка для файлов разбиения и отчётов
+    :param backend: Бэкенд TaskExecutor для статистики по годам
+    :return: Словарь название - подготовка без аргументов, возвращающая функцию без аргументов
+    """
+    @lru_cache(maxsize=None)
+    def get_statistics() -> tuple:
+        aggregator = VacancyFrame.from_file(file_name).to_aggregator(profession)
+        return StatisticsByYear(profession, aggregator=aggregator), StatisticsByCities(aggregator=aggregator)
+
+    @lru_cache(maxsize=None)
+    def get_report() -> Report:
+        return Report(os.path.join(output_path, 'Report'), pdf_backend='matplotlib')
+
+    def prepare_report(artifact: str):
+        generate, statistics = getattr(get_report(), f'generate_{artifact}'), get_statistics()
+        return lambda: generate(profession, *statistics)
+
+    def prepare_split():
+        input_data = InputConnect(os.path.relpath(file_name, 'Resources'), profession)
+        return lambda: input_data.split(output_path=os.path.join(output_path, 'split'))
+
+    def prepare_date_index():
+        date_index = DateIndex.build(file_name)
+        return lambda: sum(1 for _ in DataSet(file_name, '', 2010, 2010, is_stream=True,
+                                              date_index=date_index).iter_vacancies())
+
+    return {
+        'dataset_load': lambda: lambda: sum(1 for _ in DataSet(file_name, '', 0, 9999,
+                                                               is_stream=True).iter_vacancies()),
+        'dataset_load_mmap': lambda: lambda: sum(1 for _ in DataSet(file_name, '', 0, 9999, is_stream=True,
+                                                                    backend='mmap').iter_vacancies()),
+        'dataset_load_2010': lambda: lambda: sum(1 for _ in DataSet(file_name, '', 2010, 2010,
+                                                                    is_stream=True).iter_vacancies()),
+        'dataset_load_2010_date_index': prepare_date_index,
+        'date_index_build': lambda: lambda: DateIndex.build(file_name),
+        'vacancy_frame_from_file': lambda: lambda: VacancyFrame.from_file(file_name),
+        'statistics_by_year': lambda: lambda: get_statistics_by_year(file_name, backend),
+        'statistics_by_year_quantiles': lambda: lambda: get_statistics_by_year(file_name, backend, is_quantiles=True),
+        'statistics_by_cities': lambda: lambda: StatisticsByCities(file_name, profession),
+        'input_connect_split': prepare_split,
+        'report_excel': lambda: prepare_report('excel'),
+        'report_image': lambda: prepare_report('image'),
+        'report_pdf': lambda: prepare_report('pdf'),
+    }
+
+
+def run(rows: int, repeat: int, seed: int, backend: str, selected=None, data_path=None) -> dict:
+    """Генерация данных, если их ещё нет, и выполнение замеров
+
+    :param rows: Количество строк синтетического .csv
+    :param repeat: Количество повторов каждого замера
+    :param seed: Начальное значение генератора данных
+    :param backend: Бэкенд TaskExecutor для статистики по годам
+    :param selected: Названия замеров, None - все
+    :param data_path: Папка для сгенерированных .csv, по умолчанию временная папка системы
+    :return: Словарь результатов
+    """
+    data_path = data_path or tempfile.gettempdir()
+    os.makedirs(data_path, exist_ok=True)
+    file_name = os.path.join(data_path, f'vacancies_{rows}_{seed}.csv')
+    if not os.path.exists(file_name):
+        write_vacancies(file_name, rows, seed)
+    results = {**get_commit(),
+               'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+               'python': platform.python_version(),
+               'platform': platform.platform(),
+               'cpu_count': os.cpu_count(),
+               'rows': rows,
+               'seed': seed,
+               'file_bytes': os.path.getsize(file_name),
+               'repeat': repeat,
+               'executor_backend': backend,
+               'benchmarks': {}}
+    with tempfile.TemporaryDirectory() as output_path:
+        for name, prepare in get_benchmarks(file_name, output_path, backend).items():
+            if selected and name not in selected:
+                continue
+            result = measure(prepare(), repeat)
+            result['rows_per_second'] = rows / result['best_seconds']
+            results['benchmarks'][name] = result
+            print(f'{name}: {result["best_seconds"]:.3f} с, {result["rows_per_second"]:.0f} строк/с')
+    return results
+
+
+def compare(old_file_name: str, new_file_name: str):
+    """Печать отношения лучших времён двух результатов
+
+    :param old_file_name: Файл прежнего результата
+    :param new_file_name: Файл нового результата
+    :return:
+    """
+    with open(old_file_name, encoding='utf-8') as old_file, open(new_file_name, encoding='utf-8') as new_file:
+        old, new = json.load(old_file), json.load(new_file)
+    if (old['rows'], old['seed']) != (new['rows'], new['seed']):
+        print(f'Разные данные: {old["rows"]} строк, seed {old["seed"]} и {new["rows"]} строк, seed {new["seed"]}')
+    print(f'{str(old["commit"])[:8]} -> {str(new["commit"])[:8]}')
+    for name, result in new['benchmarks'].items():
+        if name in old['benchmarks']:
+            old_seconds = old['benchmarks'][name]['best_seconds']
+            print(f'{name}: {old_seconds:.3f} с -> {result["best_seconds"]:.3f} с, '
+                  f'x{old_seconds / result["best_seconds"]:.2f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Замеры производительности на синтетических вакансиях')
+    parser.add_argument('--rows', type=int, default=10000, help='Количество строк, от 10 тыс. до 50 млн')
+    parser.add_argument('--repeat', type=int, default=3, help='Количество повторов каждого замера')
+    parser.add_argument('--seed', type=int, default=42, help='Начальное значение генератора данных')
+    parser.add_argument('--backend', default='serial', choices=['serial', 'thread', 'process', 'multiprocessing'],
+                        help='Бэкенд TaskExecutor для статистики по годам')
+    parser.add_argument('--only', nargs='+', help='Выполнить только указанные замеры')
+    parser.add_argument('--data-path', help='Папка для сгенерированных .csv')
+    parser.add_argument('--output', help='Файл результата, по умолчанию Benchmarks/results/<коммит>_<строки>.json')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='Сравнить два файла результатов')
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+        sys.exit(0)
+    results = run(args.rows, args.repeat, args.seed, args.backend, args.only, args.data_path)
+    output = args.output or os.path.join('Benchmarks', 'results',
+                                         f'{str(results["commit"])[:8]}_{args.rows}.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as write_file:
+        json.dump(results, write_file, ensure_ascii=False, indent=4)
+    print(f'Результат: {output}')
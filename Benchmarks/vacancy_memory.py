@@ -0,0 +1,104 @@
+"""Замер памяти на одну вакансию: компактные Vacancy/Salary против прежних классов на словарях
+
+Запуск из корня репозитория: python Benchmarks/vacancy_memory.py [количество строк]
+"""
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Salary import currency_to_rub
+from Vacancy import Vacancy, get_salary
+
+names = ['Программист Python', 'Аналитик данных', 'Системный администратор', 'Менеджер по продажам',
+         'Ведущий аналитик', 'Программист 1С', 'Водитель категории B', 'Бухгалтер']
+areas = ['Москва', 'Санкт-Петербург', 'Екатеринбург', 'Казань', 'Новосибирск', 'Курган', 'Челябинск']
+currencies = ['RUR'] * 30 + ['USD', 'EUR', 'KZT', 'UAH']
+
+
+class LegacySalary:
+    """Прежний класс зарплаты на словаре атрибутов"""
+
+    def __init__(self, salary_from, salary_to, salary_currency):
+        self.salary_from = int(float(salary_from))
+        self.salary_to = int(float(salary_to))
+        self.salary_currency = salary_currency
+        self.salary_avg = ''
+
+
+class LegacyVacancy:
+    """Прежний класс вакансии на словаре атрибутов"""
+
+    def __init__(self, dict_vacancy: dict):
+        self.name = dict_vacancy['name']
+        self.salary = LegacySalary(dict_vacancy['salary_from'],
+                                   dict_vacancy['salary_to'],
+                                   dict_vacancy['salary_currency'])
+        self.area_name = dict_vacancy['area_name']
+        self.published_at = dict_vacancy['published_at']
+        self.published_at_year = int(self.published_at[:4])
+
+
+def generate_rows(count: int, is_round_salary: bool) -> list:
+    """Генерация строк вакансий, каждая строка со своими объектами строк, как после csv.reader
+
+    :param count: Количество строк
+    :param is_round_salary: Оклады кратны 5000, как в реальных выгрузках, иначе почти все оклады различны
+    :return: Список словарей вакансий
+    """
+    rnd = random.Random(42)
+    rows = []
+    for _ in range(count):
+        if is_round_salary:
+            salary_from = rnd.randint(2, 30) * 5000
+            salary_to = salary_from + rnd.randint(0, 10) * 5000
+        else:
+            salary_from = rnd.randint(5000, 150000)
+            salary_to = salary_from + rnd.randint(0, 100000)
+        rows.append({'name': ''.join(rnd.choice(names)),
+                     'salary_from': f'{salary_from}.0',
+                     'salary_to': f'{salary_to}.0',
+                     'salary_currency': ''.join(rnd.choice(currencies)),
+                     'area_name': ''.join(rnd.choice(areas)),
+                     'published_at': f'{rnd.randint(2003, 2022)}-{rnd.randint(1, 12):02d}-'
+                                     f'{rnd.randint(1, 28):02d}T{rnd.randint(0, 23):02d}:00:00+0300'})
+    return rows
+
+
+def measure(vacancy_class, count: int, is_round_salary: bool, name='аналитик') -> float:
+    """Память на одну вакансию при загрузке как в DataSet, включая удерживаемые вакансией строки
+
+    :param vacancy_class: Класс вакансии
+    :param count: Количество строк
+    :param is_round_salary: Оклады кратны 5000
+    :param name: Искомая профессия, прежний DataSet создавал для совпадений вторую вакансию
+    :return: Байт на вакансию
+    """
+    get_salary.cache_clear()
+    gc.collect()
+    tracemalloc.start()
+    rows = generate_rows(count, is_round_salary)
+    vacancies_objects, vacancies_objects_name = [], []
+    for row in rows:
+        vacancies_objects.append(vacancy_class(row))
+        if name in row['name']:
+            vacancies_objects_name.append(vacancy_class(row) if vacancy_class is LegacyVacancy
+                                          else vacancies_objects[-1])
+    rows.clear()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / len(vacancies_objects)
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    assert set(currencies) <= set(currency_to_rub)
+    for is_round_salary in (True, False):
+        legacy = measure(LegacyVacancy, count, is_round_salary)
+        compact = measure(Vacancy, count, is_round_salary)
+        print(f'{"округлённые" if is_round_salary else "уникальные"} оклады: '
+              f'прежние {legacy:.0f} Б, компактные {compact:.0f} Б, в {legacy / compact:.2f} раза меньше')
@@ -0,0 +1,153 @@
+import mmap
+import os
+
+block_size = 1 << 24
+
+
+def get_terminator(mm) -> bytes:
+    """Конец строки файла: b'\\r', если первая строка кончается одиночным '\\r', как у чанков InputConnect.split,
+    иначе b'\\n', в том числе для '\\r\\n'
+
+    :param mm: Отображение файла в память или байты его начала
+    :return: Байт конца строки
+    >>> get_terminator(b'a,b\\r1,2\\r'), get_terminator(b'a,b\\r\\n1,2\\r\\n'), get_terminator(b'a,b\\n')
+    (b'\\r', b'\\n', b'\\n')
+    """
+    start = 3 if mm[:3] == b'\xef\xbb\xbf' else 0
+    line_end = mm.find(b'\n', start)
+    carriage_end = mm.find(b'\r', start)
+    if carriage_end != -1 and (line_end == -1 or carriage_end < line_end) and \
+            mm[carriage_end + 1:carriage_end + 2] != b'\n':
+        return b'\r'
+    return b'\n'
+
+
+def get_line_terminator(file_name: str) -> bytes:
+    """Конец строки файла по его первой строке
+
+    :param file_name: Имя файла
+    :return: b'\\r' или b'\\n', для пустого файла b'\\n'
+    """
+    if os.path.getsize(file_name) == 0:
+        return b'\n'
+    with open(file_name, 'rb') as read_file, mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return get_terminator(mm)
+
+
+def get_byte_ranges(file_name: str, count_chunks: int) -> list:
+    """Разбиение .csv на диапазоны байт примерно равного размера по границам записей
+
+    Граница записи - конец строки, перед которым стоит чётное количество кавычек с начала файла, поэтому
+    переводы строк внутри полей в кавычках не разрывают запись. Первый диапазон начинается после заголовков.
+    Конец строки - '\\n' или одиночный '\\r', по get_terminator
+
+    :param file_name: Имя файла
+    :param count_chunks: Желаемое количество диапазонов
+    :return: Список кортежей (начало, конец) в байтах
+    """
+    size = os.path.getsize(file_name)
+    if size == 0:
+        return []
+    with open(file_name, 'rb') as read_file, mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        terminator = get_terminator(mm)
+        boundaries = []
+        position, count_quotes = 0, 0
+        for target in [0] + [size * i // count_chunks for i in range(1, count_chunks)]:
+            target = max(target, position)
+            count_quotes += count_bytes(mm, b'"', position, target)
+            position = target
+            while True:
+                line_end = mm.find(terminator, position)
+                if line_end == -1:
+                    position = size
+                    break
+                count_quotes += count_bytes(mm, b'"', position, line_end)
+                position = line_end + 1
+                if count_quotes % 2 == 0:
+                    break
+            if position >= size:
+                break
+            if not boundaries or position > boundaries[-1]:
+                boundaries.append(position)
+        boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:])]
+
+
+def count_bytes(mm, sub: bytes, start: int, end: int) -> int:
+    """Подсчёт вхождений байта в диапазоне файла блоками, без копирования всего диапазона в память
+
+    :param mm: Отображение файла в память
+    :param sub: Искомый байт
+    :param start: Начало диапазона
+    :param end: Конец диапазона
+    :return: Количество вхождений
+    """
+    count = 0
+    for block_start in range(start, end, block_size):
+        count += mm[block_start:min(block_start + block_size, end)].count(sub)
+    return count
+
+
+def iter_lines(read_file, byte_range: tuple, terminator=b'\n'):
+    """Чтение строк бинарного файла в диапазоне байт с декодированием в utf-8
+
+    Строки с концом '\\r' режутся по блокам block_size, так как итерация по бинарному файлу делит только по '\\n'
+
+    :param read_file: Файл, открытый в режиме 'rb'
+    :param byte_range: Кортеж (начало, конец) в байтах, границы должны совпадать с границами записей
+    :param terminator: Конец строки из get_terminator
+    :return: Генератор строк вместе с концом строки
+    >>> import io
+    >>> list(iter_lines(io.BytesIO(b'a,b\\r1,2\\r3,4\\r'), (4, 12), b'\\r'))
+    ['1,2\\r', '3,4\\r']
+    """
+    start, end = byte_range
+    read_file.seek(start)
+    position = start
+    if terminator == b'\n':
+        for line in read_file:
+            if position >= end:
+                break
+            position += len(line)
+            yield line.decode('utf-8')
+        return
+    rest = b''
+    while position < end:
+        block = read_file.read(min(block_size, end - position))
+        if not block:
+            break
+        position += len(block)
+        lines = (rest + block).split(terminator)
+        rest = lines.pop()
+        for line in lines:
+            yield (line + terminator).decode('utf-8')
+    if rest:
+        yield rest.decode('utf-8')
+
+
+def get_records_end(file_name: str, start: int) -> int:
+    """Конец последней полностью записанной записи после границы записи start
+
+    Если файл дописывается, последняя строка может быть неполной: берётся последний конец строки, перед которым
+    с start стоит чётное количество кавычек. Конец строки - по get_terminator
+
+    :param file_name: Имя файла
+    :param start: Граница записи, с которой начинается поиск
+    :return: Граница записи в байтах, не меньше start
+    """
+    size = os.path.getsize(file_name)
+    if size <= start:
+        return start
+    with open(file_name, 'rb') as read_file, mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        terminator = get_terminator(mm)
+        end = size
+        count_quotes = count_bytes(mm, b'"', start, size)
+        while True:
+            line_end = mm.rfind(terminator, start, end)
+            if line_end == -1:
+                return start
+            count_quotes -= count_bytes(mm, b'"', line_end + 1, end)
+            end = line_end + 1
+            if count_quotes % 2 == 0:
+                return end
+            end = line_end
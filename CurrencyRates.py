@@ -0,0 +1,158 @@
+import csv
+import glob
+import hashlib
+import os
+import xml.etree.ElementTree as ElementTree
+from functools import lru_cache
+
+import numpy as np
+
+from Salary import currency_to_rub
+
+currency_codes = list(currency_to_rub.keys())
+currency_indexes = {currency: index for index, currency in enumerate(currency_codes)}
+rates_env_name = 'CURRENCY_RATES'
+
+
+class CurrencyRates:
+    """Класс таблицы курсов валют к рублю по месяцам публикации
+
+    Курсы хранятся плотным массивом [валюта, месяц], поэтому перевод столбца зарплат - одна выборка по массиву.
+    Пропущенные месяцы заполняются последним известным курсом, месяцы до первого известного курса - первым
+    известным курсом, валюты без курсов в таблице - курсом из currency_to_rub. Даты за пределами таблицы
+    берут курс её крайнего месяца
+
+    Attributes:
+        first_month (int): Номер первого месяца таблицы: год * 12 + месяц - 1
+        rates (np.ndarray): Массив курсов [индекс в currency_codes, месяц от first_month]
+        is_dated (bool): Есть ли в таблице курсы по датам, иначе все курсы из currency_to_rub
+        fingerprint (str): Хэш таблицы, меняется вместе с курсами
+    """
+
+    def __init__(self, monthly_rates=None):
+        """Построение плотной таблицы из курсов по месяцам
+
+        :param monthly_rates: Словарь валюта - {'ГГГГ-ММ': курс}, None - только курсы currency_to_rub
+        >>> rates = CurrencyRates({'USD': {'2008-01': 24.5, '2008-03': 25.0}})
+        >>> rates.rates[currency_codes.index('USD')].tolist()
+        [24.5, 24.5, 25.0]
+        >>> rates.get_rate('USD', '2007-06'), rates.get_rate('USD', '2010-01'), rates.get_rate('EUR', '2008-02')
+        (24.5, 25.0, 59.9)
+        """
+        monthly_rates = {currency: rates for currency, rates in (monthly_rates or {}).items()
+                         if currency in currency_to_rub and currency != 'RUR' and rates}
+        months = [self.__get_month_number(month) for rates in monthly_rates.values() for month in rates]
+        self.is_dated = bool(months)
+        self.first_month = min(months) if months else 0
+        count_months = max(months) - self.first_month + 1 if months else 1
+        self.rates = np.empty((len(currency_codes), count_months), dtype=np.float64)
+        for index, currency in enumerate(currency_codes):
+            if currency not in monthly_rates:
+                self.rates[index] = currency_to_rub[currency]
+                continue
+            known = np.full(count_months, np.nan)
+            for month, rate in monthly_rates[currency].items():
+                known[self.__get_month_number(month) - self.first_month] = rate
+            is_known = ~np.isnan(known)
+            last_known = np.maximum.accumulate(np.where(is_known, np.arange(count_months), -1))
+            self.rates[index] = known[np.where(last_known >= 0, last_known, np.argmax(is_known))]
+        self.fingerprint = hashlib.sha1(np.array(self.first_month).tobytes() + self.rates.tobytes()).hexdigest()
+        self.__month_rates = {}
+
+    @classmethod
+    def from_file(cls, file_name: str):
+        """Загрузка таблицы из .csv, .xml ЦБ или папки с .xml ЦБ
+
+        :param file_name: Имя файла или папки
+        :return: Таблица курсов
+        """
+        if os.path.isdir(file_name):
+            return cls.from_cbr_xml(sorted(glob.glob(os.path.join(file_name, '*.xml'))))
+        if file_name.lower().endswith('.xml'):
+            return cls.from_cbr_xml([file_name])
+        return cls.from_csv(file_name)
+
+    @classmethod
+    def from_csv(cls, file_name: str):
+        """Загрузка таблицы из .csv: столбец date ('ГГГГ-ММ' или 'ГГГГ-ММ-ДД') и по столбцу на валюту,
+        курс за одну единицу валюты, пустое значение - курс неизвестен
+
+        :param file_name: Имя файла
+        :return: Таблица курсов
+        """
+        monthly_rates = {}
+        with open(file_name, encoding='utf-8-sig', newline='') as read_file:
+            for row in csv.DictReader(read_file):
+                month = row.pop('date')[:7]
+                for currency, rate in row.items():
+                    if rate:
+                        monthly_rates.setdefault(currency, {}).setdefault(month, float(rate.replace(',', '.')))
+        return cls(monthly_rates)
+
+    @classmethod
+    def from_cbr_xml(cls, file_names: list):
+        """Загрузка таблицы из ответов XML_daily.asp ЦБ РФ, для месяца берётся курс на самую раннюю дату
+
+        :param file_names: Имена файлов .xml, по одному на дату
+        :return: Таблица курсов
+        """
+        daily_rates = []
+        for file_name in file_names:
+            root = ElementTree.parse(file_name).getroot()
+            day, month, year = root.get('Date').split('.')
+            rates = {valute.findtext('CharCode'): float(valute.findtext('Value').replace(',', '.')) /
+                     int(valute.findtext('Nominal')) for valute in root.iter('Valute')}
+            daily_rates.append((f'{year}-{month}-{day}', rates))
+        monthly_rates = {}
+        for date, rates in sorted(daily_rates):
+            for currency, rate in rates.items():
+                monthly_rates.setdefault(currency, {}).setdefault(date[:7], rate)
+        return cls(monthly_rates)
+
+    def get_month_ids(self, year: np.ndarray, month: np.ndarray) -> np.ndarray:
+        """Векторный перевод года и месяца в номер столбца таблицы
+
+        :param year: Массив годов
+        :param month: Массив месяцев 1 - 12
+        :return: Массив номеров столбцов
+        """
+        month_ids = year.astype(np.int32) * 12 + month.astype(np.int32) - (1 + self.first_month)
+        return np.clip(month_ids, 0, self.rates.shape[1] - 1, out=month_ids)
+
+    def get_rate(self, currency: str, month=None) -> float:
+        """Курс валюты за месяц, курс каждой пары валюта - месяц выбирается из таблицы один раз
+
+        :param currency: Код валюты
+        :param month: Месяц 'ГГГГ-ММ', None - курс из currency_to_rub
+        :return: Курс к рублю
+        """
+        if month is None or not self.is_dated:
+            return currency_to_rub[currency]
+        rate = self.__month_rates.get((currency, month))
+        if rate is None:
+            month_id = min(max(self.__get_month_number(month) - self.first_month, 0), self.rates.shape[1] - 1)
+            rate = self.__month_rates[currency, month] = float(self.rates[currency_indexes[currency], month_id])
+        return rate
+
+    @staticmethod
+    def __get_month_number(month: str) -> int:
+        """Номер месяца от нулевого года
+
+        :param month: Месяц 'ГГГГ-ММ'
+        :return: год * 12 + месяц - 1
+        >>> CurrencyRates._CurrencyRates__get_month_number('2008-02')
+        24097
+        """
+        return int(month[:4]) * 12 + int(month[5:7]) - 1
+
+
+@lru_cache(maxsize=None)
+def get_currency_rates() -> CurrencyRates:
+    """Общая таблица курсов: из файла в переменной окружения CURRENCY_RATES, иначе курсы currency_to_rub
+
+    Переменная окружения наследуется процессами TaskExecutor, поэтому они считают по той же таблице
+
+    :return: Таблица курсов
+    """
+    file_name = os.environ.get(rates_env_name)
+    return CurrencyRates.from_file(file_name) if file_name else CurrencyRates()
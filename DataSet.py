@@ -1,9 +1,33 @@
 import csv
 import re
+import time
 from collections import Counter
 
+from CsvChunks import get_line_terminator, iter_lines
+from CurrencyRates import get_currency_rates
+from MmapCsvReader import MmapCsvReader
+from Profiler import profiler
 from Vacancy import Vacancy
 
+fixed_format_titles = {'salary', 'salary_from', 'salary_to', 'salary_currency', 'published_at'}
+vacancy_titles = {'name', 'salary', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at'}
+html_tags = re.compile('<.*?>')
+
+
+def clean_fixed_value(value: str) -> str:
+    """Очистка значения числового столбца, валюты или даты от html тегов и пробелов
+
+    Значение без '<', пробелов и непечатаемых символов возвращается как есть, регулярное выражение не запускается
+
+    :param value: Значение
+    :return: Очищенное значение
+    >>> clean_fixed_value(' <b>2007-01-01T10:00:00+0300</b>\\n'), clean_fixed_value('2007-01-01T10:00:00+0300')
+    ('2007-01-01T10:00:00+0300', '2007-01-01T10:00:00+0300')
+    """
+    if '<' in value or ' ' in value or not value.isprintable():
+        return ' '.join(html_tags.sub('', value).split())
+    return value
+
 
 class DataSet:
     """Класс датасета
@@ -12,77 +36,250 @@ class DataSet:
         file_name (str): Имя файла
         vacancies_objects (list): Список вакансий
         vacancies_object_name (list): Список вакансий по заданному имени
+        byte_range (tuple): Читаемый диапазон байт файла, None - весь файл
+        backend (str): Способ чтения файла: 'csv' или 'mmap'
+        name (str): Имя искомой профессии
+        start (int): С какого года выводить информацию
+        end (int): По какой год выводить информацию
+        name_filter (str): Подстрока названия, остальные вакансии отбрасываются до очистки строки, None - все
+        currencies (set): Допустимые валюты, остальные вакансии отбрасываются до очистки строки, None - все
     """
 
-    def __init__(self, file_name: str, name: str, start: int, end: int):
+    def __init__(self, file_name: str, name: str, start: int, end: int, is_stream=False, byte_range=None,
+                 backend='csv', name_filter=None, currencies=None, date_index=None):
         """Инициализация класса датасета
 
         :param file_name: Имя файла
         :param name: Имя искомой профессии
         :param start: С какого года выводить информацию
         :param end: По какой год выводить информацию
+        :param is_stream: Не загружать вакансии в память, а читать их через iter_vacancies
+        :param byte_range: Кортеж (начало, конец) в байтах из CsvChunks.get_byte_ranges, читать только его
+        :param backend: Способ чтения: 'csv' - csv.reader, 'mmap' - MmapCsvReader только по нужным столбцам.
+            'mmap' выигрывает только на широких выгрузках, где ненужные столбцы (описание, навыки) не
+            декодируются; на файлах из одних столбцов вакансии csv.reader на C быстрее
+        :param name_filter: Читать только вакансии, в названии которых есть эта подстрока
+        :param currencies: Читать только вакансии в этих валютах
+        :param date_index: DateIndex файла: если byte_range не задан, читается только диапазон байт годов start - end
         >>> DataSet('Tests/test_data_set.csv', 'аналитик', 2007, 2014).file_name
         'Tests/test_data_set.csv'
         >>> DataSet('Tests/test_data_set.csv', 'администратор', 2007, 2014).vacancies_objects[0].name
         'Менеджер по работе с юридическими лицами'
         >>> DataSet('Tests/test_data_set.csv', 'администратор', 2007, 2014).vacancies_objects_name[0].name
         'Системный администратор'
+        >>> DataSet('Tests/test_data_set.csv', 'аналитик', 2007, 2014, is_stream=True).vacancies_objects
+        []
         """
         self.file_name = file_name
+        self.name = name
+        self.start = start
+        self.end = end
+        if byte_range is None and date_index is not None:
+            byte_range = date_index.get_byte_range(f'{start:04d}', f'{end:04d}')
+        self.byte_range = byte_range
+        self.backend = backend
+        self.name_filter = name_filter
+        self.currencies = None if currencies is None else set(currencies)
         self.vacancies_objects = []
         self.vacancies_objects_name = []
-        data_vac = self.__csv_reader()
-        for vacancy in data_vac:
-            if not start <= int(vacancy['published_at'][:4]) <= end:
-                continue
-            self.vacancies_objects.append(Vacancy(vacancy))
-            if name in vacancy['name']:
-                self.vacancies_objects_name.append(Vacancy(vacancy))
+        if is_stream:
+            return
+        for vacancy in self.iter_vacancies():
+            self.vacancies_objects.append(vacancy)
+            if name in vacancy.name:
+                self.vacancies_objects_name.append(vacancy)
+
+    def iter_vacancies(self, name_filter=None):
+        """Потоковое чтение вакансий: строки читаются, фильтруются и очищаются по одной
+
+        :param name_filter: Подстрока названия, по умолчанию self.name_filter
+        :return: Генератор вакансий за период с start по end
+        >>> next(DataSet('Tests/test_data_set.csv', 'администратор', 2007, 2014, is_stream=True).iter_vacancies()).name
+        'Менеджер по работе с юридическими лицами'
+        """
+        is_dated = get_currency_rates().is_dated
+        if not profiler.enabled:
+            for vacancy in self.iter_rows(name_filter):
+                yield Vacancy(vacancy, is_dated)
+            return
+        build_seconds, count_vacancies = 0.0, 0
+        try:
+            for vacancy in self.iter_rows(name_filter):
+                start = time.perf_counter()
+                vacancy = Vacancy(vacancy, is_dated)
+                build_seconds += time.perf_counter() - start
+                count_vacancies += 1
+                yield vacancy
+        finally:
+            profiler.add_time('build_objects', build_seconds, count_vacancies)
+
+    def iter_rows(self, name_filter=None):
+        """Потоковое чтение очищенных строк .csv за период с start по end без создания объектов вакансий
+
+        :param name_filter: Подстрока названия, по умолчанию self.name_filter
+        :return: Генератор словарей вакансий
+        """
+        return self.__csv_reader(self.name_filter if name_filter is None else name_filter)
 
     def filter_by_currency(self, data_vacancies):
         freq_curr = {k: v for k, v in dict(Counter(map(lambda x: x.salary.salary_currency, data_vacancies))).items() if
                      v > 5000}
         data_vacancies = [x for x in data_vacancies if x.salary.salary_currency in list(freq_curr.keys())]
 
-    def __csv_reader(self) -> list:
+    def __csv_reader(self, name_filter=None):
         """Чтение .csv
 
-        :return: Вывод списка обработанных данных
+        Год, валюта и название проверяются по сырому значению до очистки строки, поэтому отброшенные строки
+        не очищаются. При включённом профайлере считаются прочитанные, отброшенные и отфильтрованные строки и
+        время очистки
+
+        :param name_filter: Подстрока названия, None - без фильтра
+        :return: Генератор словарей обработанных строк
+        """
+        file_rows = self.__mmap_rows() if self.backend == 'mmap' else self.__text_rows()
+        titles = next(file_rows)
+        start, end, index_year = self.start, self.end, titles.index('published_at')
+        text_columns = [i for i, title in enumerate(titles) if title not in fixed_format_titles]
+        fixed_columns = [i for i, title in enumerate(titles) if title in fixed_format_titles and i != index_year]
+        predicates = self.__get_predicates(html_tags, titles, name_filter)
+        is_empty = True
+        is_profiled = profiler.enabled
+        count_rows, count_dropped, count_filtered, clean_seconds = 0, 0, 0, 0.0
+        try:
+            for row in file_rows:
+                count_rows += 1
+                if '' in row or len(row) != len(titles):
+                    count_dropped += 1
+                    continue
+                is_empty = False
+                published_at = row[index_year]
+                if '<' in published_at or ' ' in published_at or not published_at.isprintable():
+                    published_at = row[index_year] = clean_fixed_value(published_at)
+                if not start <= int(published_at[:4]) <= end or \
+                        predicates and not all(predicate(row) for predicate in predicates):
+                    count_filtered += 1
+                    continue
+                if is_profiled:
+                    clean_start = time.perf_counter()
+                self.__csv_filer(html_tags=html_tags,
+                                 row=row,
+                                 titles=titles,
+                                 text_columns=text_columns,
+                                 fixed_columns=fixed_columns)
+                if is_profiled:
+                    clean_seconds += time.perf_counter() - clean_start
+                yield dict(zip(titles, row))
+        finally:
+            if is_profiled:
+                profiler.count('rows_seen', count_rows)
+                profiler.count('rows_dropped', count_dropped)
+                profiler.count('rows_filtered', count_filtered)
+                profiler.add_time('clean', clean_seconds, count_rows - count_dropped - count_filtered)
+        if is_empty and self.byte_range is None:
+            print('Нет данных')
+            exit(0)
+
+    def __get_predicates(self, html_tags, titles: list, name_filter=None) -> list:
+        """Проверки строки по сырым значениям валюты и названия, год проверяется в __csv_reader
+
+        Значение проверяется как есть, если очистка не может его изменить, иначе очищается только этот столбец
+        тем же способом, что и в __csv_filer, поэтому результат совпадает с фильтрацией очищенной строки
+
+        :param html_tags: html теги
+        :param titles: Заголовки
+        :param name_filter: Подстрока названия, None - без фильтра
+        :return: Список функций от строки, False - строка отбрасывается
+        """
+        clean_text = self.__clean_text_value
+        predicates = []
+        currencies = self.currencies
+        if currencies is not None and 'salary_currency' not in titles:
+            predicates.append(lambda row: 'RUR' in currencies)
+        elif currencies is not None:
+            index_currency = titles.index('salary_currency')
+
+            def check_currency(row: list) -> bool:
+                value = row[index_currency]
+                if '<' in value or ' ' in value or not value.isprintable():
+                    value = row[index_currency] = clean_fixed_value(value)
+                return value in currencies
+
+            predicates.append(check_currency)
+        if name_filter:
+            index_name = titles.index('name')
+            is_spaced_name = name_filter != ''.join(name_filter.split())
+
+            def check_name(row: list) -> bool:
+                value = row[index_name]
+                if '<' in value or is_spaced_name:
+                    value = row[index_name] = clean_text(html_tags, value)
+                return name_filter in value
+
+            predicates.append(check_name)
+        return predicates
+
+    def __text_rows(self):
+        """Чтение строк .csv через csv.reader с декодированием всего файла
+
+        :return: Генератор: сначала заголовки, затем строки
         """
         with open(self.file_name, encoding='utf-8-sig') as read_file:
             file_reader = csv.reader(read_file, delimiter=",")
-            data_vacancies = []
             try:
                 titles = next(file_reader)
             except StopIteration:
                 print('Пустой файл')
                 exit(0)
-            html_tags = re.compile('<.*?>')
-            for row in file_reader:
-                if '' in row or len(row) != len(titles):
-                    continue
-                self.__csv_filer(html_tags=html_tags,
-                                 row=row,
-                                 titles=titles)
-                if len(row) == len(titles):
-                    data_vacancies.append({titles[i]: row[i] for i in range(len(titles))})
-            if len(data_vacancies) == 0:
-                print('Нет данных')
-                exit(0)
-            return data_vacancies
+            yield titles
+            if self.byte_range is not None:
+                file_reader = csv.reader(iter_lines(read_file.buffer, self.byte_range,
+                                                    get_line_terminator(self.file_name)), delimiter=",")
+            yield from file_reader
+
+    def __mmap_rows(self):
+        """Чтение строк .csv через mmap с декодированием только столбцов, нужных вакансии
+
+        :return: Генератор: сначала заголовки нужных столбцов, затем строки
+        """
+        reader = MmapCsvReader(self.file_name, columns=vacancy_titles, byte_range=self.byte_range)
+        if not reader.titles:
+            print('Пустой файл')
+            exit(0)
+        yield reader.columns
+        yield from reader
 
     @staticmethod
-    def __csv_filer(html_tags, row: list, titles: list):
+    def __csv_filer(html_tags, row: list, titles: list, text_columns: list, fixed_columns: list):
         """Проверка строки вакансии на правильность и отсев 'неправильных'
 
+        Html теги и лишние пробелы удаляются только в текстовых столбцах, регулярное выражение запускается
+        только если в значении есть '<'. Значения числовых столбцов, валюты и даты без пробельных символов и
+        '<' остаются как есть, иначе очищаются как текст, поэтому результат совпадает с полной очисткой всех столбцов
+
         :param html_tags: html теги
         :param row: Строка вакансии
         :param titles: Заголовки
+        :param text_columns: Номера текстовых столбцов
+        :param fixed_columns: Номера числовых столбцов, столбцов валюты и даты
         :return:
         """
         if len(row) < len(titles):
             return
-        for i in range(len(row)):
-            row[i] = ' '.join(re.sub(html_tags, '', row[i])
-                              .strip()
-                              .split())
\ No newline at end of file
+        for i in text_columns:
+            row[i] = DataSet.__clean_text_value(html_tags, row[i])
+        for i in fixed_columns:
+            value = row[i]
+            if '<' in value or ' ' in value or not value.isprintable():
+                row[i] = clean_fixed_value(value)
+
+    @staticmethod
+    def __clean_text_value(html_tags, value: str) -> str:
+        """Очистка текстового значения от html тегов и лишних пробелов, регулярное выражение только при '<'
+
+        :param html_tags: html теги
+        :param value: Значение
+        :return: Очищенное значение
+        """
+        if '<' in value:
+            value = html_tags.sub('', value)
+        return ' '.join(value.split())
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+
+from DataSet import clean_fixed_value
+from MmapCsvReader import MmapCsvReader
+
+index_version = 1
+
+
+class DateIndex:
+    """Разреженный индекс .csv, отсортированного по дате публикации: начало первой записи каждого месяца в байтах
+
+    По индексу диапазон годов или месяцев превращается в диапазон байт, который DataSet читает без остального
+    файла. Индекс привязан к размеру и времени изменения файла. Если даты в файле идут не по возрастанию,
+    индекс помечается как непригодный и диапазоны по нему не выдаются
+
+    Attributes:
+        file_name (str): Полный путь к файлу
+        size (int): Размер файла при построении индекса
+        mtime_ns (int): Время изменения файла при построении индекса
+        is_sorted (bool): Даты в файле не убывают, только тогда индексом можно пользоваться
+        months (dict): Словарь 'ГГГГ-ММ' - начало первой записи месяца в байтах, месяцы по возрастанию
+    """
+
+    def __init__(self, file_name: str, size: int, mtime_ns: int, is_sorted: bool, months: dict):
+        """Инициализация индекса
+
+        :param file_name: Полный путь к файлу
+        :param size: Размер файла
+        :param mtime_ns: Время изменения файла
+        :param is_sorted: Даты в файле не убывают
+        :param months: Словарь 'ГГГГ-ММ' - начало первой записи месяца в байтах
+        """
+        self.file_name = file_name
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.is_sorted = is_sorted
+        self.months = months
+
+    @classmethod
+    def build(cls, file_name: str):
+        """Построение индекса за один проход по файлу, декодируется только столбец published_at
+
+        Записи с пустыми полями пропускаются, как в DataSet, поэтому не влияют на границы месяцев.
+        Дата очищается той же функцией, что и в DataSet
+
+        :param file_name: Имя файла
+        :return: Индекс дат
+        """
+        stat = os.stat(file_name)
+        months, last_month, is_sorted = {}, None, True
+        for record_start, (published_at,) in MmapCsvReader(file_name, columns={'published_at'}).iter_offsets():
+            month = clean_fixed_value(published_at)[:7]
+            if month == last_month:
+                continue
+            if last_month is not None and month < last_month:
+                is_sorted = False
+                break
+            months[month], last_month = record_start, month
+        return cls(os.path.abspath(file_name), stat.st_size, stat.st_mtime_ns, is_sorted, months)
+
+    @classmethod
+    def from_cache(cls, file_name: str, cache_path='Cache'):
+        """Загрузка индекса из папки кэша, при отсутствии или устаревании - построение и сохранение
+
+        :param file_name: Имя файла
+        :param cache_path: Папка кэша
+        :return: Индекс дат
+        """
+        date_index = cls.load_cached(file_name, cache_path)
+        if date_index is None:
+            date_index = cls.build(file_name)
+            os.makedirs(cache_path, exist_ok=True)
+            date_index.save(cls.__get_index_file_name(file_name, cache_path))
+        return date_index
+
+    @classmethod
+    def load_cached(cls, file_name: str, cache_path='Cache'):
+        """Загрузка индекса из папки кэша без построения
+
+        :param file_name: Имя файла
+        :param cache_path: Папка кэша
+        :return: Индекс дат или None, если его нет в кэше или файл изменился
+        """
+        index_file_name = cls.__get_index_file_name(file_name, cache_path)
+        date_index = cls.load(index_file_name) if os.path.exists(index_file_name) else None
+        return date_index if date_index is not None and date_index.is_valid() else None
+
+    @staticmethod
+    def __get_index_file_name(file_name: str, cache_path: str) -> str:
+        """Имя файла индекса в папке кэша по полному пути .csv
+
+        :param file_name: Имя файла
+        :param cache_path: Папка кэша
+        :return: Имя файла индекса
+        """
+        return os.path.join(
+            cache_path, hashlib.sha1(os.path.abspath(file_name).encode('utf-8')).hexdigest() + '.dates.json')
+
+    def is_valid(self) -> bool:
+        """Файл не изменился с построения индекса
+
+        :return: Совпадают ли размер и время изменения файла
+        """
+        if not os.path.exists(self.file_name):
+            return False
+        stat = os.stat(self.file_name)
+        return (stat.st_size, stat.st_mtime_ns) == (self.size, self.mtime_ns)
+
+    def get_byte_range(self, first: str, last: str):
+        """Диапазон байт записей с периода first по период last включительно
+
+        Период - год 'ГГГГ' или месяц 'ГГГГ-ММ'. Границы диапазона совпадают с границами записей
+
+        :param first: С какого периода
+        :param last: По какой период
+        :return: Кортеж (начало, конец) в байтах или None, если индексом пользоваться нельзя
+        >>> date_index = DateIndex('v.csv', 400, 0, True, {'2007-01': 60, '2007-05': 150, '2008-02': 300})
+        >>> date_index.get_byte_range('2007', '2007'), date_index.get_byte_range('2007-02', '2008')
+        ((60, 300), (150, 400))
+        >>> date_index.get_byte_range('2009', '2014'), date_index.get_byte_range('2003', '2006')
+        ((400, 400), (60, 60))
+        """
+        if not self.is_sorted:
+            return None
+        start = next((offset for month, offset in self.months.items() if month >= first), self.size)
+        end = next((offset for month, offset in self.months.items() if month[:len(last)] > last), self.size)
+        return start, max(start, end)
+
+    def save(self, file_name: str):
+        """Сохранение индекса в .json через временный файл
+
+        :param file_name: Имя файла индекса
+        :return:
+        """
+        temp_file_name = file_name + '.tmp'
+        with open(temp_file_name, 'w', encoding='utf-8') as write_file:
+            json.dump({'version': index_version, **vars(self)}, write_file, ensure_ascii=False)
+        os.replace(temp_file_name, file_name)
+
+    @classmethod
+    def load(cls, file_name: str):
+        """Загрузка индекса из .json
+
+        :param file_name: Имя файла индекса
+        :return: Индекс дат или None, если файл другой версии
+        """
+        with open(file_name, encoding='utf-8') as read_file:
+            data = json.load(read_file)
+        if data.pop('version', None) != index_version:
+            return None
+        return cls(**data)
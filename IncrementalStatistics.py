@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+
+from CsvChunks import get_byte_ranges, get_records_end
+from CurrencyRates import get_currency_rates
+from VacancyAggregator import VacancyAggregator
+from VacancyFrame import VacancyFrame
+
+state_version = 3
+hash_block_size = 1 << 20
+
+
+class IncrementalStatistics:
+    """Класс накопленной статистики по дописываемому .csv
+
+    Состояние - суммы и количества зарплат по годам и городам для всех вакансий и по годам для каждой профессии,
+    а также отметка: сколько байт файла уже учтено. Обновление разбирает только дописанные после отметки записи.
+    Учтённая часть файла хэшируется целиком при каждом обновлении: если в ней изменился хоть один байт,
+    файл считается новым и статистика считается заново
+
+    Attributes:
+        file_name (str): Имя файла
+        state_file_name (str): Имя .json файла состояния
+        start (int): С какого года учитывать вакансии
+        end (int): По какой год учитывать вакансии
+        offset (int): Граница записи, до которой файл уже учтён
+        fingerprint (str): Хэш байт файла до отметки
+        aggregators (dict): Словарь профессия - VacancyAggregator
+    """
+
+    def __init__(self, file_name: str, professions: list, state_file_name: str, start=2007, end=2014):
+        """Инициализация статистики: состояние загружается из файла, если оно посчитано для этого .csv и периода
+
+        :param file_name: Имя файла
+        :param professions: Названия отслеживаемых профессий
+        :param state_file_name: Имя .json файла состояния
+        :param start: С какого года учитывать вакансии
+        :param end: По какой год учитывать вакансии
+        """
+        if not professions:
+            raise ValueError('Не заданы профессии')
+        self.file_name = file_name
+        self.state_file_name = state_file_name
+        self.start = start
+        self.end = end
+        self.offset = 0
+        self.fingerprint = ''
+        self.aggregators = {}
+        if os.path.exists(state_file_name):
+            self.__load()
+        for name in professions:
+            self.aggregators.setdefault(name, None)
+
+    def update(self) -> int:
+        """Учёт дописанных записей и сохранение состояния
+
+        Профессии без накопленной статистики сначала считаются по уже учтённой части файла
+
+        :return: Количество прочитанных байт
+        """
+        prefix_hash = self.__get_prefix_hash(self.offset)
+        if prefix_hash is None or prefix_hash.hexdigest() != self.fingerprint:
+            self.offset, self.fingerprint = 0, ''
+            self.aggregators = dict.fromkeys(self.aggregators)
+            prefix_hash = hashlib.sha1()
+        data_start = self.offset or self.__get_data_start()
+        new_names = [name for name, aggregator in self.aggregators.items() if aggregator is None]
+        if new_names:
+            history = self.__get_aggregators(new_names, (self.__get_data_start(), data_start))
+            self.aggregators.update(zip(new_names, history))
+        data_end = get_records_end(self.file_name, data_start)
+        for aggregator in self.__get_aggregators(list(self.aggregators), (data_start, data_end)):
+            self.aggregators[aggregator.name].merge(aggregator)
+        self.__update_hash(prefix_hash, self.offset, data_end)
+        self.offset = data_end
+        self.fingerprint = prefix_hash.hexdigest()
+        self.save()
+        return data_end - data_start
+
+    def get_aggregator(self, name: str) -> VacancyAggregator:
+        """Накопленная статистика профессии
+
+        :param name: Название профессии
+        :return: Заполненный агрегатор
+        """
+        return self.aggregators[name]
+
+    def save(self):
+        """Сохранение состояния в .json, статистика всех вакансий хранится один раз
+
+        :return:
+        """
+        aggregator = next(iter(self.aggregators.values()))
+        state = {'version': state_version,
+                 'file_name': os.path.abspath(self.file_name),
+                 'start': self.start,
+                 'end': self.end,
+                 'offset': self.offset,
+                 'fingerprint': self.fingerprint,
+                 'currency_rates': get_currency_rates().fingerprint,
+                 'dict_sum_slr': aggregator.dict_sum_slr,
+                 'dict_count_vac': aggregator.dict_count_vac,
+                 'dict_sum_slr_cities': aggregator.dict_sum_slr_cities,
+                 'dict_count_vac_cities': aggregator.dict_count_vac_cities,
+                 'professions': {name: {'dict_sum_slr_name': aggregator.dict_sum_slr_name,
+                                        'dict_count_vac_name': aggregator.dict_count_vac_name}
+                                 for name, aggregator in self.aggregators.items()}}
+        temp_file_name = self.state_file_name + '.tmp'
+        with open(temp_file_name, 'w', encoding='utf-8') as write_file:
+            json.dump(state, write_file, ensure_ascii=False)
+        os.replace(temp_file_name, self.state_file_name)
+
+    def __load(self):
+        """Загрузка состояния из .json, состояние другого файла, периода, таблицы курсов или версии не загружается
+
+        :return:
+        """
+        with open(self.state_file_name, encoding='utf-8') as read_file:
+            state = json.load(read_file)
+        if state['version'] != state_version or state['file_name'] != os.path.abspath(self.file_name) or \
+                state['start'] != self.start or state['end'] != self.end or \
+                state['currency_rates'] != get_currency_rates().fingerprint:
+            return
+        self.offset = state['offset']
+        self.fingerprint = state['fingerprint']
+        for name, profession in state['professions'].items():
+            aggregator = VacancyAggregator(name)
+            aggregator.dict_sum_slr = self.__get_years(state['dict_sum_slr'])
+            aggregator.dict_count_vac = self.__get_years(state['dict_count_vac'])
+            aggregator.dict_sum_slr_name = self.__get_years(profession['dict_sum_slr_name'])
+            aggregator.dict_count_vac_name = self.__get_years(profession['dict_count_vac_name'])
+            aggregator.dict_sum_slr_cities = dict(state['dict_sum_slr_cities'])
+            aggregator.dict_count_vac_cities = dict(state['dict_count_vac_cities'])
+            self.aggregators[name] = aggregator
+
+    @staticmethod
+    def __get_years(data: dict) -> dict:
+        """Восстановление целых ключей-годов словаря из .json
+
+        :param data: Словарь со строковыми ключами
+        :return: Словарь с ключами int
+        >>> IncrementalStatistics._IncrementalStatistics__get_years({'2007': 1.5})
+        {2007: 1.5}
+        """
+        return {int(key): val for key, val in data.items()}
+
+    def __get_aggregators(self, names: list, byte_range: tuple) -> list:
+        """Статистика профессий по диапазону байт файла
+
+        :param names: Названия профессий
+        :param byte_range: Кортеж (начало, конец) в байтах по границам записей
+        :return: Список агрегаторов в порядке names
+        """
+        if byte_range[0] >= byte_range[1]:
+            return [VacancyAggregator(name) for name in names]
+        frame = VacancyFrame.from_file(self.file_name, self.start, self.end, byte_range=byte_range)
+        return frame.to_aggregators(names, self.start, self.end)
+
+    def __get_data_start(self) -> int:
+        """Начало первой записи после заголовков, для файла без записей - его размер
+
+        :return: Граница записи в байтах
+        """
+        byte_ranges = get_byte_ranges(self.file_name, 1)
+        return byte_ranges[0][0] if byte_ranges else os.path.getsize(self.file_name)
+
+    def __get_prefix_hash(self, offset: int):
+        """Хэш байт файла до отметки: совпадает с fingerprint, только если файл до отметки лишь дописывался
+
+        :param offset: Отметка в байтах
+        :return: Объект hashlib, который можно продолжить дописанными байтами, None - файл короче отметки
+        """
+        if os.path.getsize(self.file_name) < offset:
+            return None
+        prefix_hash = hashlib.sha1()
+        self.__update_hash(prefix_hash, 0, offset)
+        return prefix_hash
+
+    def __update_hash(self, prefix_hash, start: int, end: int):
+        """Добавление диапазона байт файла в хэш блоками по hash_block_size
+
+        :param prefix_hash: Объект hashlib
+        :param start: Начало диапазона в байтах
+        :param end: Конец диапазона в байтах
+        :return:
+        """
+        with open(self.file_name, 'rb') as read_file:
+            read_file.seek(start)
+            while start < end:
+                block = read_file.read(min(hash_block_size, end - start))
+                if not block:
+                    break
+                prefix_hash.update(block)
+                start += len(block)
@@ -1,10 +1,26 @@
 import csv
+import heapq
+import json
 import math
 import os
+import sys
+import textwrap
+from collections import OrderedDict
+from itertools import islice
 
 from prettytable import PrettyTable, ALL
 
+manifest_name = 'manifest.json'
+
 all_titles_table = ["№", "Название", "Оклад", "Название региона", "Дата публикации вакансии"]
+column_width = 20
+
+sort_keys_table = {
+    "Название": lambda vac: vac.name,
+    "Оклад": lambda vac: vac.salary.get_salary_to_rub(),
+    "Название региона": lambda vac: vac.area_name,
+    "Дата публикации вакансии": lambda vac: vac.published_at
+}
 
 dict_slr_currency = {
     "AZN": "Манаты",
@@ -25,14 +41,21 @@ class InputConnect:
 
     Attributes:
         file_name (str): Имя файла
-        name (str): Искомое имя
+        name (str): Искомое имя, None в пакетном режиме
+        professions (list): Названия профессий пакетного режима
         __dict_formatter_for_full_slr (dict): Словарь функций предобработки вакансий для вывода таблицы
     """
 
-    def __init__(self):
-        """Инициализация класса InputConnect"""
-        self.file_name = self.__processing_file_name('Resources/' + input('Введите название файла: '))
-        self.name = input('Введите название профессии: ')
+    def __init__(self, file_name=None, name=None, professions=None):
+        """Инициализация класса InputConnect, с консоли запрашивается только то, что не передано
+
+        :param file_name: Имя файла в папке Resources
+        :param name: Искомое имя
+        :param professions: Названия профессий пакетного режима, имя профессии тогда не запрашивается
+        """
+        self.file_name = self.__processing_file_name('Resources/' + (file_name or input('Введите название файла: ')))
+        self.professions = professions or []
+        self.name = name if name is not None or self.professions else input('Введите название профессии: ')
         self.__dict_formatter_for_full_slr = {
             'Название': lambda row: row.name,
             'Оклад': lambda
@@ -48,6 +71,16 @@ class InputConnect:
             'Дата публикации вакансии': lambda row: '.'.join(reversed(row.published_at[0:10].split('-')))
         }
 
+    @staticmethod
+    def read_professions(file_name: str) -> list:
+        """Чтение названий профессий из файла, по одному в строке, пустые строки и повторы пропускаются
+
+        :param file_name: Имя файла
+        :return: Список названий профессий
+        """
+        with open(file_name, encoding='utf-8-sig') as read_file:
+            return list(dict.fromkeys(line.strip() for line in read_file if line.strip()))
+
     @staticmethod
     def __processing_file_name(file_name: str) -> str:
         """Обработка ввода имени файла
@@ -94,34 +127,145 @@ class InputConnect:
             counter += 1
         print(table.get_string(fields=all_titles_table))
 
-    def split(self, delimiter=',', output_path='csv_files_by_year'): #TODO переделать в вид без чтения
-        with open(self.file_name, encoding='utf-8-sig') as read_file:
+    def stream_table_print(self, data_vacancies, is_full_slr=True, limit=None, offset=0, sort_title=None,
+                           reverse=False, page_size=50, file=None):
+        """Потоковый вывод таблицы страницами: ширина столбцов фиксирована, поэтому строки печатаются сразу,
+        а не после построения всей таблицы
+
+        С limit сортировка выбирает offset + limit первых вакансий через кучу, без limit сортируется весь список
+
+        :param data_vacancies: Итерируемый объект вакансий
+        :param is_full_slr: Выводить оклад 'от - до' с валютой, иначе средний оклад
+        :param limit: Сколько вакансий вывести, None - все
+        :param offset: Сколько вакансий пропустить
+        :param sort_title: Столбец сортировки из sort_keys_table, None - порядок файла
+        :param reverse: Сортировка по убыванию
+        :param page_size: Количество вакансий в одной записи в консоль
+        :param file: Куда выводить, по умолчанию sys.stdout
+        :return:
+        """
+        file = file or sys.stdout
+        formatter = self.__dict_formatter_for_full_slr if is_full_slr else self.__dict_formatter_for_small_slr
+        widths = [max(len(all_titles_table[0]), len(str(offset + limit))) if limit is not None else 7] + \
+                 [column_width] * (len(all_titles_table) - 1)
+        border = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+        page = [border, *self.__get_row_lines(all_titles_table, widths), border]
+        for counter, value in enumerate(self.__select_vacancies(data_vacancies, limit, offset, sort_title, reverse),
+                                        offset + 1):
+            row = [counter]
+            for v in all_titles_table[1:]:
+                temp = formatter[v](value)
+                row.append(temp if len(str(temp)) < 100 else str(temp)[:100] + '...')
+            page.extend(self.__get_row_lines(row, widths))
+            page.append(border)
+            if counter % page_size == 0:
+                file.write('\n'.join(page) + '\n')
+                file.flush()
+                page = []
+        if page:
+            file.write('\n'.join(page) + '\n')
+            file.flush()
+
+    @staticmethod
+    def __select_vacancies(data_vacancies, limit, offset: int, sort_title, reverse: bool):
+        """Выбор выводимых вакансий: срез потока или первые вакансии после сортировки
+
+        :param data_vacancies: Итерируемый объект вакансий
+        :param limit: Сколько вакансий вывести, None - все
+        :param offset: Сколько вакансий пропустить
+        :param sort_title: Столбец сортировки, None - порядок файла
+        :param reverse: Сортировка по убыванию
+        :return: Итерируемый объект вакансий
+        """
+        if sort_title is None:
+            return islice(data_vacancies, offset, None if limit is None else offset + limit)
+        key = sort_keys_table[sort_title]
+        if limit is None:
+            return sorted(data_vacancies, key=key, reverse=reverse)[offset:]
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        return select(offset + limit, data_vacancies, key=key)[offset:]
+
+    @staticmethod
+    def __get_row_lines(row: list, widths: list) -> list:
+        """Строки консоли одной строки таблицы, значения переносятся по ширине столбца
+
+        :param row: Значения ячеек
+        :param widths: Ширина столбцов
+        :return: Список строк
+        >>> InputConnect._InputConnect__get_row_lines([1, 'Ведущий аналитик данных'], [3, 10])
+        ['| 1   | Ведущий    |', '|     | аналитик   |', '|     | данных     |']
+        """
+        cells = [textwrap.wrap(str(value), width) or [''] for value, width in zip(row, widths)]
+        count_lines = max(map(len, cells))
+        return ['| ' + ' | '.join((cell[index] if index < len(cell) else '').ljust(width)
+                                  for cell, width in zip(cells, widths)) + ' |'
+                for index in range(count_lines)]
+
+    def split(self, delimiter=',', output_path='csv_files_by_year', partition_key=None, max_open_files=16) -> list:
+        """Разбиение .csv на чанки за один проход, входной файл может быть не отсортирован по годам
+
+        Открытыми держатся не более max_open_files файлов чанков, давно не использованный файл закрывается и при
+        следующей строке его чанка дописывается. В output_path сохраняется manifest.json с количеством строк и
+        размером каждого чанка
+
+        :param delimiter: Разделитель
+        :param output_path: Папка для чанков
+        :param partition_key: Функция ключа чанка от строки, по умолчанию две последние цифры года публикации
+        :param max_open_files: Наибольшее количество одновременно открытых файлов чанков
+        :return: Список имён файлов чанков, от больших к меньшим
+        """
+        os.makedirs(output_path, exist_ok=True)
+        with open(self.file_name, encoding='utf-8-sig', newline='') as read_file:
             file_reader = csv.reader(read_file, delimiter=delimiter)
             try:
                 titles = next(file_reader)
             except StopIteration:
                 print('Пустой файл')
                 exit(0)
+            if partition_key is None:
+                index_published_at = titles.index('published_at')
+                partition_key = lambda row: row[index_published_at][2:4]
+            writers = OrderedDict()
+            partitions = {}
+            try:
+                for row in file_reader:
+                    if len(row) != len(titles):
+                        continue
+                    key = partition_key(row)
+                    if key in writers:
+                        writers.move_to_end(key)
+                    else:
+                        if len(writers) >= max_open_files:
+                            writers.popitem(last=False)[1][0].close()
+                        writers[key] = self.__open_partition(output_path, key, titles, delimiter,
+                                                             is_new=key not in partitions)
+                        partitions.setdefault(key, {'file_name': writers[key][0].name, 'rows': 0})
+                    writers[key][1].writerow(row)
+                    partitions[key]['rows'] += 1
+            finally:
+                for write_file, _ in writers.values():
+                    write_file.close()
+        for partition in partitions.values():
+            partition['bytes'] = os.path.getsize(partition['file_name'])
+        with open(os.path.join(output_path, manifest_name), 'w', encoding='utf-8') as manifest_file:
+            json.dump({'titles': titles, 'partitions': partitions}, manifest_file, ensure_ascii=False, indent=4)
+        return [partition['file_name'] for partition in
+                sorted(partitions.values(), key=lambda partition: partition['bytes'], reverse=True)]
 
-            first_row = next(file_reader)
-            current_year = first_row[titles.index('published_at')][2:4]
-            current_out_path = output_path + '/' + current_year + '.csv'
-            file_names = [current_out_path]
-            current_out_writer = csv.writer(open(current_out_path, 'w', encoding='utf-8-sig'),
-                                            delimiter=delimiter,
-                                            lineterminator="\r")
-            current_out_writer.writerow(titles)
-            current_out_writer.writerow(first_row)
-            for row in file_reader:
-                if row[titles.index('published_at')][2:4] != current_year:
-                    current_year = row[titles.index('published_at')][2:4]
-                    current_out_path = output_path + '/' + current_year + '.csv'
-                    file_names.append(current_out_path)
-                    current_out_writer = csv.writer(open(current_out_path, 'w', encoding='utf-8-sig'),
-                                                    delimiter=delimiter,
-                                                    lineterminator="\r")
-                    current_out_writer.writerow(titles)
-                    current_out_writer.writerow(row)
-                else:
-                    current_out_writer.writerow(row)
-            return file_names
+    @staticmethod
+    def __open_partition(output_path: str, key: str, titles: list, delimiter: str, is_new: bool) -> tuple:
+        """Открытие файла чанка: новый чанк создаётся с заголовками, ранее закрытый дописывается
+
+        :param output_path: Папка для чанков
+        :param key: Ключ чанка
+        :param titles: Заголовки
+        :param delimiter: Разделитель
+        :param is_new: Чанк ещё не создавался
+        :return: Кортеж (файл, csv writer)
+        """
+        write_file = open(os.path.join(output_path, f'{key}.csv'), 'w' if is_new else 'a',
+                          encoding='utf-8-sig', newline='', buffering=1 << 20)
+        writer = csv.writer(write_file, delimiter=delimiter, lineterminator="\r")
+        if is_new:
+            writer.writerow(titles)
+        return write_file, writer
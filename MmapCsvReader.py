@@ -0,0 +1,167 @@
+import mmap
+import os
+
+from CsvChunks import get_terminator
+
+block_size = 1 << 22
+
+
+class MmapCsvReader:
+    """Класс чтения .csv через mmap: границы записей и полей ищутся в байтах, декодируются только нужные столбцы
+
+    Attributes:
+        file_name (str): Имя файла
+        titles (list): Все заголовки файла
+        columns (list): Заголовки декодируемых столбцов в порядке файла
+        byte_range (tuple): Читаемый диапазон байт, None - весь файл
+    """
+
+    def __init__(self, file_name: str, columns=None, byte_range=None):
+        """Инициализация читателя, заголовки читаются сразу
+
+        :param file_name: Имя файла
+        :param columns: Множество нужных заголовков, None - все столбцы
+        :param byte_range: Кортеж (начало, конец) в байтах по границам записей, None - весь файл
+        """
+        self.file_name = file_name
+        self.byte_range = byte_range
+        self.titles = []
+        self.columns = []
+        self.__indexes = []
+        self.__terminator = b'\n'
+        self.__data_start = 0
+        if os.path.getsize(file_name) == 0:
+            return
+        with open(file_name, 'rb') as read_file, mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 3 if mm[:3] == b'\xef\xbb\xbf' else 0
+            self.__terminator = get_terminator(mm)
+            record, self.__data_start = self.__read_record(mm, start, len(mm))
+            self.titles = [field.decode('utf-8') for field in self.__split_record(record)]
+        self.__indexes = [i for i, title in enumerate(self.titles) if columns is None or title in columns]
+        self.columns = [self.titles[i] for i in self.__indexes]
+
+    def __iter__(self):
+        """Чтение записей файла
+
+        Записи с неверным количеством полей или пустым полем в любом столбце пропускаются, как в DataSet
+
+        :return: Генератор списков декодированных значений столбцов columns
+        """
+        for _, values in self.iter_offsets():
+            yield values
+
+    def iter_offsets(self):
+        """Чтение записей файла вместе с их началом в байтах, записи пропускаются так же, как в __iter__
+
+        Если нужны все столбцы, запись без кавычек декодируется целиком одним вызовом, иначе декодируются
+        только нужные поля
+
+        :return: Генератор кортежей (начало записи в байтах, список декодированных значений столбцов columns)
+        """
+        if not self.titles:
+            return
+        count_titles = len(self.titles)
+        indexes = self.__indexes
+        is_all_columns = len(indexes) == count_titles
+        for record_start, record in self.__iter_records():
+            if is_all_columns and b'"' not in record:
+                values = record.decode('utf-8').split(',')
+                if len(values) == count_titles and '' not in values:
+                    yield record_start, values
+                continue
+            fields = self.__split_record(record) if b'"' in record else record.split(b',')
+            if len(fields) != count_titles or b'' in fields:
+                continue
+            yield record_start, [fields[i].decode('utf-8') for i in indexes]
+
+    def __iter_records(self):
+        """Чтение записей блоками: блок заканчивается последним концом строки в нём и делится на строки за один
+        вызов split, поэтому между блоками ничего не копируется. Строки с нечётным количеством кавычек
+        склеиваются со следующими, пока запись не закроется, через блоки переносится только такая запись
+
+        :return: Генератор кортежей (начало записи в байтах, байты записи без конца строки)
+        """
+        terminator = self.__terminator
+        with open(self.file_name, 'rb') as read_file, mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            position, end = self.byte_range or (self.__data_start, len(mm))
+            position = max(position, self.__data_start)
+            pending, pending_start, pending_quotes = None, 0, 0
+            while position < end:
+                block_end = end
+                if position + block_size < end:
+                    block_end = mm.rfind(terminator, position, position + block_size) + 1 or \
+                        mm.find(terminator, position + block_size, end) + 1 or end
+                lines = mm[position:block_end].split(terminator)
+                if not lines[-1]:
+                    lines.pop()
+                line_start = position
+                position = block_end
+                for line in lines:
+                    record_start = line_start
+                    line_start += len(line) + 1
+                    if pending is not None:
+                        pending.append(line)
+                        pending_quotes += line.count(b'"')
+                        if pending_quotes % 2:
+                            continue
+                        line, pending, record_start = terminator.join(pending), None, pending_start
+                    elif b'"' in line and line.count(b'"') % 2:
+                        pending, pending_start, pending_quotes = [line], record_start, line.count(b'"')
+                        continue
+                    yield record_start, line[:-1] if line.endswith(b'\r') else line
+            if pending is not None:
+                yield pending_start, terminator.join(pending)
+
+    def __read_record(self, mm, position: int, end: int) -> tuple:
+        """Чтение одной записи: строки объединяются, пока количество кавычек в записи нечётное
+
+        :param mm: Отображение файла в память
+        :param position: Начало записи
+        :param end: Конец читаемого диапазона
+        :return: Кортеж (байты записи без конца строки, начало следующей записи)
+        """
+        record_start = position
+        count_quotes = 0
+        while True:
+            line_end = mm.find(self.__terminator, position, end)
+            if line_end == -1:
+                line_end = next_position = end
+            else:
+                next_position = line_end + 1
+            quote = mm.find(b'"', position, line_end)
+            while quote != -1:
+                count_quotes += 1
+                quote = mm.find(b'"', quote + 1, line_end)
+            position = next_position
+            if count_quotes % 2 == 0 or position >= end:
+                break
+        record = mm[record_start:line_end]
+        if record.endswith(b'\r'):
+            record = record[:-1]
+        return record, position
+
+    @staticmethod
+    def __split_record(record: bytes) -> list:
+        """Разбиение записи с кавычками на поля по правилам csv: "" внутри кавычек - одна кавычка
+
+        Запись делится по кавычкам: чётные части лежат вне кавычек и делятся по запятым, нечётные - содержимое
+        полей в кавычках, пустая чётная часть между нечётными - экранированная кавычка
+
+        :param record: Байты записи
+        :return: Список байтов полей
+        >>> MmapCsvReader._MmapCsvReader__split_record(b'a,"b,""c"",d",,"e"')
+        [b'a', b'b,"c",d', b'', b'e']
+        >>> MmapCsvReader._MmapCsvReader__split_record(b'"",x,""')
+        [b'', b'x', b'']
+        """
+        segments = record.split(b'"')
+        fields = segments[0].split(b',')
+        for i in range(1, len(segments), 2):
+            if i > 1 and segments[i - 1] == b'':
+                fields[-1] += b'"'
+            fields[-1] += segments[i]
+            if i + 1 < len(segments):
+                outside = segments[i + 1].split(b',')
+                fields[-1] += outside[0]
+                fields.extend(outside[1:])
+        return fields
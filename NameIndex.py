@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+
+gram_size = 3
+
+
+class NameIndex:
+    """Класс инвертированного индекса по триграммам названий вакансий
+
+    Индекс строится по уникальным названиям, для каждого названия хранятся номера его строк, поэтому поиск стоит
+    пропорционально количеству найденных строк, а не размеру датасета. Совпадения те же, что у name in vacancy.name
+
+    Attributes:
+        names (list): Список уникальных названий вакансий
+        grams (dict): Словарь триграмма - список номеров названий, в которых она встречается
+        row_order (np.ndarray): Номера строк, упорядоченные по номеру названия
+        row_offsets (np.ndarray): Начало строк каждого названия в row_order
+    """
+
+    def __init__(self, names: list, grams: dict, row_order, row_offsets):
+        """Инициализация индекса из готовых частей
+
+        :param names: Список уникальных названий вакансий
+        :param grams: Словарь триграмма - список номеров названий
+        :param row_order: Номера строк, упорядоченные по номеру названия
+        :param row_offsets: Начало строк каждого названия в row_order
+        """
+        self.names = names
+        self.grams = grams
+        self.row_order = np.asarray(row_order, dtype=np.int64)
+        self.row_offsets = np.asarray(row_offsets, dtype=np.int64)
+
+    @classmethod
+    def from_names(cls, names: list, name_id):
+        """Построение индекса по уникальным названиям и номеру названия каждой строки
+
+        :param names: Список уникальных названий вакансий
+        :param name_id: Массив номеров названий строк
+        :return: Индекс
+        >>> index = NameIndex.from_names(['Аналитик', 'Ведущий аналитик', 'Программист'], [0, 2, 1, 2, 1])
+        >>> index.get_rows('аналитик').tolist()
+        [2, 4]
+        >>> index.get_rows('ам').tolist()
+        [1, 3]
+        """
+        name_id = np.asarray(name_id, dtype=np.int64)
+        row_order = np.argsort(name_id, kind='stable')
+        row_offsets = np.concatenate(([0], np.cumsum(np.bincount(name_id, minlength=len(names)))))
+        grams = {}
+        for index, name in enumerate(names):
+            for gram in {name[i:i + gram_size] for i in range(len(name) - gram_size + 1)}:
+                grams.setdefault(gram, []).append(index)
+        return cls(names, grams, row_order, row_offsets)
+
+    def get_name_ids(self, name: str) -> list:
+        """Номера названий, содержащих подстроку name
+
+        Кандидаты - пересечение списков триграмм запроса начиная с самого короткого, затем подстрока проверяется
+        у каждого кандидата. Запрос короче триграммы проверяется по всем уникальным названиям
+
+        :param name: Название профессии
+        :return: Отсортированный список номеров названий
+        """
+        if len(name) < gram_size:
+            return [index for index, vac_name in enumerate(self.names) if name in vac_name]
+        query_grams = {name[i:i + gram_size] for i in range(len(name) - gram_size + 1)}
+        postings = sorted((self.grams.get(gram, []) for gram in query_grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+        return sorted(index for index in candidates if name in self.names[index])
+
+    def get_rows(self, name: str) -> np.ndarray:
+        """Номера строк вакансий, в названии которых есть подстрока name, в порядке файла
+
+        :param name: Название профессии
+        :return: Отсортированный массив номеров строк
+        """
+        rows = [self.row_order[self.row_offsets[index]:self.row_offsets[index + 1]]
+                for index in self.get_name_ids(name)]
+        if not rows:
+            return np.array([], dtype=np.int64)
+        return np.sort(np.concatenate(rows))
+
+    def save(self, file_name: str):
+        """Сохранение индекса в двоичный файл .npz через временный файл
+
+        Названия не сохраняются: индекс всегда загружается вместе с кэшем VacancyFrame, в котором они уже есть
+
+        :param file_name: Имя файла .npz
+        :return:
+        """
+        grams = list(self.grams)
+        gram_lengths = [len(self.grams[gram]) for gram in grams]
+        temp_file_name = file_name + '.tmp.npz'
+        np.savez(temp_file_name,
+                 grams=np.array(grams, dtype=str),
+                 gram_offsets=np.concatenate(([0], np.cumsum(gram_lengths, dtype=np.int64))),
+                 gram_name_ids=np.array([index for gram in grams for index in self.grams[gram]], dtype=np.int32),
+                 row_order=self.row_order,
+                 row_offsets=self.row_offsets)
+        os.replace(temp_file_name, file_name)
+
+    @classmethod
+    def load(cls, file_name: str, names: list):
+        """Загрузка индекса из двоичного файла .npz
+
+        :param file_name: Имя файла .npz
+        :param names: Список уникальных названий вакансий, по которому индекс был построен
+        :return: Индекс
+        """
+        with np.load(file_name, allow_pickle=False) as data:
+            gram_offsets = data['gram_offsets'].tolist()
+            gram_name_ids = data['gram_name_ids'].tolist()
+            grams = {gram: gram_name_ids[gram_offsets[i]:gram_offsets[i + 1]]
+                     for i, gram in enumerate(data['grams'].tolist())}
+            return cls(names, grams, data['row_order'], data['row_offsets'])
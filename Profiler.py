@@ -0,0 +1,161 @@
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class Profiler:
+    """Класс замеров времени этапов, счётчиков строк и пиковой памяти
+
+    Пока замеры не включены, stage и count ничего не делают, поэтому вызовы можно оставлять в коде
+
+    Attributes:
+        enabled (bool): Включены ли замеры
+        stages (dict): Словарь этап - {'seconds': суммарное время, 'calls': количество замеров}
+        counters (dict): Словарь счётчик - значение
+        stats_file_name (str): Файл для pstats, None - cProfile не запускается
+    """
+
+    def __init__(self):
+        """Инициализация выключенного профайлера"""
+        self.enabled = False
+        self.stages = {}
+        self.counters = {}
+        self.stats_file_name = None
+        self.__start_time = None
+        self.__is_trace_memory = False
+        self.__profile = None
+        self.__lock = threading.Lock()
+
+    def start(self, is_trace_memory=False, stats_file_name=None):
+        """Включение замеров
+
+        :param is_trace_memory: Считать пик памяти Python через tracemalloc, замедляет работу
+        :param stats_file_name: Файл для дампа cProfile, None - cProfile не запускается
+        :return:
+        """
+        self.enabled = True
+        self.stages, self.counters = {}, {}
+        self.stats_file_name = stats_file_name
+        self.__start_time = time.perf_counter()
+        self.__is_trace_memory = is_trace_memory
+        if is_trace_memory:
+            tracemalloc.start()
+        if stats_file_name:
+            self.__profile = cProfile.Profile()
+            self.__profile.enable()
+
+    def start_from_env(self, summary_file_name=None, is_trace_memory=False, stats_file_name=None):
+        """Включение замеров флагом или переменными окружения VACANCY_PROFILE (файл сводки),
+        VACANCY_PROFILE_MEMORY и VACANCY_PROFILE_STATS (файл pstats)
+
+        :param summary_file_name: Файл сводки из аргументов запуска
+        :param is_trace_memory: Считать пик памяти через tracemalloc
+        :param stats_file_name: Файл для дампа cProfile
+        :return: Файл сводки или None, если замеры не включены
+        """
+        summary_file_name = summary_file_name or os.environ.get('VACANCY_PROFILE')
+        if not summary_file_name:
+            return None
+        self.start(is_trace_memory=is_trace_memory or bool(os.environ.get('VACANCY_PROFILE_MEMORY')),
+                   stats_file_name=stats_file_name or os.environ.get('VACANCY_PROFILE_STATS'))
+        return summary_file_name
+
+    @contextmanager
+    def stage(self, name: str):
+        """Замер времени этапа, время повторных замеров складывается
+
+        :param name: Название этапа
+        :return:
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float, calls=1):
+        """Добавление времени этапа, измеренного вызывающим кодом
+
+        :param name: Название этапа
+        :param seconds: Время в секундах
+        :param calls: Количество замеров
+        :return:
+        """
+        if not self.enabled:
+            return
+        with self.__lock:
+            stage = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            stage['seconds'] += seconds
+            stage['calls'] += calls
+
+    def count(self, name: str, value=1):
+        """Увеличение счётчика
+
+        :param name: Название счётчика
+        :param value: Прибавляемое значение
+        :return:
+        """
+        if not self.enabled:
+            return
+        with self.__lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def get_summary(self) -> dict:
+        """Сводка замеров: время этапов, счётчики и пиковая память
+
+        :return: Словарь сводки
+        >>> profiler = Profiler()
+        >>> profiler.start()
+        >>> profiler.count('rows_seen', 3)
+        >>> with profiler.stage('read'):
+        ...     pass
+        >>> summary = profiler.get_summary()
+        >>> summary['counters'], summary['stages']['read']['calls']
+        ({'rows_seen': 3}, 1)
+        """
+        summary = {'argv': sys.argv,
+                   'total_seconds': time.perf_counter() - self.__start_time if self.__start_time else 0.0,
+                   'stages': self.stages,
+                   'counters': self.counters}
+        if resource is not None:
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            summary['max_rss_bytes'] = max_rss if sys.platform == 'darwin' else max_rss * 1024
+        if self.__is_trace_memory and tracemalloc.is_tracing():
+            summary['peak_traced_bytes'] = tracemalloc.get_traced_memory()[1]
+        return summary
+
+    def stop(self, summary_file_name=None) -> dict:
+        """Выключение замеров, сохранение сводки в .json и дампа cProfile
+
+        :param summary_file_name: Файл сводки, None - сводка не сохраняется
+        :return: Словарь сводки
+        """
+        if self.__profile is not None:
+            self.__profile.disable()
+            pstats.Stats(self.__profile).sort_stats(pstats.SortKey.CUMULATIVE).dump_stats(self.stats_file_name)
+            self.__profile = None
+        summary = self.get_summary()
+        if self.__is_trace_memory:
+            tracemalloc.stop()
+        self.enabled = False
+        if summary_file_name:
+            with open(summary_file_name, 'w', encoding='utf-8') as write_file:
+                json.dump(summary, write_file, ensure_ascii=False, indent=4)
+        return summary
+
+
+profiler = Profiler()
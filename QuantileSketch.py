@@ -0,0 +1,145 @@
+import random
+
+import numpy as np
+
+default_k = 200
+capacity_ratio = 2 / 3
+batch_size = 1 << 16
+
+
+class QuantileSketch:
+    """Класс потокового эскиза квантилей KLL (Karnin, Lang, Liberty), эскизы частей данных складываются
+
+    Значения хранятся по уровням, значение уровня h весит 2 ** h. Переполненный уровень сортируется, и каждое
+    второе значение со случайным сдвигом переходит на уровень выше. Память - O(k) значений при любом их количестве.
+    Ошибка ранга при k = 200 не больше ~1.65% количества значений с вероятностью 99%: медиана оценивается значением,
+    ранг которого лежит между 48.35% и 51.65%. Пока значений не больше k, квантили точные.
+    Генератор случайных чисел инициализируется seed, поэтому одинаковые данные дают одинаковый эскиз
+
+    Attributes:
+        k (int): Размер верхнего уровня, определяет точность
+        count (int): Количество добавленных значений
+        levels (list): Списки значений по уровням
+    """
+
+    def __init__(self, k=default_k, seed=0):
+        """Инициализация пустого эскиза
+
+        :param k: Размер верхнего уровня
+        :param seed: Начальное значение генератора случайных чисел
+        """
+        self.k = k
+        self.count = 0
+        self.levels = [[]]
+        self.__random = random.Random(seed)
+        self.__size = 0
+        self.__max_size = self.__get_capacity(0)
+
+    def update(self, value: float):
+        """Добавление одного значения
+
+        :param value: Значение
+        :return:
+        """
+        self.levels[0].append(value)
+        self.count += 1
+        self.__size += 1
+        if self.__size >= self.__max_size:
+            self.__compress()
+
+    def update_many(self, values):
+        """Добавление массива значений: порции сортируются и сжимаются через NumPy до размера верхнего уровня
+
+        :param values: Итерируемые значения или массив
+        :return:
+        """
+        values = np.asarray(values, dtype=np.float64)
+        for start in range(0, len(values), batch_size):
+            batch = np.sort(values[start:start + batch_size])
+            self.count += len(batch)
+            height = 0
+            while len(batch) > self.k:
+                if len(batch) % 2:
+                    self.__add(height, [float(batch[-1])])
+                    batch = batch[:-1]
+                batch = batch[self.__random.getrandbits(1)::2]
+                height += 1
+            self.__add(height, batch.tolist())
+            while self.__size >= self.__max_size:
+                self.__compress()
+
+    def merge(self, other):
+        """Добавление значений другого эскиза, например частичного результата процесса
+
+        :param other: Эскиз
+        :return: Эскиз
+        """
+        for height, level in enumerate(other.levels):
+            self.__add(height, level)
+        self.count += other.count
+        while self.__size >= self.__max_size:
+            self.__compress()
+        return self
+
+    def get_quantiles(self, fractions: list) -> list:
+        """Оценка квантилей: значение наименьшего ранга, не меньшего fraction * count
+
+        :param fractions: Доли от 0 до 1
+        :return: Список значений, None для пустого эскиза
+        >>> sketch = QuantileSketch()
+        >>> sketch.update_many([5, 1, 4, 2, 3])
+        >>> sketch.get_quantiles([0.1, 0.5, 0.9])
+        [1.0, 3.0, 5.0]
+        >>> sketch = QuantileSketch(k=20)
+        >>> for value in range(10000):
+        ...     sketch.update(value)
+        >>> sum(len(level) for level in sketch.levels) < 100, abs(sketch.get_quantiles([0.5])[0] - 5000) < 1000
+        (True, True)
+        """
+        if not self.count:
+            return [None] * len(fractions)
+        values = np.array([value for level in self.levels for value in level], dtype=np.float64)
+        weights = np.concatenate([np.full(len(level), 1 << height, dtype=np.int64)
+                                  for height, level in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        ranks = np.cumsum(weights[order])
+        indexes = np.searchsorted(ranks, [fraction * ranks[-1] for fraction in fractions])
+        return [float(values[order[min(index, len(order) - 1)]]) for index in indexes]
+
+    def __add(self, height: int, values: list):
+        """Добавление значений на уровень
+
+        :param height: Номер уровня
+        :param values: Значения
+        :return:
+        """
+        while len(self.levels) <= height:
+            self.levels.append([])
+            self.__max_size = sum(self.__get_capacity(height) for height in range(len(self.levels)))
+        self.levels[height].extend(values)
+        self.__size += len(values)
+
+    def __compress(self):
+        """Сжатие нижнего переполненного уровня: каждое второе значение переходит на уровень выше,
+        при нечётном количестве одно значение остаётся
+
+        :return:
+        """
+        for height, level in enumerate(self.levels):
+            if len(level) < self.__get_capacity(height):
+                continue
+            level.sort()
+            kept = [level.pop()] if len(level) % 2 else []
+            promoted = level[self.__random.getrandbits(1)::2]
+            self.levels[height] = kept
+            self.__size -= len(level)
+            self.__add(height + 1, promoted)
+            return
+
+    def __get_capacity(self, height: int) -> int:
+        """Размер уровня: верхний уровень - k, каждый уровень ниже в capacity_ratio раз меньше, но не меньше 2
+
+        :param height: Номер уровня
+        :return: Размер уровня
+        """
+        return max(int(np.ceil(self.k * capacity_ratio ** (len(self.levels) - height - 1))), 2)
@@ -1,187 +1,526 @@
-import matplotlib.pyplot as plt
+import base64
+import io
+import os
+import re
+import shutil
+import textwrap
+from functools import lru_cache
+
 import numpy as np
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
 from openpyxl.utils import get_column_letter
 from openpyxl import Workbook
-from openpyxl.styles import Font, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Border, NamedStyle, Side
 from jinja2 import FileSystemLoader, Environment
 import pdfkit
 from StatisticsByCities import StatisticsByCities
 from StatisticsByYear import StatisticsByYear
+from VacancyAggregator import period_titles, quantile_fractions
+
+
+template_file_name = 'Resources/temp.html'
+details_titles = [('Название', 50), ('Средняя зарплата в рублях', 25), ('Название региона', 25),
+                  ('Дата публикации вакансии', 25)]
+pdf_backends = ('wkhtmltopdf', 'matplotlib')
+quantile_titles = {'p10': 'p10 зарплат', 'median': 'Медиана зарплат', 'p90': 'p90 зарплат'}
+image_font_size = 8
+max_sheet_rows = 1048576
+default_wkhtmltopdf_path = r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe'
+
+
+def get_wkhtmltopdf_path():
+    """Путь к wkhtmltopdf: переменная окружения WKHTMLTOPDF_PATH, затем PATH, затем путь установки Windows
+
+    :return: Путь к исполняемому файлу или None, если wkhtmltopdf не найден
+    """
+    path = os.environ.get('WKHTMLTOPDF_PATH') or shutil.which('wkhtmltopdf')
+    if path is None and os.path.exists(default_wkhtmltopdf_path):
+        path = default_wkhtmltopdf_path
+    return path
+
+
+@lru_cache(maxsize=None)
+def get_template(file_name: str):
+    """Шаблон отчёта .pdf, окружение Jinja создаётся и шаблон компилируется один раз на процесс
+
+    :param file_name: Имя файла шаблона
+    :return: Шаблон Jinja
+    """
+    return Environment(loader=FileSystemLoader(file_name)).get_template('')
 
 
 class Report:
-    """Библиотека генерации файлов отчёта в виде .pdf .png .xlsx"""
+    """Библиотека генерации файлов отчёта в виде .pdf .png .xlsx
+
+    Attributes:
+        output_path (str): Папка файлов отчёта
+        details (DataSet): Потоковый датасет для листа вакансий в .xlsx, None - лист не выгружается
+        pdf_backend (str): Способ генерации .pdf: 'wkhtmltopdf' - шаблон .html, 'matplotlib' - в текущем процессе
+    """
+
+    def __init__(self, output_path='Report', details=None, pdf_backend=None):
+        """Инициализация генератора отчёта, папка отчёта создаётся при необходимости
+
+        :param output_path: Папка файлов отчёта
+        :param details: Потоковый датасет для листа вакансий в .xlsx
+        :param pdf_backend: Способ генерации .pdf, по умолчанию переменная окружения REPORT_PDF_BACKEND,
+            иначе wkhtmltopdf, если он установлен, иначе matplotlib
+        >>> Report('Report', pdf_backend='latex')
+        Traceback (most recent call last):
+        ...
+        ValueError: Неизвестный бэкенд: latex
+        """
+        pdf_backend = pdf_backend or os.environ.get('REPORT_PDF_BACKEND') or \
+            ('wkhtmltopdf' if get_wkhtmltopdf_path() else 'matplotlib')
+        if pdf_backend not in pdf_backends:
+            raise ValueError(f'Неизвестный бэкенд: {pdf_backend}')
+        self.output_path = output_path
+        self.details = details
+        self.pdf_backend = pdf_backend
+        self.__figure = None
+        self.__image = None
+        os.makedirs(output_path, exist_ok=True)
+
+    @classmethod
+    def for_profession(cls, name_find_vac: str, output_path='Report', details=None, pdf_backend=None):
+        """Генератор отчёта в отдельной папке профессии для пакетного режима
+
+        :param name_find_vac: Имя запрашиваемой вакансии
+        :param output_path: Общая папка отчётов
+        :param details: Потоковый датасет для листа вакансий в .xlsx
+        :param pdf_backend: Способ генерации .pdf
+        :return: Генератор отчёта
+        """
+        return cls(os.path.join(output_path, re.sub(r'[\\/:*?"<>|]', '_', name_find_vac).strip() or '_'), details,
+                   pdf_backend)
 
     def generate_excel(self, name_find_vac: str, stat_by_year: StatisticsByYear, stat_by_cities: StatisticsByCities):
-        """Генерация XLSX файла отчёта
+        """Генерация XLSX файла отчёта в потоковом режиме openpyxl
+
+        Значения столбцов собираются заранее, поэтому ширина столбцов выставляется до записи строк, а ячейки
+        ссылаются на общие именованные стили. Если задан details, третьим листом выгружаются вакансии профессии.
+        Лист и первый столбец статистики подписываются периодом статистики: годы, кварталы, месяцы или недели.
+        Если статистика собиралась с эскизами, на листы добавляются столбцы p10, медианы и p90 зарплат
 
         :param name_find_vac: Имя запрашиваемой вакансии
+        :param stat_by_year: Класс статистики по периодам для генерации таблицы в .xlsx
         :param stat_by_cities: Класс статистики для генерации таблицы в .xlsx
         :return:
         """
-        wb = Workbook()
-        ws1 = wb.create_sheet("Статистика по годам")
-        ws2 = wb.create_sheet("Статистика по городам")
-        del wb['Sheet']
+        period_title, period_name = period_titles[stat_by_year.period]
+        periods = list(stat_by_year.dict_dynamics_slr)
+        year_quantile_titles, year_quantiles = self.__get_year_quantiles(name_find_vac, stat_by_year)
+        city_quantile_titles, city_quantiles = self.__get_city_quantiles(stat_by_cities, 9)
+        wb = Workbook(write_only=True)
+        self.__add_styles(wb)
+        self.__write_sheet(wb, f'Статистика по {period_name}',
+                           [(period_title, 'report_header'),
+                            ('Средняя зарплата', 'report_header'),
+                            (f'Средняя зарплата - {name_find_vac}', 'report_header'),
+                            ('Количество вакансий', 'report_header'),
+                            (f'Количество вакансий - {name_find_vac}', 'report_header')] +
+                           [(title, 'report_header') for title in year_quantile_titles],
+                           [self.__get_column(stat_by_year.dict_dynamics_slr, True, 0),
+                            self.__get_column(stat_by_year.dict_dynamics_slr, False, 0),
+                            self.__get_period_values(stat_by_year.dict_dynamics_slr_name, periods),
+                            self.__get_period_values(stat_by_year.dict_dynamics_count_vac, periods),
+                            self.__get_period_values(stat_by_year.dict_dynamics_count_vac_name, periods)] +
+                           year_quantiles)
+        self.__write_sheet(wb, 'Статистика по городам',
+                           [('Город', 'report_bold'),
+                            ('Уровень зарплат', 'report_header')] +
+                           [(title, 'report_header') for title in city_quantile_titles] +
+                           [(None, 'report_cell'),
+                            ('Город', 'report_bold'),
+                            ('Доля вакансий', 'report_header'),
+                            (None, 'report_cell')],
+                           [self.__get_column(stat_by_cities.dict_dynamics_slr_cities, True, 10),
+                            self.__get_column(stat_by_cities.dict_dynamics_slr_cities, False, 10)] +
+                           city_quantiles +
+                           [[],
+                            self.__get_column(stat_by_cities.dict_dynamics_count_vac_big_cities, True, 10),
+                            self.__get_column(stat_by_cities.dict_dynamics_count_vac_big_cities, False, 10)])
+        if self.details is not None:
+            self.__write_details(wb, name_find_vac)
+        wb.save(os.path.join(self.output_path, 'report.xlsx'))
+
+    @staticmethod
+    def __add_styles(wb: Workbook):
+        """Регистрация общих именованных стилей ячеек в книге
+
+        :param wb: Workbook
+        :return:
+        """
         thin_border = Border(left=Side(style='thin'),
                              right=Side(style='thin'),
                              top=Side(style='thin'),
                              bottom=Side(style='thin'))
-        ft = Font(bold=True)
-
-        ws1.cell(1, 1, 'Год').font = ft
-        ws1.cell(1, 2, 'Средняя зарплата').font = ft
-        ws1.cell(1, 3, f'Средняя зарплата - {name_find_vac}').font = ft
-        ws1.cell(1, 4, 'Количество вакансий').font = ft
-        ws1.cell(1, 5, f'Количество вакансий - {name_find_vac}').font = ft
-        for index in range(5):
-            ws1.cell(1, index + 1).border = thin_border
-
-        self.__add_cell(ws1, stat_by_year.dict_dynamics_slr, 1, True, thin_border, 0)
-        self.__add_cell(ws1, stat_by_year.dict_dynamics_slr, 2, False, thin_border, 0)
-        self.__add_cell(ws1, stat_by_year.dict_dynamics_slr_name, 3, False, thin_border, 0)
-        self.__add_cell(ws1, stat_by_year.dict_dynamics_count_vac, 4, False, thin_border, 0)
-        self.__add_cell(ws1, stat_by_year.dict_dynamics_count_vac_name, 5, False, thin_border, 0)
-
-        ws2.cell(1, 1, 'Город').font = ft
-        ws2.cell(1, 2, 'Уровень зарплат').font = ft
-        ws2.cell(1, 4, 'Город').font = ft
-        ws2.cell(1, 5, 'Доля вакансий').font = ft
-        for index in range(5):
-            ws2.cell(1, index + 1 if index == (2 or 3) else index + 2).border = thin_border
-
-        self.__add_cell(ws2, stat_by_cities.dict_dynamics_slr_cities, 1, True, thin_border, 10)
-        self.__add_cell(ws2, stat_by_cities.dict_dynamics_slr_cities, 2, False, thin_border, 10)
-        self.__add_cell(ws2, stat_by_cities.dict_dynamics_count_vac_big_cities, 4, True, thin_border, 10)
-        self.__add_cell(ws2, stat_by_cities.dict_dynamics_count_vac_big_cities, 5, False, thin_border, 10)
-
-        self.__auto_width(ws1)
-        self.__auto_width(ws2)
-        wb.save('Report/report.xlsx')
-
-    def __add_cell(self, ws, data: dict, y: int, key: bool, border: Border, limit: int):
-        """Добавдение ячейки
-
-        :param ws: WorkSheet
+        wb.add_named_style(NamedStyle(name='report_header', font=Font(bold=True), border=thin_border))
+        wb.add_named_style(NamedStyle(name='report_bold', font=Font(bold=True)))
+        wb.add_named_style(NamedStyle(name='report_cell', border=thin_border))
+
+    @staticmethod
+    def __get_column(data: dict, key: bool, limit: int) -> list:
+        """Значения столбца таблицы
+
         :param data: Целевой словарь
-        :param y: Координата смещения
         :param key: Ключ вывода ключей True если надо вывести ключи словаря, False если значения
-        :param border: Обводка
-        :param limit: Ограничение
-        :return:
+        :param limit: Ограничение: выводится limit - 1 значений, 0 - без ограничения
+        :return: Список значений
+        >>> Report._Report__get_column({'Москва': 0.5, 'Казань': 0.25}, False, 0)
+        ['50.0%', '25.0%']
+        >>> Report._Report__get_column({2007: 10, 2008: 20, 2009: 30}, True, 3)
+        [2007, 2008]
+        """
+        values = list(data.keys()) if key else list(data.values())
+        if not key and values and values[0] < 1:
+            values = [str(round(val * 100, 2)) + '%' for val in values]
+        return values[:limit - 1] if limit else values
+
+    @staticmethod
+    def __get_period_values(data: dict, periods: list) -> list:
+        """Значения ряда по периодам статистики всех вакансий, в периоде без значения - 0
+
+        Ряды искомой профессии есть не во всех периодах, поэтому они выравниваются по ключам, а не по порядку
+
+        :param data: Словарь период - значение
+        :param periods: Периоды строк таблицы или столбцов графика
+        :return: Список значений
+        >>> Report._Report__get_period_values({'2007-01': 10, '2007-03': 30}, ['2007-01', '2007-02', '2007-03'])
+        [10, 0, 30]
+        """
+        return [data.get(period, 0) for period in periods]
+
+    @staticmethod
+    def __get_year_quantiles(name_find_vac: str, stat_by_year: StatisticsByYear) -> tuple:
+        """Заголовки и столбцы квантилей зарплат по периодам: сначала для всех вакансий, затем для искомых
+
+        :param name_find_vac: Имя запрашиваемой вакансии
+        :param stat_by_year: Класс статистики по периодам
+        :return: Кортеж (заголовки, столбцы), пустые, если статистика собиралась без эскизов
         """
-        if key:
-            for index, year in enumerate(data.keys()):
-                if index + 1 != limit:
-                    ws.cell(index + 2, y, year).border = border
-                else:
-                    break
-        elif list(data.values())[0] < 1:
-            for index, val in enumerate(data.values()):
-                if index + 1 != limit:
-                    ws.cell(index + 2, y, str(round(val * 100, 2)) + '%').border = border
-                else:
-                    break
-        else:
-            for index, val in enumerate(data.values()):
-                if index + 1 != limit:
-                    ws.cell(index + 2, y, val).border = border
-                else:
-                    break
-
-    def __auto_width(self, ws):
-        """Функция автоматического выставления границ столбцов
-
-        :param ws: WorkSheet
+        if not stat_by_year.dict_dynamics_quantiles_slr:
+            return [], []
+        keys = list(stat_by_year.dict_dynamics_slr)
+        return (list(quantile_titles.values()) + [f'{title} - {name_find_vac}' for title in quantile_titles.values()],
+                Report.__get_quantile_columns(stat_by_year.dict_dynamics_quantiles_slr, keys) +
+                Report.__get_quantile_columns(stat_by_year.dict_dynamics_quantiles_slr_name, keys))
+
+    @staticmethod
+    def __get_city_quantiles(stat_by_cities: StatisticsByCities, limit: int) -> tuple:
+        """Заголовки и столбцы квантилей зарплат первых limit 'больших' городов
+
+        :param stat_by_cities: Класс статистики по городам
+        :param limit: Количество городов
+        :return: Кортеж (заголовки, столбцы), пустые, если статистика собиралась без эскизов
+        """
+        if not stat_by_cities.dict_dynamics_quantiles_slr_cities:
+            return [], []
+        return (list(quantile_titles.values()),
+                Report.__get_quantile_columns(stat_by_cities.dict_dynamics_quantiles_slr_cities,
+                                              list(stat_by_cities.dict_dynamics_slr_cities)[:limit]))
+
+    @staticmethod
+    def __get_quantile_columns(dict_quantiles: dict, keys: list) -> list:
+        """Столбцы p10, медианы и p90 по ключам, для ключа без эскиза - пустые ячейки
+
+        :param dict_quantiles: Словарь ключ - {'p10': ..., 'median': ..., 'p90': ...}
+        :param keys: Ключи строк таблицы
+        :return: Список столбцов
+        >>> Report._Report__get_quantile_columns({2007: {'p10': 1, 'median': 2, 'p90': 3}}, [2007, 2008])
+        [[1, None], [2, None], [3, None]]
+        """
+        return [[dict_quantiles.get(key, {}).get(fraction) for key in keys] for fraction in quantile_fractions]
+
+    @staticmethod
+    def __write_sheet(wb: Workbook, title: str, header: list, columns: list):
+        """Запись листа: ширина столбца - длина самого длинного значения с учётом пустых ячеек
+
+        :param wb: Workbook
+        :param title: Название листа
+        :param header: Список кортежей (заголовок, стиль)
+        :param columns: Списки значений столбцов
         :return:
         """
-        for column_cells in ws.columns:
-            new_column_length = max(len(str(cell.value)) for cell in column_cells)
-            new_column_letter = (get_column_letter(column_cells[0].column))
+        ws = wb.create_sheet(title)
+        count_rows = max(map(len, columns))
+        for index, (value, _) in enumerate(header):
+            column = columns[index] if index < len(columns) else []
+            new_column_length = max(len(str(cell)) for cell in [value] + column + [None] * (count_rows - len(column)))
             if new_column_length > 0:
-                ws.column_dimensions[new_column_letter].width = new_column_length * 1.23
+                ws.column_dimensions[get_column_letter(index + 1)].width = new_column_length * 1.23
+        ws.append([Report.__get_cell(ws, value, style) for value, style in header])
+        for row in range(count_rows):
+            ws.append([Report.__get_cell(ws, column[row], 'report_cell') if row < len(column) else None
+                       for column in columns])
+
+    @staticmethod
+    def __get_cell(ws, value, style: str) -> WriteOnlyCell:
+        """Ячейка потокового листа с именованным стилем
+
+        :param ws: WriteOnlyWorksheet
+        :param value: Значение
+        :param style: Имя стиля
+        :return: Ячейка
+        """
+        cell = WriteOnlyCell(ws, value)
+        cell.style = style
+        return cell
+
+    def __write_details(self, wb: Workbook, name_find_vac: str):
+        """Потоковая выгрузка вакансий профессии на отдельные листы, строки не накапливаются в памяти
+
+        Потоковый лист openpyxl не ограничивает количество строк, а Excel не открывает лист длиннее max_sheet_rows,
+        поэтому после max_sheet_rows - 1 вакансий начинается следующий лист 'Вакансии 2', 'Вакансии 3' и т.д.
+
+        :param wb: Workbook
+        :param name_find_vac: Имя запрашиваемой вакансии
+        :return:
+        """
+        ws = self.__create_details_sheet(wb, 'Вакансии')
+        count_sheets, count_rows = 1, 1
+        for vac in self.details.iter_vacancies(name_find_vac):
+            if count_rows == max_sheet_rows:
+                count_sheets += 1
+                ws, count_rows = self.__create_details_sheet(wb, f'Вакансии {count_sheets}'), 1
+            ws.append([vac.name, vac.salary.get_salary_to_rub(), vac.area_name,
+                       '.'.join(reversed(vac.published_at[0:10].split('-')))])
+            count_rows += 1
+
+    @staticmethod
+    def __create_details_sheet(wb: Workbook, title: str):
+        """Лист вакансий с заголовками, ширина столбцов задаётся заранее, так как потоковый лист нельзя изменить
+        после записи строк
+
+        :param wb: Workbook
+        :param title: Название листа
+        :return: Лист
+        """
+        ws = wb.create_sheet(title)
+        for index, (column_title, width) in enumerate(details_titles):
+            ws.column_dimensions[get_column_letter(index + 1)].width = width * 1.23
+        ws.append([Report.__get_cell(ws, column_title, 'report_header') for column_title, _ in details_titles])
+        return ws
 
     def generate_image(self, name_find_vac: str, stat_by_year: StatisticsByYear, stat_by_cities: StatisticsByCities):
-        """Функция генерации графиков отчета в .png
+        """Функция генерации графиков отчета в .png, график остаётся в памяти для .pdf
+
+        :param name_find_vac: Имя запрашиваемой вакансии
+        :param stat_by_cities: Класс статистики для генерации графиков
+        :return:
+        """
+        self.__render_image(name_find_vac, stat_by_year, stat_by_cities)
+        with open(os.path.join(self.output_path, 'graph.png'), 'wb') as write_file:
+            write_file.write(self.__image)
+
+    def __render_image(self, name_find_vac: str, stat_by_year: StatisticsByYear, stat_by_cities: StatisticsByCities):
+        """Построение графиков отчета и их .png в памяти
 
         :param name_find_vac: Имя запрашиваемой вакансии
         :param stat_by_cities: Класс статистики для генерации графиков
         :return:
         """
-        fig = plt.figure(figsize=(10, 6))
-        plt.rcParams['font.size'] = '8'
+        period_name = period_titles[stat_by_year.period][1]
+        periods = list(stat_by_year.dict_dynamics_slr)
+        fig = Figure(figsize=(10, 6))
         width = 0.4
-        years = np.arange(len(stat_by_year.dict_dynamics_slr.keys()))
+        years = np.arange(len(periods))
         ax = fig.add_subplot(221)
         ax.bar(years - width / 2,
                stat_by_year.dict_dynamics_slr.values(),
                width,
                label='средняя з/п')
         ax.bar(years + width / 2,
-               stat_by_year.dict_dynamics_slr_name.values(),
+               self.__get_period_values(stat_by_year.dict_dynamics_slr_name, periods),
                width,
                label=f'з/п {name_find_vac}')
-        ax.set_title('Уровень зарплат по годам')
+        ax.set_title(f'Уровень зарплат по {period_name}', fontsize=image_font_size)
         ax.set_xticks(years)
-        ax.set_xticklabels(stat_by_year.dict_dynamics_slr.keys())
-        ax.legend()
+        ax.set_xticklabels(periods)
+        ax.legend(fontsize=image_font_size)
+        self.__set_font_size(ax)
 
         bx = fig.add_subplot(222)
         bx.bar(years - width / 2,
-               stat_by_year.dict_dynamics_count_vac.values(),
+               self.__get_period_values(stat_by_year.dict_dynamics_count_vac, periods),
                width,
                label='Количество вакансий')
         bx.bar(years + width / 2,
-               stat_by_year.dict_dynamics_count_vac_name.values(),
+               self.__get_period_values(stat_by_year.dict_dynamics_count_vac_name, periods),
                width,
                label=f'Количество вакансий\n{name_find_vac}')
-        bx.set_title('Количество вакансий по годам')
+        bx.set_title(f'Количество вакансий по {period_name}', fontsize=image_font_size)
         bx.set_xticks(years)
-        bx.set_xticklabels(stat_by_year.dict_dynamics_slr.keys())
-        bx.legend()
+        bx.set_xticklabels(periods)
+        bx.legend(fontsize=image_font_size)
         bx.grid(axis='y')
+        self.__set_font_size(bx)
 
         dynamics_slr_cities_rev = dict(reversed(list(stat_by_cities.dict_dynamics_slr_cities.items())[:10]))
         cities_slr = np.arange(len(dynamics_slr_cities_rev.keys()))
         cx = fig.add_subplot(223)
         cx.barh(cities_slr - width / 2, dynamics_slr_cities_rev.values(), width + 0.2)
-        cx.set_title('Уровень зарплат по годам')
+        cx.set_title('Уровень зарплат по городам', fontsize=image_font_size)
         cx.set_yticks(cities_slr)
         cx.set_yticklabels(dynamics_slr_cities_rev.keys())
         cx.grid(axis='x')
+        self.__set_font_size(cx)
 
         dx = fig.add_subplot(224)
         dynamics_count_vac_cit_rev = dict(reversed(list(stat_by_cities.dict_dynamics_count_vac_all_cities.items())))
         dx.pie(dynamics_count_vac_cit_rev.values(),
-               labels=dynamics_count_vac_cit_rev.keys())
-        dx.set_title('Доля вакансий по городам')
+               labels=dynamics_count_vac_cit_rev.keys(),
+               textprops={'fontsize': image_font_size})
+        dx.set_title('Доля вакансий по городам', fontsize=image_font_size)
         dx.axis("equal")
-        fig.savefig('Report/graph.png')
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png')
+        self.__figure, self.__image = fig, buffer.getvalue()
+
+    @staticmethod
+    def __set_font_size(ax):
+        """Размер шрифта подписей осей задаётся у самих осей, а не в общих rcParams, которые видны всем потокам
+
+        :param ax: Оси
+        :return:
+        """
+        ax.tick_params(labelsize=image_font_size)
+        ax.xaxis.get_offset_text().set_fontsize(image_font_size)
+        ax.yaxis.get_offset_text().set_fontsize(image_font_size)
+
+    def release_image(self):
+        """Освобождение графика и .png в памяти после генерации .pdf
+
+        :return:
+        """
+        self.__figure, self.__image = None, None
 
     def generate_pdf(self, name_find_vac: str, stat_by_year: StatisticsByYear, stat_by_cities: StatisticsByCities):
         """Функция генерации отчета в виде .pdf совмещающего и графики, и таблицы
 
+        Используются графики из памяти, построенные generate_image, иначе они строятся заново.
+        После генерации графики освобождаются, чтобы пакетный режим не держал их до конца работы
+
         :param name_find_vac: Имя запрашиваемой вакансии
         :param stat_by_cities: Класс статистики для генерации графиков и таблиц
         :return:
         """
-        loader = FileSystemLoader('Resources/temp.html')
-        env = Environment(loader=loader)
-        template = env.get_template('')
+        if self.__figure is None:
+            self.__render_image(name_find_vac, stat_by_year, stat_by_cities)
+        try:
+            if self.pdf_backend == 'matplotlib':
+                self.__generate_pdf_matplotlib(name_find_vac, stat_by_year, stat_by_cities)
+            else:
+                self.__generate_pdf_wkhtmltopdf(name_find_vac, stat_by_year, stat_by_cities)
+        finally:
+            self.release_image()
+
+    def __generate_pdf_wkhtmltopdf(self, name_find_vac: str, stat_by_year: StatisticsByYear,
+                                   stat_by_cities: StatisticsByCities):
+        """Генерация .pdf из шаблона .html через wkhtmltopdf, график встраивается в страницу
+
+        :param name_find_vac: Имя запрашиваемой вакансии
+        :param stat_by_cities: Класс статистики для генерации графиков и таблиц
+        :return:
+        """
+        template = get_template(template_file_name)
+        period_title, period_name = period_titles[stat_by_year.period]
+        periods = list(stat_by_year.dict_dynamics_slr)
+        year_quantile_titles, year_quantiles = self.__get_year_quantiles(name_find_vac, stat_by_year)
+        city_quantile_titles, city_quantiles = self.__get_city_quantiles(stat_by_cities, 10)
         slr_count_vac_sheet = template.render(name=name_find_vac,
+                                              period_title=period_title,
+                                              period_name=period_name,
+                                              year_quantile_titles=year_quantile_titles,
+                                              year_quantiles=list(zip(*year_quantiles)),
+                                              city_quantile_titles=city_quantile_titles,
+                                              city_quantiles=list(zip(*city_quantiles)),
+                                              image='data:image/png;base64,' + base64.b64encode(self.__image).decode(),
                                               year=list(stat_by_year.dict_dynamics_slr),
                                               slr=list(stat_by_year.dict_dynamics_slr.values()),
-                                              slr_name=list(stat_by_year.dict_dynamics_slr_name.values()),
-                                              count_vac=list(stat_by_year.dict_dynamics_count_vac.values()),
-                                              count_vac_name=list(stat_by_year.dict_dynamics_count_vac_name.values()),
+                                              slr_name=self.__get_period_values(stat_by_year.dict_dynamics_slr_name,
+                                                                                periods),
+                                              count_vac=self.__get_period_values(stat_by_year.dict_dynamics_count_vac,
+                                                                                 periods),
+                                              count_vac_name=self.__get_period_values(
+                                                  stat_by_year.dict_dynamics_count_vac_name, periods),
                                               city1=list(stat_by_cities.dict_dynamics_slr_cities.keys())[:10],
                                               slr_lvl=list(stat_by_cities.dict_dynamics_slr_cities.values())[:10],
                                               city2=list(stat_by_cities.dict_dynamics_count_vac_big_cities.keys())[:10],
-                                              part_slr=list(map(lambda x: str(round(x * 100, 4)) + '%',
-                                                                stat_by_cities.dict_dynamics_count_vac_big_cities.values()))[
-                                                       :10])
-        config = pdfkit.configuration(wkhtmltopdf=r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe')
+                                              part_slr=self.__get_part_slr(stat_by_cities))
+        config = pdfkit.configuration(wkhtmltopdf=get_wkhtmltopdf_path() or 'wkhtmltopdf')
         pdfkit.from_string(slr_count_vac_sheet,
-                           'Report/report.pdf',
+                           os.path.join(self.output_path, 'report.pdf'),
                            configuration=config,
-                           options={'enable-local-file-access': None})
\ No newline at end of file
+                           options={'enable-local-file-access': None})
+
+    def __generate_pdf_matplotlib(self, name_find_vac: str, stat_by_year: StatisticsByYear,
+                                  stat_by_cities: StatisticsByCities):
+        """Генерация .pdf в текущем процессе: страница графиков и страница таблиц matplotlib
+
+        :param name_find_vac: Имя запрашиваемой вакансии
+        :param stat_by_cities: Класс статистики для генерации графиков и таблиц
+        :return:
+        """
+        period_title, period_name = period_titles[stat_by_year.period]
+        periods = list(stat_by_year.dict_dynamics_slr)
+        year_quantile_titles, year_quantiles = self.__get_year_quantiles(name_find_vac, stat_by_year)
+        city_quantile_titles, city_quantiles = self.__get_city_quantiles(stat_by_cities, 10)
+        fig = Figure(figsize=(8.27, 11.69))
+        fig.suptitle(f'Аналитика по зарплатам и городам для профессии - {name_find_vac}', fontsize=12)
+        ax = fig.add_axes([0.05, 0.55, 0.9, 0.35])
+        ax.set_title(f'Статистика по {period_name}')
+        self.__add_table(ax, [period_title, 'Средняя зарплата', f'Средняя зарплата - {name_find_vac}',
+                              'Количество вакансий', f'Количество вакансий - {name_find_vac}'] + year_quantile_titles,
+                         [list(stat_by_year.dict_dynamics_slr),
+                          list(stat_by_year.dict_dynamics_slr.values()),
+                          self.__get_period_values(stat_by_year.dict_dynamics_slr_name, periods),
+                          self.__get_period_values(stat_by_year.dict_dynamics_count_vac, periods),
+                          self.__get_period_values(stat_by_year.dict_dynamics_count_vac_name, periods)] +
+                         year_quantiles)
+        bx = fig.add_axes([0.05, 0.08, 0.42, 0.4])
+        bx.set_title('Уровень зарплат по городам')
+        self.__add_table(bx, ['Город', 'Уровень зарплат'] + city_quantile_titles,
+                         [list(stat_by_cities.dict_dynamics_slr_cities.keys())[:10],
+                          list(stat_by_cities.dict_dynamics_slr_cities.values())[:10]] + city_quantiles)
+        cx = fig.add_axes([0.53, 0.08, 0.42, 0.4])
+        cx.set_title('Доля вакансий по городам')
+        self.__add_table(cx, ['Город', 'Доля вакансий'],
+                         [list(stat_by_cities.dict_dynamics_count_vac_big_cities.keys())[:10],
+                          self.__get_part_slr(stat_by_cities)])
+        with PdfPages(os.path.join(self.output_path, 'report.pdf'),
+                      metadata={'Title': f'Отчёт по профессии {name_find_vac}'}) as pdf:
+            pdf.savefig(self.__figure)
+            pdf.savefig(fig)
+
+    @staticmethod
+    def __add_table(ax, titles: list, columns: list):
+        """Таблица matplotlib по столбцам значений на осях без рамки, None выводится пустой ячейкой
+
+        :param ax: Оси
+        :param titles: Заголовки столбцов
+        :param columns: Списки значений столбцов
+        :return:
+        """
+        ax.axis('off')
+        cell_text = [['' if value is None else str(value) for value in row] for row in zip(*columns)]
+        table = ax.table(cellText=cell_text or None,
+                         colLabels=[textwrap.fill(title, 20) for title in titles], loc='upper center', cellLoc='center')
+        table.auto_set_font_size(False)
+        table.set_fontsize(7)
+        for (row, _), cell in table.get_celld().items():
+            if row == 0:
+                cell.get_text().set_fontweight('bold')
+                cell.set_height(cell.get_height() * 2.5)
+
+    @staticmethod
+    def __get_part_slr(stat_by_cities: StatisticsByCities) -> list:
+        """Доли вакансий 'больших' городов в процентах для таблицы .pdf
+
+        :param stat_by_cities: Класс статистики по городам
+        :return: Список строк долей
+        """
+        return list(map(lambda x: str(round(x * 100, 4)) + '%',
+                        stat_by_cities.dict_dynamics_count_vac_big_cities.values()))[:10]
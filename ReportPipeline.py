@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+
+from Profiler import profiler
+from Report import Report, template_file_name
+from StatisticsByCities import StatisticsByCities
+from StatisticsByYear import StatisticsByYear
+from TaskExecutor import TaskExecutor
+
+hash_file_name = 'report_hash.json'
+artifact_files = {'excel': 'report.xlsx', 'image': 'graph.png', 'pdf': 'report.pdf'}
+artifact_chains = [('excel',), ('image', 'pdf')]
+
+
+def generate_artifacts(report: Report, artifacts: tuple, name_find_vac: str, stat_by_year: StatisticsByYear,
+                       stat_by_cities: StatisticsByCities) -> tuple:
+    """Генерация файлов отчёта по порядку, функция уровня модуля, чтобы её можно было передать в процесс
+
+    После цепочки график в памяти освобождается, даже если .pdf не перестраивался
+
+    :param report: Генератор отчёта
+    :param artifacts: Названия файлов отчёта: 'excel', 'image', 'pdf'
+    :param name_find_vac: Имя запрашиваемой вакансии
+    :param stat_by_year: Статистика по годам
+    :param stat_by_cities: Статистика по городам
+    :return: Сгенерированные файлы отчёта
+    """
+    try:
+        for artifact in artifacts:
+            with profiler.stage(f'report_{artifact}'):
+                getattr(report, f'generate_{artifact}')(name_find_vac, stat_by_year, stat_by_cities)
+    finally:
+        report.release_image()
+    return artifacts
+
+
+class ReportPipeline:
+    """Класс параллельной генерации отчётов
+
+    Таблица .xlsx строится параллельно с цепочкой график - .pdf, так как .pdf использует готовый график.
+    Файл, входные данные которого не изменились с прошлой генерации, не перестраивается
+
+    Attributes:
+        executor (TaskExecutor): Исполнитель задач генерации
+    """
+
+    def __init__(self, executor=None):
+        """Инициализация конвейера
+
+        :param executor: TaskExecutor, по умолчанию пул потоков
+        """
+        self.executor = executor or TaskExecutor('thread', max_workers=max(2, os.cpu_count() or 1))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.executor.shutdown()
+
+    def run(self, report: Report, name_find_vac: str, stat_by_year: StatisticsByYear,
+            stat_by_cities: StatisticsByCities) -> list:
+        """Генерация одного отчёта
+
+        :param report: Генератор отчёта
+        :param name_find_vac: Имя запрашиваемой вакансии
+        :param stat_by_year: Статистика по годам
+        :param stat_by_cities: Статистика по городам
+        :return: Список сгенерированных файлов отчёта
+        """
+        return self.run_all([(report, name_find_vac, stat_by_year, stat_by_cities)])[0]
+
+    def run_all(self, jobs: list) -> list:
+        """Генерация нескольких отчётов, задачи всех отчётов выполняются одним пулом
+
+        :param jobs: Список кортежей (генератор отчёта, имя вакансии, статистика по годам, статистика по городам)
+        :return: Список сгенерированных файлов для каждого отчёта
+        """
+        tasks, hashes = [], []
+        for index, (report, name_find_vac, stat_by_year, stat_by_cities) in enumerate(jobs):
+            new_hashes = self.get_hashes(name_find_vac, stat_by_year, stat_by_cities, report.pdf_backend,
+                                         report.details)
+            old_hashes = self.__load_hashes(report)
+            hashes.append(new_hashes)
+            for chain in artifact_chains:
+                artifacts = tuple(artifact for artifact in chain
+                                  if old_hashes.get(artifact) != new_hashes[artifact] or
+                                  not os.path.exists(os.path.join(report.output_path, artifact_files[artifact])))
+                if artifacts:
+                    tasks.append((index, report, artifacts, name_find_vac, stat_by_year, stat_by_cities))
+        results = self.executor.map(generate_artifacts, *zip(*[task[1:] for task in tasks])) if tasks else []
+        generated = [[] for _ in jobs]
+        for task, artifacts in zip(tasks, results):
+            generated[task[0]].extend(artifacts)
+        for (report, *_), new_hashes, artifacts in zip(jobs, hashes, generated):
+            if artifacts:
+                self.__save_hashes(report, new_hashes)
+        return generated
+
+    @staticmethod
+    def get_hashes(name_find_vac: str, stat_by_year: StatisticsByYear, stat_by_cities: StatisticsByCities,
+                   pdf_backend='', details=None) -> dict:
+        """Хэши входных данных каждого файла отчёта: статистика, для .xlsx ещё лист вакансий,
+        а для .pdf шаблон и способ генерации
+
+        :param name_find_vac: Имя запрашиваемой вакансии
+        :param stat_by_year: Статистика по годам
+        :param stat_by_cities: Статистика по городам
+        :param pdf_backend: Способ генерации .pdf
+        :param details: Потоковый датасет листа вакансий .xlsx, None - лист не выгружается
+        :return: Словарь файл отчёта - хэш
+        """
+        statistics = json.dumps([name_find_vac, list(vars(stat_by_year).items()), list(vars(stat_by_cities).items())],
+                                ensure_ascii=False, default=str).encode('utf-8')
+        with open(template_file_name, 'rb') as read_file:
+            template = read_file.read()
+        statistics_hash = hashlib.sha1(statistics).hexdigest()
+        return {'excel': hashlib.sha1(statistics + b'|' + ReportPipeline.__get_details_key(details)).hexdigest(),
+                'image': statistics_hash,
+                'pdf': hashlib.sha1(statistics + b'|' + template + b'|' + pdf_backend.encode()).hexdigest()}
+
+    @staticmethod
+    def __get_details_key(details) -> bytes:
+        """Отпечаток источника листа вакансий: файл, его размер и время изменения, годы и диапазон байт
+
+        :param details: Потоковый датасет или None
+        :return: Отпечаток, пустой, если лист не выгружается
+        """
+        if details is None:
+            return b''
+        stat = os.stat(details.file_name)
+        return json.dumps([os.path.abspath(details.file_name), stat.st_size, stat.st_mtime_ns, details.start,
+                           details.end, details.byte_range]).encode('utf-8')
+
+    @staticmethod
+    def __load_hashes(report: Report) -> dict:
+        """Хэши прошлой генерации отчёта
+
+        :param report: Генератор отчёта
+        :return: Словарь файл отчёта - хэш
+        """
+        file_name = os.path.join(report.output_path, hash_file_name)
+        if not os.path.exists(file_name):
+            return {}
+        with open(file_name, encoding='utf-8') as read_file:
+            return json.load(read_file)
+
+    @staticmethod
+    def __save_hashes(report: Report, hashes: dict):
+        """Сохранение хэшей сгенерированного отчёта
+
+        :param report: Генератор отчёта
+        :param hashes: Словарь файл отчёта - хэш
+        :return:
+        """
+        with open(os.path.join(report.output_path, hash_file_name), 'w', encoding='utf-8') as write_file:
+            json.dump(hashes, write_file)
@@ -1,3 +1,5 @@
+import sys
+
 currency_to_rub = {
     "AZN": 35.68,
     "BYR": 23.91,
@@ -18,14 +20,17 @@ class Salary:
         salary_from (int): Оклад 'от'
         salary_to (int): Оклад 'до'
         salary_currency (str): Валюта
+        salary_rub (float): Средняя ЗП в рублях, считается один раз при создании
     """
+    __slots__ = ('salary_from', 'salary_to', 'salary_currency', 'salary_avg', 'salary_rub')
 
-    def __init__(self, salary_from='', salary_to='', salary_currency='', salary_avg=''):
+    def __init__(self, salary_from='', salary_to='', salary_currency='', salary_avg='', currency_rate=None):
         """Инициализация класса зарплаты
 
         :param salary_from(int, float, str): Оклад 'от'
         :param salary_to(int, float, str): Оклад 'до'
         :param salary_currency: Валюта
+        :param currency_rate: Курс валюты к рублю на дату публикации, None - курс из currency_to_rub
         >>> type(Salary(10, 20, 'RUR')).__name__
         'Salary'
         >>> Salary(10.0, 20.0, 'RUR').salary_from
@@ -40,13 +45,17 @@ class Salary:
             self.salary_to = int(float(salary_to))
             if salary_currency not in currency_to_rub.keys():
                 raise ValueError('Неверно введна валюта')
-            self.salary_currency = salary_currency
+            self.salary_currency = sys.intern(salary_currency)
             self.salary_avg = ''
+            if currency_rate is None:
+                currency_rate = currency_to_rub[self.salary_currency]
+            self.salary_rub = currency_rate * (float(self.salary_to) + float(self.salary_from)) / 2
         else:
             self.salary_avg = int(float(salary_avg))
+            self.salary_rub = self.salary_avg
 
     def get_salary_to_rub(self) -> float:
-        """Функция подсчета средней ЗП в рублях с помощью словаря currency_to_rub
+        """Функция получения средней ЗП в рублях, посчитанной при создании по курсу валюты
         :return: Вывод средней ЗП в рублях
         >>> Salary(20.0, 30.0, 'RUR').get_salary_to_rub()
         25.0
@@ -59,7 +68,4 @@ class Salary:
         >>> Salary(20, 30.0, 'RUR').get_salary_to_rub()
         25.0
         """
-        if self.salary_avg == '':
-            return currency_to_rub[self.salary_currency] * (float(self.salary_to) + float(self.salary_from)) / 2
-        else:
-            return self.salary_avg
+        return self.salary_rub
@@ -1,8 +1,7 @@
 import math
-from collections import Counter
 from itertools import islice
 
-from DataSet import DataSet
+from VacancyAggregator import VacancyAggregator
 
 
 class StatisticsByCities:
@@ -12,55 +11,63 @@ class StatisticsByCities:
         dict_dynamics_count_vac_all_cities (dict): Словарь количества вакансий по всем городам
         dict_dynamics_count_vac_big_cities (dict): Словарь количества вакансий по 'большим' городам
         dict_dynamics_slr_cities (dict): Словарь уровня зарплат по 'большим' городам
+        dict_dynamics_quantiles_slr_cities (dict): Словарь p10, медианы и p90 зарплат по 'большим' городам в порядке
+            dict_dynamics_slr_cities, пустой, если агрегатор собирался без эскизов квантилей
     """
 
-    def __init__(self, file_name: str, name: str):
+    def __init__(self, file_name=None, name=None, aggregator=None, is_quantiles=False):
         """Инициадизация класса StatisticsByCities
 
+        Если передан агрегатор, статистика берётся из него без повторного чтения файла
+
         :param file_name: имя файла
         :param name: название профессии
+        :param aggregator: заполненный VacancyAggregator
+        :param is_quantiles: собирать ли эскизы квантилей зарплат при чтении файла
         """
-        dataset = DataSet(file_name, name, 2007, 2014)
-        self.dict_dynamics_count_vac_all_cities = self.__dynamics_count_vac_cities(dataset.vacancies_objects)
+        if aggregator is None:
+            aggregator = VacancyAggregator.from_file(file_name, name, is_quantiles=is_quantiles)
+        self.dict_dynamics_count_vac_all_cities = self.__dynamics_count_vac_cities(aggregator.dict_count_vac_cities)
         self.dict_dynamics_count_vac_big_cities = dict(filter(lambda x: x[0] != 'Другие',
                                                               list(self.dict_dynamics_count_vac_all_cities.items())))
-        self.dict_dynamics_slr_cities = self.__dynamics_slr_big_cities(data_vacancies=dataset.vacancies_objects,
-                                                                       big_cities=list(
-                                                                           self.dict_dynamics_count_vac_big_cities))
+        self.dict_dynamics_slr_cities = self.__dynamics_slr_big_cities(
+            dict_count_vac_cities=aggregator.dict_count_vac_cities,
+            dict_sum_slr_cities=aggregator.dict_sum_slr_cities,
+            big_cities=list(self.dict_dynamics_count_vac_big_cities))
+        self.dict_dynamics_quantiles_slr_cities = aggregator.get_quantiles(
+            {key: aggregator.dict_sketch_slr_cities[key] for key in self.dict_dynamics_slr_cities
+             if key in aggregator.dict_sketch_slr_cities})
 
-    def __dynamics_count_vac_cities(self, data_vacancies: list) -> dict:
+    @staticmethod
+    def __dynamics_count_vac_cities(dict_count_vac_cities: dict) -> dict:
         """Составление словаря количества вакансий по городам
 
-        :param data_vacancies: Список вакансий
+        :param dict_count_vac_cities: Словарь количества вакансий по всем городам
         :return: Словарь количества вакансий по городам
         """
-        dict_dynamic_count_vac_cities = dict(Counter(map(lambda x: x.area_name, data_vacancies)))
+        count_vac = sum(dict_count_vac_cities.values())
         dict_dynamic_count_vac_big_cities = {}
         count_vac_small_cities = 0
-        for key, val in dict_dynamic_count_vac_cities.items():
-            if math.floor(val * 100 / len(data_vacancies)) >= 1:
-                dict_dynamic_count_vac_big_cities[key] = round(val / len(data_vacancies), 4)
+        for key, val in dict_count_vac_cities.items():
+            if math.floor(val * 100 / count_vac) >= 1:
+                dict_dynamic_count_vac_big_cities[key] = round(val / count_vac, 4)
             else:
-                count_vac_small_cities += round(val / len(data_vacancies), 4)
+                count_vac_small_cities += round(val / count_vac, 4)
         dict_dynamic_count_vac_big_cities['Другие'] = count_vac_small_cities
         return dict(sorted(dict_dynamic_count_vac_big_cities.items(), key=lambda x: x[1], reverse=True))
 
     @staticmethod
-    def __dynamics_slr_big_cities(data_vacancies: list, big_cities: list) -> dict:
+    def __dynamics_slr_big_cities(dict_count_vac_cities: dict, dict_sum_slr_cities: dict, big_cities: list) -> dict:
         """Составление словаря уровня зарплат по 'большим' городам
 
-        :param data_vacancies: Список вакансий
+        :param dict_count_vac_cities: Словарь количества вакансий по всем городам
+        :param dict_sum_slr_cities: Словарь сумм зарплат по всем городам
         :param big_cities: Список 'больших' городов
         :return: Словарь уровня зарплат по 'большим' городам
         """
-        dict_dynamic_slr_cities = {}
-        for vac in data_vacancies:
-            if vac.area_name not in dict_dynamic_slr_cities.keys() and vac.area_name in big_cities:
-                dict_dynamic_slr_cities[vac.area_name] = [vac.salary.get_salary_to_rub()]
-            elif vac.area_name in big_cities:
-                dict_dynamic_slr_cities[vac.area_name].append(vac.salary.get_salary_to_rub())
-        for key, value in dict_dynamic_slr_cities.items():
-            dict_dynamic_slr_cities[key] = math.floor(sum(value) / len(value))
+        dict_dynamic_slr_cities = {key: value for key, value in
+                                   VacancyAggregator.get_mean(dict_sum_slr_cities, dict_count_vac_cities).items()
+                                   if key in big_cities}
         return dict(sorted(dict_dynamic_slr_cities.items(), key=lambda x: x[1], reverse=True))
 
     def print_statistics(self):
@@ -71,4 +78,7 @@ class StatisticsByCities:
         print('Уровень зарплат по городам (в порядке убывания): ' +
               str(dict(islice(self.dict_dynamics_slr_cities.items(), 10))))
         print('Доля вакансий по городам (в порядке убывания): ' +
-              str(dict(islice(self.dict_dynamics_count_vac_big_cities.items(), 10))))
\ No newline at end of file
+              str(dict(islice(self.dict_dynamics_count_vac_big_cities.items(), 10))))
+        if self.dict_dynamics_quantiles_slr_cities:
+            print('Квантили зарплат по городам: ' + str(dict(islice(self.dict_dynamics_quantiles_slr_cities.items(),
+                                                                    10))))
\ No newline at end of file
@@ -1,103 +1,142 @@
-import math
-from collections import Counter
-from concurrent.futures import ProcessPoolExecutor
-from DataSet import DataSet
+import json
+import os
+from contextlib import nullcontext
+from functools import partial
+
+from CsvChunks import get_byte_ranges
+from TaskExecutor import TaskExecutor
+from VacancyAggregator import VacancyAggregator, period_titles
 
 
 class StatisticsByYear:
-    """Класс статистики по годам на основании csv чанков
+    """Класс статистики по годам на основании csv чанков, вместо годов можно считать кварталы, месяцы или недели
 
     Attributes:
         name (str): Словарь количества вакансий по всем городам
+        period (str): Период статистики: 'year', 'quarter', 'month' или 'week'
         dict_dynamics_slr (dict): Словарь динамики уровня зарплат по годам для всех вакансий
         dict_dynamics_count_vac (dict): Словарь динамики количества вакансий по годам для всех вакансий
         dict_dynamics_slr_name (dict): Словарь динамики уровня зарплат по годам для искомых вакансий
         dict_dynamics_count_vac_name (dict): Словарь динамики количества вакансий по годам для искомых вакансий
+        dict_dynamics_quantiles_slr (dict): Словарь p10, медианы и p90 зарплат по годам для всех вакансий,
+            пустой, если агрегатор собирался без эскизов квантилей
+        dict_dynamics_quantiles_slr_name (dict): Словарь p10, медианы и p90 зарплат по годам для искомых вакансий
     """
-    def __init__(self, name: str, splitted_file_names: list):
+    def __init__(self, name: str, splitted_file_names=None, aggregator=None, executor=None, period='year',
+                 is_quantiles=False):
         """инициализация класса StatisticsByYear
 
+        Если передан агрегатор, статистика берётся из него без повторного чтения файлов, период - из агрегатора
+
         :param name: название профессии
-        :param splitted_file_names: список чанков csv
+        :param splitted_file_names: список чанков csv, в разных чанках могут быть одни и те же годы
+        :param aggregator: заполненный VacancyAggregator
+        :param executor: TaskExecutor для обработки чанков, по умолчанию пул процессов по количеству процессоров,
+            переданный исполнитель не завершается и может использоваться повторно
+        :param period: период статистики при подсчёте по чанкам
+        :param is_quantiles: собирать ли при подсчёте по чанкам эскизы квантилей зарплат, каждый процесс строит
+            эскизы своих чанков, эскизы складываются здесь
         """
         self.name = name
-        list_dict_dynamics_slr = []
-        list_dict_dynamics_count_vac = []
-        list_dict_dynamics_slr_name = []
-        list_dict_dynamics_count_vac_name = []
-
-        pool = ProcessPoolExecutor(max_workers=6)
-        for el in pool.map(self.stat, splitted_file_names):
-            list_dict_dynamics_slr.append(el[0])
-            list_dict_dynamics_count_vac.append(el[1])
-            list_dict_dynamics_slr_name.append(el[2])
-            list_dict_dynamics_count_vac_name.append(el[3])
-
-        self.dict_dynamics_slr = self.__get_dict_from_list(list(filter(None, list_dict_dynamics_slr)))
-        self.dict_dynamics_count_vac = self.__get_dict_from_list(list(filter(None, list_dict_dynamics_count_vac)))
-        self.dict_dynamics_slr_name = self.__get_dict_from_list(list(filter(None, list_dict_dynamics_slr_name)))
-        self.dict_dynamics_count_vac_name = self.__get_dict_from_list(list(filter(None, list_dict_dynamics_count_vac_name)))
-
-    @staticmethod
-    def __get_dict_from_list(list_dicts: list) -> dict:
-        """преобразование списка словарей в словарь
-
-        :param list_dicts:
-        :return: словарь
+        if aggregator is None and splitted_file_names is None:
+            raise ValueError('Нужен список чанков csv или заполненный агрегатор')
+        if aggregator is None:
+            aggregator = VacancyAggregator(name, period, is_quantiles)
+            with self.__get_executor(executor) as task_executor:
+                for partial_aggregator in task_executor.map(
+                        partial(VacancyAggregator.from_file, period=period, is_quantiles=is_quantiles),
+                        splitted_file_names,
+                        [name] * len(splitted_file_names),
+                        total_bytes=sum(map(os.path.getsize, splitted_file_names))):
+                    aggregator.merge(partial_aggregator)
+        self.period = aggregator.period
+        self.__fill(aggregator)
+
+    def __fill(self, aggregator: VacancyAggregator):
+        """Подсчёт средних и квантилей по периодам из накопленных сумм, количеств и эскизов,
+        периоды упорядочены по возрастанию
+
+        :param aggregator: заполненный VacancyAggregator
+        :return:
         """
-        result = {}
-        for x in list_dicts:
-            result.update(x)
-        return result
-
-    def stat(self, file_name):
-        """вывод статистики по годам
+        self.dict_dynamics_slr = dict(sorted(aggregator.get_mean(aggregator.dict_sum_slr,
+                                                                 aggregator.dict_count_vac).items()))
+        self.dict_dynamics_count_vac = dict(sorted(aggregator.dict_count_vac.items()))
+        self.dict_dynamics_slr_name = dict(sorted(aggregator.get_mean(aggregator.dict_sum_slr_name,
+                                                                      aggregator.dict_count_vac_name).items()))
+        self.dict_dynamics_count_vac_name = dict(sorted(aggregator.dict_count_vac_name.items()))
+        self.dict_dynamics_quantiles_slr = dict(sorted(aggregator.get_quantiles(aggregator.dict_sketch_slr).items()))
+        self.dict_dynamics_quantiles_slr_name = dict(sorted(aggregator.get_quantiles(
+            aggregator.dict_sketch_slr_name).items()))
+
+    @classmethod
+    def from_csv(cls, name: str, file_name: str, count_chunks=None, executor=None, period='year',
+                 is_quantiles=False):
+        """Параллельный подсчёт статистики по одному .csv без предварительного разбиения по годам
+
+        Файл делится на диапазоны байт по границам записей, каждый процесс возвращает частичные суммы, количества
+        и эскизы квантилей, которые затем складываются
 
+        :param name: название профессии
         :param file_name: имя файла
-        :return: кортеж словарей со статистикой
+        :param count_chunks: количество диапазонов, по умолчанию количество работников исполнителя
+        :param executor: TaskExecutor, по умолчанию пул процессов по количеству процессоров
+        :param period: период статистики
+        :param is_quantiles: собирать ли эскизы квантилей зарплат
+        :return: статистика по годам
         """
-        dataset = DataSet(file_name, self.name, 2007, 2014)
-        return self.__dynamics_salary(dataset.vacancies_objects), \
-               self.__dynamics_count_vac(dataset.vacancies_objects), \
-               self.__dynamics_salary(dataset.vacancies_objects_name), \
-               self.__dynamics_count_vac(dataset.vacancies_objects_name)
-
-    def __dynamics_salary(self, data_vacancies: list) -> dict:
-        """Составление словаря динамики уровня зарплат по годам для всех вакансий
+        aggregator = VacancyAggregator(name, period, is_quantiles)
+        with cls.__get_executor(executor) as task_executor:
+            byte_ranges = get_byte_ranges(file_name, count_chunks or task_executor.max_workers)
+            for partial_aggregator in task_executor.map(partial(VacancyAggregator.from_file, period=period,
+                                                                is_quantiles=is_quantiles),
+                                                        [file_name] * len(byte_ranges),
+                                                        [name] * len(byte_ranges),
+                                                        [2007] * len(byte_ranges),
+                                                        [2014] * len(byte_ranges),
+                                                        byte_ranges,
+                                                        total_bytes=os.path.getsize(file_name)):
+                aggregator.merge(partial_aggregator)
+        return cls(name, aggregator=aggregator)
+
+    @classmethod
+    def from_manifest(cls, name: str, manifest_file_name: str, executor=None, period='year', is_quantiles=False):
+        """Подсчёт статистики по чанкам из manifest.json InputConnect.split, большие чанки запускаются первыми
 
-        :param data_vacancies: Список вакансий
-        :return: Словарь динамики уровня зарплат по годам для всех вакансий
+        :param name: название профессии
+        :param manifest_file_name: имя файла manifest.json
+        :param executor: TaskExecutor, по умолчанию пул процессов по количеству процессоров
+        :param period: период статистики
+        :param is_quantiles: собирать ли эскизы квантилей зарплат
+        :return: статистика по годам
         """
-        # if len(data_vacancies) == 0:
-        #    return {x: 0 for x in self.__list_years}
-        dict_dynamic_slr = {}
-        for vac in data_vacancies:
-            if vac.published_at_year not in dict_dynamic_slr.keys():
-                dict_dynamic_slr[vac.published_at_year] = [vac.salary.get_salary_to_rub()]
-            else:
-                dict_dynamic_slr[vac.published_at_year].append(vac.salary.get_salary_to_rub())
-        for key, value in dict_dynamic_slr.items():
-            dict_dynamic_slr[key] = math.floor(sum(value) / len(value))
-        return dict_dynamic_slr
-
-    def __dynamics_count_vac(self, data_vacancies: list) -> dict:
-        """Составление словаря динамики количества вакансий по годам для всех вакансий
-
-        :param data_vacancies: Список вакансий
-        :return: Словарь динамики количества вакансий по годам для всех вакансий
+        with open(manifest_file_name, encoding='utf-8') as manifest_file:
+            partitions = json.load(manifest_file)['partitions'].values()
+        splitted_file_names = [partition['file_name'] for partition in
+                               sorted(partitions, key=lambda partition: partition['bytes'], reverse=True)]
+        return cls(name, splitted_file_names, executor=executor, period=period, is_quantiles=is_quantiles)
+
+    @staticmethod
+    def __get_executor(executor):
+        """исполнитель для блока with: созданный здесь пул завершается по выходу из блока, переданный - нет
+
+        :param executor: TaskExecutor или None
+        :return: контекстный менеджер исполнителя
         """
-        # if len(data_vacancies) == 0:
-        #    return {x: 0 for x in self.__list_years}
-        dict_dynamic_count_vac = dict(Counter(map(lambda x: x.published_at_year, data_vacancies)))
-        return dict_dynamic_count_vac
+        return TaskExecutor() if executor is None else nullcontext(executor)
 
     def print_statistics(self):
-        """Метод печати статистики в консоль
+        """Метод печати статистики в консоль, в подписях - период статистики
 
         :return:
         """
-        print('Динамика уровня зарплат по годам: ' + str(self.dict_dynamics_slr))
-        print('Динамика количества вакансий по годам: ' + str(self.dict_dynamics_count_vac))
-        print('Динамика уровня зарплат по годам для выбранной профессии: ' + str(self.dict_dynamics_slr_name))
-        print(
-            'Динамика количества вакансий по годам для выбранной профессии: ' + str(self.dict_dynamics_count_vac_name))
\ No newline at end of file
+        by_period = 'по ' + period_titles[self.period][1]
+        print(f'Динамика уровня зарплат {by_period}: ' + str(self.dict_dynamics_slr))
+        print(f'Динамика количества вакансий {by_period}: ' + str(self.dict_dynamics_count_vac))
+        print(f'Динамика уровня зарплат {by_period} для выбранной профессии: ' + str(self.dict_dynamics_slr_name))
+        print(f'Динамика количества вакансий {by_period} для выбранной профессии: ' +
+              str(self.dict_dynamics_count_vac_name))
+        if self.dict_dynamics_quantiles_slr:
+            print(f'Квантили зарплат {by_period}: ' + str(self.dict_dynamics_quantiles_slr))
+            print(f'Квантили зарплат {by_period} для выбранной профессии: ' +
+                  str(self.dict_dynamics_quantiles_slr_name))
\ No newline at end of file
@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+backends = ('serial', 'thread', 'process', 'multiprocessing')
+
+
+class TaskExecutor:
+    """Класс исполнителя задач с выбором бэкенда и управлением жизненным циклом пула
+
+    Attributes:
+        backend (str): Бэкенд: 'serial', 'thread', 'process' или 'multiprocessing'
+        max_workers (int): Количество потоков или процессов
+        chunksize (int): Количество задач, передаваемых процессу за раз
+        min_parallel_bytes (int): Объём входных данных, меньше которого задачи выполняются в текущем процессе
+    """
+
+    def __init__(self, backend='process', max_workers=None, chunksize=1, min_parallel_bytes=1 << 24):
+        """Инициализация исполнителя, пул создаётся при первом параллельном запуске
+
+        :param backend: Бэкенд: 'serial', 'thread', 'process' или 'multiprocessing'
+        :param max_workers: Количество потоков или процессов, по умолчанию количество процессоров
+        :param chunksize: Количество задач, передаваемых процессу за раз
+        :param min_parallel_bytes: Объём входных данных, меньше которого задачи выполняются в текущем процессе
+        >>> TaskExecutor('serial').map(abs, [-1, 2, -3])
+        [1, 2, 3]
+        >>> TaskExecutor('gpu')
+        Traceback (most recent call last):
+        ...
+        ValueError: Неизвестный бэкенд: gpu
+        """
+        if backend not in backends:
+            raise ValueError(f'Неизвестный бэкенд: {backend}')
+        self.backend = backend
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.min_parallel_bytes = min_parallel_bytes
+        self.__pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def map(self, func, *iterables, total_bytes=None) -> list:
+        """Применение функции к аргументам, результаты возвращаются в порядке аргументов
+
+        Если задача одна, работник один или входных данных меньше min_parallel_bytes, задачи выполняются
+        в текущем процессе: запуск процессов стоит дороже, чем экономит
+
+        :param func: Функция, для процессов - объявленная на уровне модуля или класса
+        :param iterables: Итерируемые объекты аргументов
+        :param total_bytes: Объём входных данных в байтах, если известен
+        :return: Список результатов
+        """
+        tasks = list(zip(*iterables))
+        if self.backend == 'serial' or len(tasks) < 2 or self.max_workers < 2 or \
+                (total_bytes is not None and total_bytes < self.min_parallel_bytes):
+            return [func(*task) for task in tasks]
+        pool = self.__get_pool()
+        if self.backend == 'multiprocessing':
+            return pool.starmap(func, tasks, chunksize=self.chunksize)
+        if self.backend == 'process':
+            return list(pool.map(func, *zip(*tasks), chunksize=self.chunksize))
+        return list(pool.map(func, *zip(*tasks)))
+
+    def __get_pool(self):
+        """Создание пула при первом обращении
+
+        :return: Пул потоков или процессов
+        """
+        if self.__pool is None:
+            if self.backend == 'thread':
+                self.__pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            elif self.backend == 'process':
+                self.__pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self.__pool = multiprocessing.Pool(processes=self.max_workers)
+        return self.__pool
+
+    def shutdown(self):
+        """Остановка пула и освобождение потоков или процессов
+
+        :return:
+        """
+        if self.__pool is None:
+            return
+        if self.backend == 'multiprocessing':
+            self.__pool.close()
+            self.__pool.join()
+        else:
+            self.__pool.shutdown()
+        self.__pool = None
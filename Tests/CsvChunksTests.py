@@ -0,0 +1,45 @@
+import os
+
+from CsvChunks import get_byte_ranges, get_records_end
+from DataSet import DataSet
+from Tests.CsvFixtures import CsvTestCase
+
+chunk_rows = [['Системный\nаналитик', '15000', '25000', 'RUR', 'Курган', '2014-12-31T23:59:59+0300'],
+              ['"Аналитик", ""BI""', '10000', '20000', 'RUR', 'Москва', '2009-01-01T10:00:00+0300'],
+              ['Программист', '30000', '50000', 'RUR', 'Москва', '2007-05-01T10:00:00+0300'],
+              ['Описание\r\nв две строки', '1000', '2000', 'USD', 'Казань', '2008-02-11T10:00:00+0300']] * 5
+
+
+class CsvChunksTests(CsvTestCase):
+    csv_rows = chunk_rows
+
+    def test_ranges_cover_file_after_titles(self):
+        byte_ranges = get_byte_ranges(self.file_name, 4)
+        self.assertEqual(byte_ranges[-1][1], os.path.getsize(self.file_name))
+        for (_, end), (start, _) in zip(byte_ranges, byte_ranges[1:]):
+            self.assertEqual(end, start)
+
+    def test_ranges_same_rows_as_file(self):
+        expected = list(DataSet(self.file_name, '', 2003, 2022, is_stream=True).iter_rows())
+        for count_chunks in range(1, 40):
+            self.assertEqual([row for byte_range in get_byte_ranges(self.file_name, count_chunks)
+                              for row in DataSet(self.file_name, '', 2003, 2022, is_stream=True,
+                                                 byte_range=byte_range).iter_rows()],
+                             expected)
+
+    def test_carriage_return_terminator(self):
+        file_name = self.write_csv([row for row in chunk_rows if '\n' not in row[0] or '\r' in row[0]], '\r')
+        expected = list(DataSet(file_name, '', 2003, 2022, is_stream=True).iter_rows())
+        byte_ranges = get_byte_ranges(file_name, 4)
+        self.assertEqual(len(byte_ranges), 4)
+        for backend in ['csv', 'mmap']:
+            self.assertEqual([row for byte_range in byte_ranges
+                              for row in DataSet(file_name, '', 2003, 2022, is_stream=True, backend=backend,
+                                                 byte_range=byte_range).iter_rows()],
+                             expected)
+        self.assertEqual(get_records_end(file_name, byte_ranges[0][0]), os.path.getsize(file_name))
+
+    def test_empty_file(self):
+        with open(self.file_name, 'w'):
+            pass
+        self.assertEqual(get_byte_ranges(self.file_name, 4), [])
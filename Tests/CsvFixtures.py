@@ -0,0 +1,48 @@
+import csv
+import os
+import tempfile
+from unittest import TestCase
+
+titles = ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
+report_rows = [['Аналитик', '10000', '20000', 'RUR', 'Москва', '2007-01-01T10:00:00+0300'],
+               ['Программист', '30000', '30000', 'RUR', 'Казань', '2007-02-01T10:00:00+0300'],
+               ['Аналитик', '40000', '40000', 'RUR', 'Москва', '2008-12-01T10:00:00+0300'],
+               ['Программист', '50000', '50000', 'EUR', 'Курган', '2008-01-01T10:00:00+0300']]
+
+
+def write_csv(rows_csv: list, lineterminator='\r\n') -> str:
+    """Запись временного .csv файла с вакансиями
+
+    :param rows_csv: Строки вакансий
+    :param lineterminator: Конец строки, '\\r' - как у чанков InputConnect.split
+    :return: Имя файла
+    """
+    file = tempfile.NamedTemporaryFile('w', suffix='.csv', encoding='utf-8-sig', newline='', delete=False)
+    with file:
+        writer = csv.writer(file, lineterminator=lineterminator)
+        writer.writerow(titles)
+        writer.writerows(rows_csv)
+    return file.name
+
+
+class CsvTestCase(TestCase):
+    """Тест с временным .csv из строк csv_rows в self.file_name, файлы удаляются после теста
+
+    Attributes:
+        csv_rows (list): Строки вакансий файла теста
+    """
+    csv_rows = []
+
+    def setUp(self):
+        self.file_name = self.write_csv(self.csv_rows)
+
+    def write_csv(self, rows_csv: list, lineterminator='\r\n') -> str:
+        """Временный .csv, который удаляется после теста
+
+        :param rows_csv: Строки вакансий
+        :param lineterminator: Конец строки
+        :return: Имя файла
+        """
+        file_name = write_csv(rows_csv, lineterminator)
+        self.addCleanup(os.remove, file_name)
+        return file_name
@@ -0,0 +1,77 @@
+import os
+import tempfile
+
+import numpy as np
+
+from CurrencyRates import CurrencyRates, currency_codes, get_currency_rates, rates_env_name
+from Tests.CsvFixtures import CsvTestCase
+from Vacancy import get_salary
+from VacancyAggregator import VacancyAggregator
+from VacancyFrame import VacancyFrame
+
+rates_csv = 'date,USD,EUR,KZT,XXX\n2007-03,26.1,,0.21,1\n2008-02-01,24.5,36.0,,\n2008-04,23.9,36.5,,\n'
+cbr_xml = '''<?xml version="1.0" encoding="windows-1251"?>
+<ValCurs Date="{date}" name="Foreign Currency Market">
+<Valute ID="R01235"><NumCode>840</NumCode><CharCode>USD</CharCode><Nominal>1</Nominal><Name>Доллар США</Name>
+<Value>{usd}</Value></Valute>
+<Valute ID="R01335"><NumCode>398</NumCode><CharCode>KZT</CharCode><Nominal>100</Nominal><Name>Тенге</Name>
+<Value>20,5000</Value></Valute>
+</ValCurs>'''
+dated_rows = [['Аналитик', '10000', '20000', 'RUR', 'Москва', '2008-01-10T10:00:00+0300'],
+              ['Ведущий аналитик', '1000', '2000', 'USD', 'Казань', '2008-02-11T10:00:00+0300'],
+              ['Аналитик', '1000', '1000', 'USD', 'Москва', '2008-04-11T10:00:00+0300'],
+              ['Программист', '500', '1500', 'EUR', 'Москва', '2008-04-12T10:00:00+0300']]
+
+
+class CurrencyRatesTests(CsvTestCase):
+    csv_rows = dated_rows
+
+    def setUp(self):
+        super().setUp()
+        self.path = tempfile.TemporaryDirectory()
+        self.rates_file_name = os.path.join(self.path.name, 'rates.csv')
+        with open(self.rates_file_name, 'w', encoding='utf-8') as write_file:
+            write_file.write(rates_csv)
+
+    def tearDown(self):
+        os.environ.pop(rates_env_name, None)
+        get_currency_rates.cache_clear()
+        get_salary.cache_clear()
+        self.path.cleanup()
+
+    def test_csv_forward_fill(self):
+        rates = CurrencyRates.from_file(self.rates_file_name)
+        self.assertTrue(rates.is_dated)
+        self.assertEqual(rates.rates.shape, (len(currency_codes), 14))
+        self.assertEqual([rates.get_rate('USD', month)
+                          for month in ['2006-01', '2007-03', '2008-01', '2008-03', '2020-01']],
+                         [26.1, 26.1, 26.1, 24.5, 23.9])
+        self.assertEqual(rates.get_rate('EUR', '2007-05'), 36.0)
+        self.assertEqual(rates.get_rate('KZT', '2008-04'), 0.21)
+        self.assertEqual(rates.get_rate('UAH', '2008-04'), 1.64)
+        self.assertEqual(rates.get_rate('RUR', '2008-04'), 1)
+        self.assertEqual(rates.get_rate('USD'), 60.66)
+
+    def test_cbr_xml(self):
+        for date, usd in [('01.02.2008', '24,4842'), ('15.02.2008', '24,8000'), ('01.03.2008', '24,1000')]:
+            with open(os.path.join(self.path.name, f'{date}.xml'), 'w', encoding='windows-1251') as write_file:
+                write_file.write(cbr_xml.format(date=date, usd=usd))
+        rates = CurrencyRates.from_file(self.path.name)
+        self.assertEqual(rates.rates[currency_codes.index('USD')].tolist(), [24.4842, 24.1])
+        self.assertEqual(rates.get_rate('KZT', '2008-03'), 0.205)
+
+    def test_month_ids(self):
+        rates = CurrencyRates.from_file(self.rates_file_name)
+        self.assertEqual(rates.get_month_ids(np.array([2006, 2007, 2008, 2009]), np.array([5, 4, 4, 1])).tolist(),
+                         [0, 1, 13, 13])
+
+    def test_row_and_frame_same_dated_rates(self):
+        static = VacancyAggregator.from_file(self.file_name, 'аналитик')
+        os.environ[rates_env_name] = self.rates_file_name
+        get_currency_rates.cache_clear()
+        get_salary.cache_clear()
+        dated = VacancyAggregator.from_file(self.file_name, 'аналитик')
+        frame = VacancyFrame.from_file(self.file_name).to_aggregator('аналитик')
+        self.assertEqual(vars(dated), vars(frame))
+        self.assertAlmostEqual(dated.dict_sum_slr[2008], static.dict_sum_slr[2008] - 1500 * 60.66 - 1000 * 60.66 -
+                               1000 * 59.9 + 1500 * 24.5 + 1000 * 23.9 + 1000 * 36.5)
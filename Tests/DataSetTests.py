@@ -0,0 +1,97 @@
+import csv
+import os
+import re
+from unittest.mock import patch
+
+from DataSet import DataSet, fixed_format_titles
+from Tests.CsvFixtures import CsvTestCase, titles
+
+rows = [
+    ['Аналитик <b>данных</b>', '10000.0', '20000.0', 'RUR', 'Москва', '2006-05-01T10:00:00+0300'],
+    ['Программист', '30000.0', '50000.0', 'RUR', ' Москва ', '2007-05-01T10:00:00+0300'],
+    ['Ведущий  аналитик', '1000', '2000', 'USD', 'Казань', '2008-02-11T10:00:00+0300'],
+    ['Бухгалтер', '', '20000.0', 'RUR', 'Москва', '2008-03-01T10:00:00+0300'],
+    ['Системный\nаналитик', '15000', '25000', 'RUR', 'Курган', '2014-12-31T23:59:59+0300'],
+    ['Водитель', '15000', '25000', 'RUR', 'Курган', '2015-01-01T00:00:00+0300'],
+]
+
+fixture_file_name = os.path.join(os.path.dirname(__file__), 'test_data_set.csv')
+tricky_values = ['', ' ', '  30000.0 ', '30000.0', '<b>RUR</b>', 'R\tUR', '2007-12-03T17:47:55+0300',
+                 ' 2007-12-03T17:47:55+0300\n', '\xa0Москва', 'Санкт-\u2009Петербург', '<p>Текст</p> <br/>',
+                 'a <b', 'многострочное\r\nописание', '<<>>', '<i>\n</i>', 'Системный  администратор ']
+
+
+def csv_filer_reference(row: list) -> list:
+    """Прежняя очистка строки: html теги и пробелы удаляются во всех столбцах
+
+    :param row: Строка вакансии
+    :return: Очищенная строка
+    """
+    return [' '.join(re.sub(re.compile('<.*?>'), '', value).strip().split()) for value in row]
+
+
+class DataSetTests(CsvTestCase):
+    csv_rows = rows
+
+    def test_stream_is_lazy(self):
+        self.assertEqual(DataSet(self.file_name, 'аналитик', 2007, 2014, is_stream=True).vacancies_objects, [])
+
+    def test_iter_vacancies_filter_by_year(self):
+        dataset = DataSet(self.file_name, 'аналитик', 2007, 2014, is_stream=True)
+        self.assertEqual([vac.name for vac in dataset.iter_vacancies()],
+                         ['Программист', 'Ведущий аналитик', 'Системный аналитик'])
+
+    def test_iter_vacancies_same_as_list(self):
+        dataset = DataSet(self.file_name, 'аналитик', 2003, 2022)
+        self.assertEqual([(vac.name, vac.area_name, vac.salary.get_salary_to_rub()) for vac in
+                          DataSet(self.file_name, 'аналитик', 2003, 2022, is_stream=True).iter_vacancies()],
+                         [(vac.name, vac.area_name, vac.salary.get_salary_to_rub()) for vac in
+                          dataset.vacancies_objects])
+
+    def test_csv_filer_same_as_reference(self):
+        test_tables = [(titles, [[value] * len(titles) for value in tricky_values])]
+        with open(fixture_file_name, encoding='utf-8-sig') as file:
+            reader = csv.reader(file)
+            file_titles = next(reader)
+            test_tables.append((file_titles, [row for row in reader if len(row) == len(file_titles)]))
+        self.assertGreater(len(test_tables[-1][1]), 0)
+        for test_titles, test_rows in test_tables:
+            text_columns = [i for i, title in enumerate(test_titles) if title not in fixed_format_titles]
+            fixed_columns = [i for i, title in enumerate(test_titles) if title in fixed_format_titles]
+            for row in test_rows:
+                expected = csv_filer_reference(row)
+                DataSet._DataSet__csv_filer(re.compile('<.*?>'), row, test_titles, text_columns, fixed_columns)
+                self.assertEqual(row, expected)
+
+    def test_mmap_backend_same_as_csv(self):
+        file_name = self.write_csv(rows + [['"Аналитик", ""BI""', '1,5', '2', 'RUR', 'Москва',
+                                            '2009-01-01T10:00:00+0300']])
+        self.assertEqual(list(DataSet(file_name, '', 2003, 2022, is_stream=True, backend='mmap').iter_rows()),
+                         list(DataSet(file_name, '', 2003, 2022, is_stream=True).iter_rows()))
+
+    def test_mmap_backend_small_blocks(self):
+        file_name = self.write_csv(rows + [['"Аналитик", ""BI""\nданных', '1,5', '2', 'RUR', 'Москва',
+                                            '2009-01-01T10:00:00+0300']] + rows)
+        expected = list(DataSet(file_name, '', 2003, 2022, is_stream=True).iter_rows())
+        for block_size in [1, 7, 64]:
+            with patch('MmapCsvReader.block_size', block_size):
+                self.assertEqual(list(DataSet(file_name, '', 2003, 2022, is_stream=True, backend='mmap').iter_rows()),
+                                 expected)
+
+    def test_pushdown_same_as_filter_after_clean(self):
+        pushdown_rows = [[name, '10000', '20000', currency, 'Москва', published_at]
+                         for name in ['Аналитик', 'Ведущий  аналитик', 'Ана<b>литик</b>', 'Системный\nаналитик',
+                                      '<i>Ведущий</i> аналитик', 'Программист']
+                         for currency in ['RUR', ' USD', '<b>EUR</b>', 'KZT']
+                         for published_at in ['2006-12-31T10:00:00+0300', ' 2007-01-01T10:00:00+0300',
+                                              '<b>2014</b>-05-01T10:00:00+0300', '2015-01-01T10:00:00+0300']]
+        file_name = self.write_csv(pushdown_rows)
+        all_rows = list(DataSet(file_name, '', 0, 9999, is_stream=True).iter_rows())
+        for name_filter in ['аналитик', 'Ведущий аналитик', 'Аналитик']:
+            for backend in ['csv', 'mmap']:
+                dataset = DataSet(file_name, '', 2007, 2014, is_stream=True, backend=backend,
+                                  name_filter=name_filter, currencies={'RUR', 'USD', 'EUR'})
+                self.assertEqual(list(dataset.iter_rows()),
+                                 [row for row in all_rows if name_filter in row['name'] and
+                                  row['salary_currency'] in {'RUR', 'USD', 'EUR'} and
+                                  2007 <= int(row['published_at'][:4]) <= 2014])
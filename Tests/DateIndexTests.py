@@ -0,0 +1,72 @@
+import os
+import tempfile
+
+from DataSet import DataSet
+from DateIndex import DateIndex
+from Tests.CsvFixtures import CsvTestCase
+
+date_rows = [['Аналитик', '10000', '20000', 'RUR', 'Москва', '2006-05-01T10:00:00+0300'],
+             ['Ведущий\nаналитик', '1000', '2000', 'USD', 'Казань', '2007-01-11T10:00:00+0300'],
+             ['Программист', '', '50000', 'RUR', 'Москва', '2007-02-01T10:00:00+0300'],
+             ['Программист', '30000', '50000', 'RUR', 'Москва', ' 2007-02-01T10:00:00+0300'],
+             ['Водитель', '15000', '25000', 'RUR', 'Курган', '<b>2008-03-01T10:00:00+0300</b>'],
+             ['Бухгалтер', '15000', '25000', 'RUR', 'Курган', '2008-03-02T10:00:00+0300'],
+             ['Аналитик', '15000', '25000', 'RUR', 'Курган', '2010-01-01T00:00:00+0300']]
+
+
+class DateIndexTests(CsvTestCase):
+    csv_rows = date_rows
+
+    def setUp(self):
+        super().setUp()
+        self.cache_path = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.cache_path.cleanup()
+
+    def read(self, start: int, end: int, **kwargs) -> list:
+        return list(DataSet(self.file_name, '', start, end, is_stream=True, **kwargs).iter_rows())
+
+    def test_months(self):
+        date_index = DateIndex.build(self.file_name)
+        self.assertTrue(date_index.is_sorted)
+        self.assertEqual(list(date_index.months), ['2006-05', '2007-01', '2007-02', '2008-03', '2010-01'])
+        with open(self.file_name, 'rb') as read_file:
+            data = read_file.read()
+        self.assertTrue(data[date_index.months['2007-01']:].startswith('"Ведущий'.encode()))
+        self.assertTrue(data[date_index.months['2008-03']:].startswith('Водитель'.encode()))
+
+    def test_year_range_same_as_full_read(self):
+        date_index = DateIndex.from_cache(self.file_name, self.cache_path.name)
+        for start, end in [(2007, 2008), (2007, 2007), (2009, 2009), (2003, 2022), (2010, 2014), (2003, 2005)]:
+            for backend in ['csv', 'mmap']:
+                self.assertEqual(self.read(start, end, backend=backend, date_index=date_index), self.read(start, end))
+        self.assertEqual(date_index.get_byte_range('2008', '2008')[1], date_index.months['2010-01'])
+
+    def test_carriage_return_terminator(self):
+        file_name = self.write_csv([row for row in date_rows if '\n' not in row[0]], '\r')
+        date_index = DateIndex.build(file_name)
+        self.assertEqual(list(date_index.months), ['2006-05', '2007-02', '2008-03', '2010-01'])
+        for backend in ['csv', 'mmap']:
+            self.assertEqual(list(DataSet(file_name, '', 2007, 2008, is_stream=True, backend=backend,
+                                          date_index=date_index).iter_rows()),
+                             list(DataSet(file_name, '', 2007, 2008, is_stream=True).iter_rows()))
+
+    def test_unsorted_not_used(self):
+        file_name = self.write_csv(date_rows + [date_rows[0]])
+        date_index = DateIndex.build(file_name)
+        self.assertFalse(date_index.is_sorted)
+        self.assertIsNone(date_index.get_byte_range('2007', '2014'))
+        self.assertEqual(DataSet(file_name, '', 2006, 2006, date_index=date_index).byte_range, None)
+
+    def test_rebuilt_after_change(self):
+        self.assertIsNone(DateIndex.load_cached(self.file_name, self.cache_path.name))
+        date_index = DateIndex.from_cache(self.file_name, self.cache_path.name)
+        self.assertEqual(DateIndex.load_cached(self.file_name, self.cache_path.name).months, date_index.months)
+        self.assertEqual(len(os.listdir(self.cache_path.name)), 1)
+        self.assertEqual(DateIndex.from_cache(self.file_name, self.cache_path.name).months, date_index.months)
+        with open(self.file_name, 'a', encoding='utf-8', newline='') as write_file:
+            write_file.write('Курьер,10000,20000,RUR,Москва,2011-01-01T10:00:00+0300\r\n')
+        self.assertFalse(date_index.is_valid())
+        self.assertIsNone(DateIndex.load_cached(self.file_name, self.cache_path.name))
+        self.assertIn('2011-01', DateIndex.from_cache(self.file_name, self.cache_path.name).months)
@@ -0,0 +1,115 @@
+import csv
+import io
+import os
+import tempfile
+
+from CsvChunks import get_records_end
+from IncrementalStatistics import IncrementalStatistics
+from Tests.CsvFixtures import CsvTestCase, write_csv
+from VacancyFrame import VacancyFrame
+
+rows = [['Аналитик данных', '10000', '20000', 'RUR', 'Москва', '2006-05-01T10:00:00+0300'],
+        ['Программист', '30000', '50000', 'RUR', 'Москва', '2007-05-01T10:00:00+0300'],
+        ['Ведущий аналитик', '1000', '2000', 'USD', 'Казань', '2008-02-11T10:00:00+0300'],
+        ['Аналитик', '20000', '30000', 'RUR', 'Москва', '2008-03-01T10:00:00+0300'],
+        ['Системный\nаналитик', '15000', '25000', 'RUR', 'Курган', '2014-12-31T23:59:59+0300']]
+
+attributes = ['dict_sum_slr', 'dict_count_vac', 'dict_sum_slr_name', 'dict_count_vac_name',
+              'dict_sum_slr_cities', 'dict_count_vac_cities']
+
+
+def append_rows(file_name: str, rows_csv: list):
+    """Дописывание строк вакансий в .csv
+
+    :param file_name: Имя файла
+    :param rows_csv: Строки вакансий
+    :return:
+    """
+    with open(file_name, 'a', encoding='utf-8', newline='') as file:
+        csv.writer(file).writerows(rows_csv)
+
+
+class IncrementalStatisticsTests(CsvTestCase):
+    csv_rows = rows
+
+    def setUp(self):
+        super().setUp()
+        self.state_path = tempfile.TemporaryDirectory()
+        self.state_file_name = os.path.join(self.state_path.name, 'state.json')
+
+    def tearDown(self):
+        self.state_path.cleanup()
+
+    def assert_same_as_full_scan(self, statistics: IncrementalStatistics):
+        names = list(statistics.aggregators)
+        for expected in VacancyFrame.from_file(self.file_name).to_aggregators(names):
+            actual = statistics.get_aggregator(expected.name)
+            for attribute in attributes:
+                self.assertEqual(getattr(actual, attribute), getattr(expected, attribute))
+
+    def test_appended_rows(self):
+        IncrementalStatistics(self.file_name, ['аналитик'], self.state_file_name).update()
+        append_rows(self.file_name, rows[1:3])
+        statistics = IncrementalStatistics(self.file_name, ['аналитик'], self.state_file_name)
+        read_bytes = statistics.update()
+        self.assertEqual(read_bytes, len(self.__get_csv(rows[1:3]).encode('utf-8')))
+        self.assert_same_as_full_scan(statistics)
+
+    def test_nothing_appended(self):
+        IncrementalStatistics(self.file_name, ['аналитик'], self.state_file_name).update()
+        self.assertEqual(IncrementalStatistics(self.file_name, ['аналитик'], self.state_file_name).update(), 0)
+
+    def test_new_profession_counts_history(self):
+        IncrementalStatistics(self.file_name, ['аналитик'], self.state_file_name).update()
+        append_rows(self.file_name, rows[1:3])
+        statistics = IncrementalStatistics(self.file_name, ['аналитик', 'Программист'], self.state_file_name)
+        statistics.update()
+        self.assert_same_as_full_scan(statistics)
+
+    def test_incomplete_record_waits(self):
+        IncrementalStatistics(self.file_name, ['аналитик'], self.state_file_name).update()
+        record = self.__get_csv(rows[4:5])
+        with open(self.file_name, 'a', encoding='utf-8', newline='') as file:
+            file.write(record[:record.index('\n') + 1])
+        statistics = IncrementalStatistics(self.file_name, ['аналитик'], self.state_file_name)
+        self.assertEqual(statistics.update(), 0)
+        with open(self.file_name, 'a', encoding='utf-8', newline='') as file:
+            file.write(record[record.index('\n') + 1:])
+        self.assertGreater(statistics.update(), 0)
+        self.assert_same_as_full_scan(statistics)
+
+    def test_rewritten_file_recounted(self):
+        IncrementalStatistics(self.file_name, ['аналитик'], self.state_file_name).update()
+        os.replace(write_csv(list(reversed(rows)) + rows), self.file_name)
+        statistics = IncrementalStatistics(self.file_name, ['аналитик'], self.state_file_name)
+        statistics.update()
+        self.assert_same_as_full_scan(statistics)
+
+    def test_edited_prefix_recounted(self):
+        os.replace(write_csv(rows * 100), self.file_name)
+        IncrementalStatistics(self.file_name, ['аналитик'], self.state_file_name).update()
+        with open(self.file_name, 'r+b') as file:
+            file.seek(file.read().index(b'10000'))
+            file.write(b'90000')
+        append_rows(self.file_name, rows[1:3])
+        statistics = IncrementalStatistics(self.file_name, ['аналитик'], self.state_file_name)
+        self.assertGreater(statistics.update(), len(self.__get_csv(rows[1:3]).encode('utf-8')))
+        self.assert_same_as_full_scan(statistics)
+
+    def test_carriage_return_terminator(self):
+        os.replace(write_csv(rows[:2], '\r'), self.file_name)
+        statistics = IncrementalStatistics(self.file_name, ['аналитик'], self.state_file_name)
+        self.assertEqual(statistics.update(), len(self.__get_csv(rows[:2]).replace('\r\n', '\r').encode('utf-8')))
+        self.assert_same_as_full_scan(statistics)
+
+    def test_records_end(self):
+        size = os.path.getsize(self.file_name)
+        with open(self.file_name, 'a', encoding='utf-8', newline='') as file:
+            file.write('Программист,"1000\n')
+        self.assertEqual(get_records_end(self.file_name, 0), size)
+
+    @staticmethod
+    def __get_csv(rows_csv: list) -> str:
+        file = io.StringIO(newline='')
+        csv.writer(file).writerows(rows_csv)
+        return file.getvalue()
@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+import os
+import tempfile
+
+from DataSet import DataSet
+from InputConnect import InputConnect
+from Tests.CsvFixtures import CsvTestCase, titles
+
+table_rows = [['Аналитик данных', '10000.0', '20000.0', 'RUR', 'Москва', '2006-05-01T10:00:00+0300'],
+              ['Программист', '30000.0', '50000.0', 'RUR', 'Москва', '2007-05-01T10:00:00+0300'],
+              ['Ведущий аналитик', '1000', '2000', 'USD', 'Казань', '2008-02-11T10:00:00+0300'],
+              ['Системный аналитик', '15000', '25000', 'RUR', 'Курган', '2014-12-31T23:59:59+0300'],
+              ['Водитель', '15000', '25000', 'RUR', 'Курган', '2015-01-01T00:00:00+0300']]
+unsorted_rows = [table_rows[3], table_rows[0], table_rows[4], table_rows[1], table_rows[0], table_rows[2],
+                 table_rows[3], table_rows[4], table_rows[1]]
+
+
+class InputConnectTests(CsvTestCase):
+    csv_rows = table_rows
+
+    def setUp(self):
+        super().setUp()
+        self.input_data = InputConnect(os.path.relpath(self.file_name, 'Resources'), 'аналитик')
+        self.vacancies = list(DataSet(self.file_name, '', 2003, 2022, is_stream=True).iter_vacancies())
+
+    def get_table(self, **kwargs) -> list:
+        file = io.StringIO()
+        self.input_data.stream_table_print(iter(self.vacancies), file=file, **kwargs)
+        return file.getvalue().splitlines()
+
+    def get_names(self, **kwargs) -> list:
+        return [line.split('|')[2].strip() for line in self.get_table(is_full_slr=False, **kwargs)[4::2]]
+
+    def test_fixed_width(self):
+        lines = self.get_table()
+        self.assertEqual(len({len(line) for line in lines}), 1)
+        self.assertEqual(lines[4], '| 1       | Аналитик данных      | 10 000 - 20 000      | Москва               | '
+                                   '01.05.2006           |')
+
+    def test_limit_offset(self):
+        self.assertEqual(self.get_names(limit=2, offset=1), ['Программист', 'Ведущий аналитик'])
+
+    def test_sort_top_k(self):
+        self.assertEqual(self.get_names(limit=2, sort_title='Оклад', reverse=True),
+                         ['Ведущий аналитик', 'Программист'])
+        self.assertEqual(self.get_names(limit=2, sort_title='Оклад', offset=1), ['Системный аналитик', 'Водитель'])
+        self.assertEqual(self.get_names(sort_title='Оклад', offset=3), ['Программист', 'Ведущий аналитик'])
+
+    def test_pages(self):
+        self.assertEqual(self.get_table(page_size=1), self.get_table(page_size=100))
+
+    def test_split_unsorted(self):
+        input_data = InputConnect(os.path.relpath(self.write_csv(unsorted_rows), 'Resources'), 'аналитик')
+        expected = {}
+        for row in unsorted_rows:
+            expected.setdefault(row[5][2:4], [titles]).append(row)
+        with tempfile.TemporaryDirectory() as output_path:
+            file_names = input_data.split(output_path=output_path, max_open_files=2)
+            partitions = {}
+            for file_name in file_names:
+                with open(file_name, encoding='utf-8-sig', newline='') as read_file:
+                    partitions[os.path.basename(file_name)[:-len('.csv')]] = list(csv.reader(read_file))
+            with open(os.path.join(output_path, 'manifest.json'), encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+            sizes = [os.path.getsize(file_name) for file_name in file_names]
+        self.assertEqual(partitions, expected)
+        self.assertEqual(sizes, sorted(sizes, reverse=True))
+        self.assertEqual(manifest['titles'], titles)
+        self.assertEqual(manifest['partitions'],
+                         {key: {'file_name': os.path.join(output_path, f'{key}.csv'), 'rows': len(rows_csv) - 1,
+                                'bytes': size}
+                          for (key, rows_csv), size in zip(partitions.items(), sizes)})
@@ -0,0 +1,42 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from NameIndex import NameIndex
+
+names = ['Аналитик', 'Ведущий аналитик', 'Программист', 'Аналитик данных', 'Python-программист']
+name_id = [0, 2, 1, 3, 4, 0, 2, 1]
+
+
+class NameIndexTests(TestCase):
+    def setUp(self):
+        self.index = NameIndex.from_names(names, name_id)
+
+    def assert_same_as_scan(self, index: NameIndex, name: str):
+        expected = [row for row, index_name in enumerate(name_id) if name in names[index_name]]
+        self.assertEqual(index.get_rows(name).tolist(), expected)
+
+    def test_substring_semantics(self):
+        for name in ['Аналитик', 'аналитик', 'налит', 'программист', 'Программист', 'ст', 'А', '', 'Java', 'к д']:
+            self.assert_same_as_scan(self.index, name)
+
+    def test_name_ids(self):
+        self.assertEqual(self.index.get_name_ids('алитик'), [0, 1, 3])
+
+    def test_empty(self):
+        self.assertEqual(self.index.get_rows('инженер').tolist(), [])
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as path:
+            file_name = os.path.join(path, 'names.npz')
+            self.index.save(file_name)
+            self.assertEqual(os.listdir(path), ['names.npz'])
+            with np.load(file_name) as data:
+                self.assertNotIn('names', data.files)
+            index = NameIndex.load(file_name, names)
+        self.assertEqual(index.names, names)
+        self.assertEqual(index.grams, self.index.grams)
+        for name in ['аналитик', 'программист', 'ст']:
+            self.assert_same_as_scan(index, name)
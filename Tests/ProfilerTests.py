@@ -0,0 +1,54 @@
+import json
+import os
+import tempfile
+
+from DataSet import DataSet
+from Profiler import Profiler, profiler
+from Tests.CsvFixtures import CsvTestCase
+from VacancyFrame import VacancyFrame
+
+profiler_rows = [['Аналитик данных', '10000', '20000', 'RUR', 'Москва', '2006-05-01T10:00:00+0300'],
+                 ['Программист', '30000', '50000', 'RUR', 'Москва', '2007-05-01T10:00:00+0300'],
+                 ['Ведущий аналитик', '1000', '2000', 'USD', 'Казань', '2008-02-11T10:00:00+0300'],
+                 ['Бухгалтер', '', '20000', 'RUR', 'Москва', '2008-03-01T10:00:00+0300'],
+                 ['Курьер', '', '', 'RUR', 'Москва', '2007-01-01T10:00:00+0300'],
+                 ['Системный аналитик', '15000', '25000', 'RUR', 'Курган', '2014-12-31T23:59:59+0300'],
+                 ['Водитель', '15000', '25000', 'RUR', 'Курган', '2015-01-01T00:00:00+0300']]
+
+
+class ProfilerTests(CsvTestCase):
+    csv_rows = profiler_rows
+
+    def tearDown(self):
+        if profiler.enabled:
+            profiler.stop()
+
+    def test_disabled_records_nothing(self):
+        test_profiler = Profiler()
+        with test_profiler.stage('read'):
+            test_profiler.count('rows_seen')
+        self.assertEqual((test_profiler.stages, test_profiler.counters), ({}, {}))
+
+    def test_stages_and_counters(self):
+        profiler.start()
+        list(DataSet(self.file_name, '', 2007, 2014, is_stream=True).iter_vacancies())
+        VacancyFrame.from_file(self.file_name).to_aggregators(['аналитик', 'Программист'])
+        summary = profiler.stop()
+        self.assertEqual(summary['counters'], {'rows_seen': 14, 'rows_dropped': 4, 'rows_filtered': 2})
+        self.assertEqual(summary['stages']['build_objects']['calls'], 3)
+        self.assertEqual(summary['stages']['aggregate_by_name']['calls'], 2)
+        for stage in ['clean', 'read', 'aggregate_by_year', 'aggregate_by_city']:
+            self.assertIn(stage, summary['stages'])
+
+    def test_summary_file(self):
+        with tempfile.TemporaryDirectory() as path:
+            summary_file_name = os.path.join(path, 'profile.json')
+            stats_file_name = os.path.join(path, 'profile.pstats')
+            self.assertEqual(profiler.start_from_env(summary_file_name, True, stats_file_name), summary_file_name)
+            VacancyFrame.from_file(self.file_name)
+            profiler.stop(summary_file_name)
+            with open(summary_file_name, encoding='utf-8') as read_file:
+                summary = json.load(read_file)
+            self.assertGreater(summary['peak_traced_bytes'], 0)
+            self.assertTrue(os.path.exists(stats_file_name))
+        self.assertFalse(profiler.enabled)
@@ -0,0 +1,60 @@
+import pickle
+from unittest import TestCase
+
+import numpy as np
+
+from QuantileSketch import QuantileSketch
+
+max_rank_error = 0.0165
+
+
+class QuantileSketchTests(TestCase):
+    def setUp(self):
+        self.values = np.random.default_rng(7).lognormal(11, 0.8, 100000)
+        self.sorted_values = np.sort(self.values)
+
+    def assertRankError(self, sketch: QuantileSketch):
+        fractions = [0.1, 0.5, 0.9]
+        for fraction, value in zip(fractions, sketch.get_quantiles(fractions)):
+            rank = np.searchsorted(self.sorted_values, value, side='right') / len(self.values)
+            self.assertLess(abs(rank - fraction), max_rank_error)
+
+    def test_exact_while_small(self):
+        sketch = QuantileSketch()
+        for value in [30000, 10000, 20000, 50000, 40000]:
+            sketch.update(value)
+        self.assertEqual(sketch.get_quantiles([0, 0.1, 0.5, 0.9, 1]), [10000, 10000, 30000, 50000, 50000])
+        self.assertEqual(QuantileSketch().get_quantiles([0.5]), [None])
+
+    def test_update_rank_error(self):
+        sketch = QuantileSketch()
+        for value in self.values.tolist():
+            sketch.update(value)
+        self.assertEqual(sketch.count, len(self.values))
+        self.assertLess(sum(map(len, sketch.levels)), 3 * sketch.k)
+        self.assertRankError(sketch)
+
+    def test_update_many_rank_error(self):
+        sketch = QuantileSketch()
+        sketch.update_many(self.values)
+        self.assertLess(sum(map(len, sketch.levels)), 3 * sketch.k)
+        self.assertRankError(sketch)
+
+    def test_merge_rank_error(self):
+        parts = []
+        for index in range(8):
+            part = QuantileSketch()
+            part.update_many(self.values[index::8])
+            parts.append(pickle.loads(pickle.dumps(part)))
+        merged = QuantileSketch()
+        for part in parts:
+            merged.merge(part)
+        self.assertEqual(merged.count, len(self.values))
+        self.assertLess(sum(map(len, merged.levels)), 3 * merged.k)
+        self.assertRankError(merged)
+
+    def test_same_seed_same_sketch(self):
+        first, second = QuantileSketch(), QuantileSketch()
+        first.update_many(self.values)
+        second.update_many(self.values)
+        self.assertEqual(first.levels, second.levels)
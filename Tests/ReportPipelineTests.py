@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+from DataSet import DataSet
+from Report import Report
+from ReportPipeline import ReportPipeline
+from StatisticsByCities import StatisticsByCities
+from StatisticsByYear import StatisticsByYear
+from TaskExecutor import TaskExecutor
+from Tests.CsvFixtures import CsvTestCase, report_rows
+from VacancyFrame import VacancyFrame
+
+
+class ReportPipelineTests(CsvTestCase):
+    csv_rows = report_rows
+
+    def setUp(self):
+        super().setUp()
+        self.output_path = tempfile.TemporaryDirectory()
+        self.aggregators = VacancyFrame.from_file(self.file_name).to_aggregators(['Аналитик', 'Программист'])
+        self.statistics_by_cities = StatisticsByCities(aggregator=self.aggregators[0])
+
+    def tearDown(self):
+        self.output_path.cleanup()
+
+    def get_jobs(self, details=None) -> list:
+        return [(Report.for_profession(aggregator.name, self.output_path.name, details, pdf_backend='matplotlib'),
+                 aggregator.name, StatisticsByYear(aggregator.name, aggregator=aggregator), self.statistics_by_cities)
+                for aggregator in self.aggregators]
+
+    def test_generates_all_artifacts(self):
+        with ReportPipeline(TaskExecutor('thread', max_workers=2)) as report_pipeline:
+            generated = report_pipeline.run_all(self.get_jobs())
+        self.assertEqual([sorted(artifacts) for artifacts in generated], [['excel', 'image', 'pdf']] * 2)
+        for name in ['Аналитик', 'Программист']:
+            self.assertEqual(sorted(os.listdir(os.path.join(self.output_path.name, name))),
+                             ['graph.png', 'report.pdf', 'report.xlsx', 'report_hash.json'])
+
+    def test_unchanged_statistics_skipped(self):
+        with ReportPipeline(TaskExecutor('serial')) as report_pipeline:
+            report_pipeline.run_all(self.get_jobs())
+            self.assertEqual(report_pipeline.run_all(self.get_jobs()), [[], []])
+            os.remove(os.path.join(self.output_path.name, 'Аналитик', 'graph.png'))
+            self.assertEqual(report_pipeline.run_all(self.get_jobs()), [['image'], []])
+            self.aggregators[1].dict_count_vac_name[2007] += 1
+            self.assertEqual([sorted(artifacts) for artifacts in report_pipeline.run_all(self.get_jobs())],
+                             [[], ['excel', 'image', 'pdf']])
+
+    def test_details_change_rebuilds_excel(self):
+        details = DataSet(self.file_name, '', 2007, 2014, is_stream=True)
+        with ReportPipeline(TaskExecutor('serial')) as report_pipeline:
+            report_pipeline.run_all(self.get_jobs())
+            self.assertEqual(report_pipeline.run_all(self.get_jobs(details)), [['excel'], ['excel']])
+            self.assertEqual(report_pipeline.run_all(self.get_jobs(details)), [[], []])
+            with open(self.file_name, 'a', encoding='utf-8', newline='') as write_file:
+                write_file.write('Аналитик,10000,20000,RUR,Москва,2009-01-01T10:00:00+0300\r\n')
+            self.assertEqual(report_pipeline.run_all(self.get_jobs(details)), [['excel'], ['excel']])
+            self.assertEqual(report_pipeline.run_all(self.get_jobs()), [['excel'], ['excel']])
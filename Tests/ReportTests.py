@@ -0,0 +1,132 @@
+import os
+import re
+import tempfile
+from unittest.mock import patch
+
+import matplotlib
+from openpyxl import load_workbook
+
+from DataSet import DataSet
+from Report import Report, details_titles
+from StatisticsByCities import StatisticsByCities
+from StatisticsByYear import StatisticsByYear
+from Tests.CsvFixtures import CsvTestCase, report_rows
+from VacancyFrame import VacancyFrame
+
+
+class ReportTests(CsvTestCase):
+    csv_rows = report_rows
+
+    def setUp(self):
+        super().setUp()
+        self.output_path = tempfile.TemporaryDirectory()
+        aggregator = VacancyFrame.from_file(self.file_name).to_aggregator('Аналитик')
+        self.statistics_by_year = StatisticsByYear('Аналитик', aggregator=aggregator)
+        self.statistics_by_cities = StatisticsByCities(aggregator=aggregator)
+
+    def tearDown(self):
+        self.output_path.cleanup()
+
+    def generate_excel(self, details=None):
+        Report(self.output_path.name, details).generate_excel('Аналитик', self.statistics_by_year,
+                                                              self.statistics_by_cities)
+        return load_workbook(os.path.join(self.output_path.name, 'report.xlsx'))
+
+    def test_excel_sheets(self):
+        wb = self.generate_excel()
+        self.assertEqual(wb.sheetnames, ['Статистика по годам', 'Статистика по городам'])
+        ws = wb['Статистика по годам']
+        self.assertEqual([[cell.value for cell in row] for row in ws.iter_rows()],
+                         [['Год', 'Средняя зарплата', 'Средняя зарплата - Аналитик', 'Количество вакансий',
+                           'Количество вакансий - Аналитик'],
+                          [2007, 22500, 15000, 2, 1],
+                          [2008, 1517500, 40000, 2, 1]])
+        self.assertTrue(ws['A1'].font.b)
+        self.assertEqual(ws['B2'].border.left.style, 'thin')
+        self.assertAlmostEqual(ws.column_dimensions['C'].width, len('Средняя зарплата - Аналитик') * 1.23)
+        self.assertEqual([cell.value for cell in wb['Статистика по городам']['E']][1:], ['50.0%', '25.0%', '25.0%'])
+
+    def test_excel_period_titles(self):
+        aggregator = VacancyFrame.from_file(self.file_name).to_aggregators(['Аналитик'], period='quarter')[0]
+        Report(self.output_path.name).generate_excel('Аналитик', StatisticsByYear('Аналитик', aggregator=aggregator),
+                                                     self.statistics_by_cities)
+        wb = load_workbook(os.path.join(self.output_path.name, 'report.xlsx'))
+        self.assertEqual(wb.sheetnames, ['Статистика по кварталам', 'Статистика по городам'])
+        self.assertEqual([cell.value for cell in wb['Статистика по кварталам']['A']],
+                         ['Квартал', '2007-Q1', '2008-Q1', '2008-Q4'])
+
+    def test_excel_quantiles(self):
+        aggregator = VacancyFrame.from_file(self.file_name).to_aggregators(['Аналитик'], is_quantiles=True)[0]
+        Report(self.output_path.name).generate_excel('Аналитик', StatisticsByYear('Аналитик', aggregator=aggregator),
+                                                     StatisticsByCities(aggregator=aggregator))
+        wb = load_workbook(os.path.join(self.output_path.name, 'report.xlsx'))
+        self.assertEqual([[cell.value for cell in row][5:] for row in wb['Статистика по годам'].iter_rows()],
+                         [['p10 зарплат', 'Медиана зарплат', 'p90 зарплат', 'p10 зарплат - Аналитик',
+                           'Медиана зарплат - Аналитик', 'p90 зарплат - Аналитик'],
+                          [15000, 15000, 30000, 15000, 15000, 15000],
+                          [40000, 40000, 2995000, 40000, 40000, 40000]])
+        self.assertEqual([[cell.value for cell in row] for row in wb['Статистика по городам'].iter_rows(max_col=5)],
+                         [['Город', 'Уровень зарплат', 'p10 зарплат', 'Медиана зарплат', 'p90 зарплат'],
+                          ['Курган', 2995000, 2995000, 2995000, 2995000],
+                          ['Казань', 30000, 30000, 30000, 30000],
+                          ['Москва', 27500, 15000, 15000, 40000]])
+
+    def test_profession_period_gaps(self):
+        file_name = self.write_csv([['Аналитик', '10000', '20000', 'RUR', 'Москва', '2007-01-01T10:00:00+0300'],
+                                    ['Программист', '30000', '30000', 'RUR', 'Казань', '2007-02-01T10:00:00+0300'],
+                                    ['Аналитик', '50000', '60000', 'RUR', 'Москва', '2007-03-01T10:00:00+0300']])
+        aggregator = VacancyFrame.from_file(file_name).to_aggregators(['Аналитик'], period='month')[0]
+        statistics_by_year = StatisticsByYear('Аналитик', aggregator=aggregator)
+        report = Report(self.output_path.name, pdf_backend='matplotlib')
+        report.generate_excel('Аналитик', statistics_by_year, StatisticsByCities(aggregator=aggregator))
+        wb = load_workbook(os.path.join(self.output_path.name, 'report.xlsx'))
+        self.assertEqual(list(wb['Статистика по месяцам'].iter_rows(values_only=True))[1:],
+                         [('2007-01', 15000, 15000, 1, 1), ('2007-02', 30000, 0, 1, 0),
+                          ('2007-03', 55000, 55000, 1, 1)])
+        report.generate_pdf('Аналитик', statistics_by_year, StatisticsByCities(aggregator=aggregator))
+        self.assertTrue(os.path.exists(os.path.join(self.output_path.name, 'report.pdf')))
+
+    def test_excel_details(self):
+        wb = self.generate_excel(DataSet(self.file_name, '', 2007, 2014, is_stream=True))
+        self.assertEqual(list(wb['Вакансии'].iter_rows(values_only=True)),
+                         [('Название', 'Средняя зарплата в рублях', 'Название региона', 'Дата публикации вакансии'),
+                          ('Аналитик', 15000, 'Москва', '01.01.2007'),
+                          ('Аналитик', 40000, 'Москва', '01.12.2008')])
+
+    def test_excel_details_sheet_limit(self):
+        with patch('Report.max_sheet_rows', 2):
+            wb = self.generate_excel(DataSet(self.file_name, '', 2007, 2014, is_stream=True))
+        self.assertEqual(wb.sheetnames, ['Статистика по годам', 'Статистика по городам', 'Вакансии', 'Вакансии 2'])
+        for title, vacancy in [('Вакансии', ('Аналитик', 15000, 'Москва', '01.01.2007')),
+                               ('Вакансии 2', ('Аналитик', 40000, 'Москва', '01.12.2008'))]:
+            self.assertEqual(list(wb[title].iter_rows(values_only=True)),
+                             [tuple(column_title for column_title, _ in details_titles), vacancy])
+
+    def test_pdf_html_quantiles_without_sketch(self):
+        aggregator = VacancyFrame.from_file(self.file_name).to_aggregators(['Аналитик'], is_quantiles=True)[0]
+        statistics_by_cities = StatisticsByCities(aggregator=aggregator)
+        del statistics_by_cities.dict_dynamics_quantiles_slr_cities['Казань']
+        with patch('pdfkit.configuration'), patch('pdfkit.from_string') as from_string:
+            Report(self.output_path.name, pdf_backend='wkhtmltopdf').generate_pdf(
+                'Аналитик', StatisticsByYear('Аналитик', aggregator=aggregator), statistics_by_cities)
+        html = from_string.call_args[0][0]
+        self.assertIn('<td>Казань</td>', html)
+        self.assertNotIn('None', html)
+
+    def test_pdf_matplotlib_quantiles(self):
+        aggregator = VacancyFrame.from_file(self.file_name).to_aggregators(['Аналитик'], is_quantiles=True)[0]
+        Report(self.output_path.name, pdf_backend='matplotlib').generate_pdf(
+            'Аналитик', StatisticsByYear('Аналитик', aggregator=aggregator), StatisticsByCities(aggregator=aggregator))
+        self.assertTrue(os.path.exists(os.path.join(self.output_path.name, 'report.pdf')))
+
+    def test_pdf_matplotlib(self):
+        report = Report(self.output_path.name, pdf_backend='matplotlib')
+        font_size = matplotlib.rcParams['font.size']
+        report.generate_image('Аналитик', self.statistics_by_year, self.statistics_by_cities)
+        self.assertEqual(matplotlib.rcParams['font.size'], font_size)
+        report.generate_pdf('Аналитик', self.statistics_by_year, self.statistics_by_cities)
+        self.assertIsNone(report._Report__figure)
+        with open(os.path.join(self.output_path.name, 'report.pdf'), 'rb') as read_file:
+            pdf = read_file.read()
+        self.assertTrue(pdf.startswith(b'%PDF'))
+        self.assertEqual(len(re.findall(rb'/Type /Page\b(?!s)', pdf)), 2)
@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+
+from StatisticsByYear import StatisticsByYear
+from TaskExecutor import TaskExecutor
+from Tests.CsvFixtures import CsvTestCase
+
+rows_2007 = [['Аналитик', '10000', '20000', 'RUR', 'Москва', '2007-01-01T10:00:00+0300'],
+             ['Программист', '30000', '30000', 'RUR', 'Москва', '2007-02-01T10:00:00+0300']]
+rows_2007_2008 = [['Аналитик', '40000', '40000', 'RUR', 'Москва', '2007-12-01T10:00:00+0300'],
+                  ['Аналитик', '50000', '50000', 'RUR', 'Москва', '2008-01-01T10:00:00+0300']]
+
+
+class StatisticsByYearTests(CsvTestCase):
+    def setUp(self):
+        self.file_names = [self.write_csv(rows_2007), self.write_csv(rows_2007_2008)]
+
+    def test_same_year_in_chunks(self):
+        statistics = StatisticsByYear('Аналитик', self.file_names)
+        self.assertEqual(statistics.dict_dynamics_slr, {2007: 28333, 2008: 50000})
+        self.assertEqual(statistics.dict_dynamics_count_vac, {2007: 3, 2008: 1})
+        self.assertEqual(statistics.dict_dynamics_slr_name, {2007: 27500, 2008: 50000})
+        self.assertEqual(statistics.dict_dynamics_count_vac_name, {2007: 2, 2008: 1})
+
+    def test_chunk_order(self):
+        self.assertEqual(StatisticsByYear('Аналитик', self.file_names[::-1]).dict_dynamics_slr,
+                         StatisticsByYear('Аналитик', self.file_names).dict_dynamics_slr)
+
+    def test_from_manifest(self):
+        with tempfile.TemporaryDirectory() as output_path:
+            manifest_file_name = os.path.join(output_path, 'manifest.json')
+            with open(manifest_file_name, 'w', encoding='utf-8') as manifest_file:
+                json.dump({'partitions': {str(index): {'file_name': file_name, 'rows': 2,
+                                                       'bytes': os.path.getsize(file_name)}
+                                          for index, file_name in enumerate(self.file_names)}}, manifest_file)
+            statistics = StatisticsByYear.from_manifest('Аналитик', manifest_file_name,
+                                                        executor=TaskExecutor('serial'))
+        self.assertEqual(vars(statistics), vars(StatisticsByYear('Аналитик', self.file_names)))
+
+    def test_carriage_return_chunk(self):
+        file_name = self.write_csv(rows_2007 + rows_2007_2008, '\r')
+        self.assertEqual(vars(StatisticsByYear.from_csv('Аналитик', file_name, 2, TaskExecutor('serial'))),
+                         vars(StatisticsByYear('Аналитик', [file_name], executor=TaskExecutor('serial'))))
+        self.assertEqual(StatisticsByYear.from_csv('Аналитик', file_name, 2, TaskExecutor('serial'))
+                         .dict_dynamics_count_vac, {2007: 3, 2008: 1})
+
+    def test_executor_not_shut_down(self):
+        with TaskExecutor('thread', max_workers=2, min_parallel_bytes=0) as executor:
+            first = StatisticsByYear('Аналитик', self.file_names, executor=executor)
+            self.assertIsNotNone(executor._TaskExecutor__pool)
+            second = StatisticsByYear.from_csv('Аналитик', self.file_names[1], executor=executor)
+            self.assertIsNotNone(executor._TaskExecutor__pool)
+        self.assertEqual(first.dict_dynamics_count_vac, {2007: 3, 2008: 1})
+        self.assertEqual(second.dict_dynamics_count_vac, {2007: 1, 2008: 1})
+
+    def test_nothing_to_count(self):
+        with self.assertRaises(ValueError):
+            StatisticsByYear('Аналитик')
+
+    def test_quantiles_in_chunks(self):
+        statistics = StatisticsByYear('Аналитик', self.file_names, is_quantiles=True)
+        self.assertEqual(statistics.dict_dynamics_quantiles_slr,
+                         {2007: {'p10': 15000, 'median': 30000, 'p90': 40000},
+                          2008: {'p10': 50000, 'median': 50000, 'p90': 50000}})
+        self.assertEqual(statistics.dict_dynamics_quantiles_slr_name,
+                         {2007: {'p10': 15000, 'median': 15000, 'p90': 40000},
+                          2008: {'p10': 50000, 'median': 50000, 'p90': 50000}})
+        self.assertEqual(StatisticsByYear('Аналитик', self.file_names).dict_dynamics_quantiles_slr, {})
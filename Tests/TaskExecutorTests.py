@@ -0,0 +1,18 @@
+from unittest import TestCase
+
+from TaskExecutor import TaskExecutor, backends
+
+
+class TaskExecutorTests(TestCase):
+    def test_backends_same_result(self):
+        for backend in backends:
+            with TaskExecutor(backend, max_workers=2, chunksize=2, min_parallel_bytes=0) as executor:
+                self.assertEqual(executor.map(pow, [2, 3, 4], [2, 2, 2], total_bytes=10), [4, 9, 16])
+
+    def test_serial_fallback_for_small_input(self):
+        with TaskExecutor('process', max_workers=2) as executor:
+            self.assertEqual(executor.map(lambda x: x * 2, [1, 2], total_bytes=100), [2, 4])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            TaskExecutor('gpu')
@@ -0,0 +1,84 @@
+from datetime import date, timedelta
+
+from CsvChunks import get_byte_ranges
+from StatisticsByCities import StatisticsByCities
+from StatisticsByYear import StatisticsByYear
+from TaskExecutor import TaskExecutor
+from Tests.CsvFixtures import CsvTestCase
+from VacancyAggregator import VacancyAggregator, get_period
+from VacancyFrame import VacancyFrame
+
+aggregator_rows = [['Аналитик данных', '10000', '20000', 'RUR', 'Москва', '2006-05-01T10:00:00+0300'],
+                   ['Программист', '30000', '50000', 'RUR', 'Москва', '2007-05-01T10:00:00+0300'],
+                   ['Ведущий аналитик', '1000', '2000', 'USD', 'Казань', '2008-02-11T10:00:00+0300'],
+                   ['Системный аналитик', '15000', '25000', 'RUR', 'Курган', '2014-12-31T23:59:59+0300'],
+                   ['Водитель', '15000', '25000', 'RUR', 'Курган', '2015-01-01T00:00:00+0300']]
+
+
+class VacancyAggregatorTests(CsvTestCase):
+    csv_rows = aggregator_rows
+
+    def setUp(self):
+        super().setUp()
+        self.aggregator = VacancyAggregator.from_file(self.file_name, 'аналитик')
+
+    def test_count_vac(self):
+        self.assertEqual(self.aggregator.dict_count_vac, {2007: 1, 2008: 1, 2014: 1})
+
+    def test_count_vac_name(self):
+        self.assertEqual(self.aggregator.dict_count_vac_name, {2008: 1, 2014: 1})
+
+    def test_count_vac_cities(self):
+        self.assertEqual(self.aggregator.dict_count_vac_cities, {'Москва': 1, 'Казань': 1, 'Курган': 1})
+
+    def test_year_view(self):
+        self.assertEqual(StatisticsByYear('аналитик', aggregator=self.aggregator).dict_dynamics_slr,
+                         {2007: 40000, 2008: 90990, 2014: 20000})
+
+    def test_cities_view_same_as_file(self):
+        self.assertEqual(StatisticsByCities(aggregator=self.aggregator).dict_dynamics_slr_cities,
+                         StatisticsByCities(self.file_name, 'аналитик').dict_dynamics_slr_cities)
+
+    def test_merge_byte_ranges(self):
+        aggregator = VacancyAggregator('аналитик')
+        for byte_range in get_byte_ranges(self.file_name, 3):
+            aggregator.merge(VacancyAggregator.from_file(self.file_name, 'аналитик', byte_range=byte_range))
+        self.assertEqual(aggregator.dict_count_vac_cities, self.aggregator.dict_count_vac_cities)
+        self.assertEqual(aggregator.get_mean(aggregator.dict_sum_slr, aggregator.dict_count_vac),
+                         self.aggregator.get_mean(self.aggregator.dict_sum_slr, self.aggregator.dict_count_vac))
+
+    def test_periods(self):
+        self.assertEqual(VacancyAggregator.from_file(self.file_name, 'аналитик', period='quarter').dict_count_vac,
+                         {'2007-Q2': 1, '2008-Q1': 1, '2014-Q4': 1})
+        self.assertEqual(StatisticsByYear.from_csv('аналитик', self.file_name, 2, TaskExecutor('serial'),
+                                                   period='month').dict_dynamics_count_vac_name,
+                         {'2008-02': 1, '2014-12': 1})
+        self.assertEqual(VacancyAggregator.from_file(self.file_name, 'аналитик', period='week').dict_count_vac_name,
+                         {'2008-W07': 1, '2015-W01': 1})
+        with self.assertRaises(ValueError):
+            VacancyAggregator('аналитик', 'day')
+
+    def test_periods_same_as_frame(self):
+        days = [date(2003, 1, 1) + timedelta(days) for days in range(0, 7305, 3)]
+        file_name = self.write_csv([['Аналитик', '10000', '20000', 'RUR', 'Москва', f'{day}T10:00:00+0300']
+                                    for day in days])
+        frame = VacancyFrame.from_file(file_name)
+        for period in ['year', 'quarter', 'month', 'week']:
+            self.assertEqual(vars(frame.to_aggregators(['Аналитик'], 2003, 2022, period)[0]),
+                             vars(VacancyAggregator.from_file(file_name, 'Аналитик', 2003, 2022, period=period)))
+        self.assertEqual([get_period(str(day), 'week') for day in days],
+                         [f'{day.isocalendar()[0]}-W{day.isocalendar()[1]:02d}' for day in days])
+
+    def test_quantiles_same_as_frame(self):
+        aggregator = VacancyAggregator('аналитик', is_quantiles=True)
+        for byte_range in get_byte_ranges(self.file_name, 3):
+            aggregator.merge(VacancyAggregator.from_file(self.file_name, 'аналитик', byte_range=byte_range,
+                                                         is_quantiles=True))
+        frame_aggregator = VacancyFrame.from_file(self.file_name).to_aggregators(['аналитик'], is_quantiles=True)[0]
+        for attribute in ['dict_sketch_slr', 'dict_sketch_slr_name', 'dict_sketch_slr_cities']:
+            self.assertEqual(aggregator.get_quantiles(getattr(aggregator, attribute)),
+                             aggregator.get_quantiles(getattr(frame_aggregator, attribute)))
+        self.assertEqual(StatisticsByCities(aggregator=aggregator).dict_dynamics_quantiles_slr_cities,
+                         {city: {'p10': salary, 'median': salary, 'p90': salary} for city, salary in
+                          StatisticsByCities(aggregator=aggregator).dict_dynamics_slr_cities.items()})
+        self.assertEqual(StatisticsByCities(aggregator=self.aggregator).dict_dynamics_quantiles_slr_cities, {})
@@ -0,0 +1,83 @@
+import os
+import tempfile
+
+from Tests.CsvFixtures import CsvTestCase
+from VacancyAggregator import VacancyAggregator
+from VacancyFrame import VacancyFrame
+
+frame_rows = [['Аналитик <b>данных</b>', '10000.0', '20000.0', 'RUR', 'Москва', '2006-05-01T10:00:00+0300'],
+              ['Программист', '30000.0', '50000.0', 'RUR', ' Москва ', '2007-05-01T10:00:00+0300'],
+              ['Ведущий  аналитик', '1000', '2000', 'USD', 'Казань', '2008-02-11T10:00:00+0300'],
+              ['Бухгалтер', '', '20000.0', 'RUR', 'Москва', '2008-03-01T10:00:00+0300'],
+              ['Системный\nаналитик', '15000', '25000', 'RUR', 'Курган', '2014-12-31T23:59:59+0300'],
+              ['Водитель', '15000', '25000', 'RUR', 'Курган', '2015-01-01T00:00:00+0300']]
+
+
+class VacancyFrameTests(CsvTestCase):
+    csv_rows = frame_rows
+
+    def setUp(self):
+        super().setUp()
+        self.frame = VacancyFrame.from_file(self.file_name)
+
+    def test_len(self):
+        self.assertEqual(len(self.frame), 5)
+
+    def test_areas_interned(self):
+        self.assertEqual(self.frame.areas, ['Москва', 'Казань', 'Курган'])
+
+    def test_name_mask(self):
+        self.assertEqual(self.frame.name_mask('аналитик').tolist(), [False, False, True, True, False])
+
+    def test_name_rows_same_as_mask(self):
+        for name in ['аналитик', 'Аналитик', 'ан', 'к', '', 'Программист', 'нет такой']:
+            self.assertEqual(self.frame.name_rows(name).tolist(), self.frame.name_mask(name).nonzero()[0].tolist())
+
+    def test_same_as_row_aggregator(self):
+        expected = VacancyAggregator.from_file(self.file_name, 'аналитик')
+        actual = self.frame.to_aggregator('аналитик')
+        for attribute in ['dict_sum_slr', 'dict_count_vac', 'dict_sum_slr_name', 'dict_count_vac_name',
+                          'dict_sum_slr_cities', 'dict_count_vac_cities']:
+            self.assertEqual(list(getattr(actual, attribute).items()), list(getattr(expected, attribute).items()))
+
+    def test_batch_same_as_single(self):
+        names = ['аналитик', 'Программист', 'нет такой']
+        for actual, name in zip(self.frame.to_aggregators(names), names):
+            expected = self.frame.to_aggregator(name)
+            self.assertEqual(actual.name, name)
+            for attribute in ['dict_sum_slr', 'dict_count_vac', 'dict_sum_slr_name', 'dict_count_vac_name',
+                              'dict_sum_slr_cities', 'dict_count_vac_cities']:
+                self.assertEqual(getattr(actual, attribute), getattr(expected, attribute))
+
+    def test_cache_same_as_file(self):
+        with tempfile.TemporaryDirectory() as cache_path:
+            VacancyFrame.from_cache(self.file_name, cache_path)
+            self.assertEqual(len(os.listdir(cache_path)), 2)
+            frame = VacancyFrame.from_cache(self.file_name, cache_path)
+        self.assertEqual(frame.names, self.frame.names)
+        self.assertEqual(frame.name_rows('аналитик').tolist(), [2, 3])
+        self.assertEqual(frame.areas, self.frame.areas)
+        self.assertEqual(frame.get_salary_to_rub().tolist(), self.frame.get_salary_to_rub().tolist())
+        self.assertEqual(frame.year.tolist(), self.frame.year.tolist())
+
+    def test_save_load_strings(self):
+        names = ['Системный\nаналитик', 'а' * 250, 'Программист', '']
+        frame = VacancyFrame(self.frame.salary_from, self.frame.salary_to, self.frame.currency, self.frame.year,
+                             self.frame.month, self.frame.day, self.frame.area_id, self.frame.name_id,
+                             self.frame.areas, names)
+        with tempfile.TemporaryDirectory() as cache_path:
+            file_name = os.path.join(cache_path, 'frame.npz')
+            frame.save(file_name)
+            loaded = VacancyFrame.load(file_name)
+        self.assertEqual(loaded.names, names)
+        self.assertEqual(loaded.areas, self.frame.areas)
+        self.assertEqual(loaded.name_id.tolist(), self.frame.name_id.tolist())
+        self.assertEqual(VacancyFrame.decode_strings(*VacancyFrame.encode_strings([])), [])
+
+    def test_cache_invalidated_on_change(self):
+        with tempfile.TemporaryDirectory() as cache_path:
+            VacancyFrame.from_cache(self.file_name, cache_path)
+            with open(self.file_name, 'a', encoding='utf-8') as file:
+                file.write('Программист,1000,2000,RUR,Москва,2010-01-01T10:00:00+0300\n')
+            self.assertEqual(len(VacancyFrame.from_cache(self.file_name, cache_path)), 6)
+            self.assertEqual(len(os.listdir(cache_path)), 4)
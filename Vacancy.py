@@ -1,4 +1,40 @@
-from Salary import Salary
+import sys
+from functools import lru_cache
+
+from CurrencyRates import get_currency_rates
+from Salary import Salary, currency_to_rub
+
+
+@lru_cache(maxsize=4096)
+def get_salary(salary_from: str, salary_to: str, salary_currency: str, salary_avg: str, month=None) -> Salary:
+    """Получение общего объекта зарплаты для одинаковых значений оклада, валюты и месяца курса
+
+    :param salary_from: Оклад 'от'
+    :param salary_to: Оклад 'до'
+    :param salary_currency: Валюта
+    :param salary_avg: Средний оклад
+    :param month: Месяц публикации 'ГГГГ-ММ' для курса по дате, None - курс из currency_to_rub
+    :return: Зарплата
+    >>> get_salary('10', '20', 'RUR', '') is get_salary('10', '20', 'RUR', '')
+    True
+    """
+    currency_rate = None
+    if month is not None and salary_currency in currency_to_rub:
+        currency_rate = get_currency_rates().get_rate(salary_currency, month)
+    return Salary(salary_from=salary_from, salary_to=salary_to, salary_currency=salary_currency, salary_avg=salary_avg,
+                  currency_rate=currency_rate)
+
+
+@lru_cache(maxsize=None)
+def get_year(published_at_year: str) -> int:
+    """Получение общего объекта года публикации
+
+    :param published_at_year: Год публикации
+    :return: Год публикации
+    >>> get_year('2007')
+    2007
+    """
+    return int(published_at_year)
 
 
 class Vacancy:
@@ -9,25 +45,36 @@ class Vacancy:
         salary (Salary): Зарплата
         area_name (str): Регион
         published_at (str): Дата публикации
-        published_at_year (str): Год публикации
+        published_at_year (int): Год публикации
     """
+    __slots__ = ('name', 'salary', 'area_name', 'published_at', 'published_at_year')
 
-    def __init__(self, dict_vacancy: dict):
+    def __init__(self, dict_vacancy: dict, is_dated=None):
         """Инициализирует класс вакансии из словаря вакансии
 
+        Названия, регионы, зарплаты и годы хранятся в единственном экземпляре для одинаковых значений.
+        Если задана таблица курсов по датам, зарплата в валюте переводится по курсу месяца публикации
+
         :param dict_vacancy: Словарь вакансии
+        :param is_dated: Есть ли курсы по датам, None - из get_currency_rates(), при чтении файла DataSet
+            узнаёт это один раз и передаёт сюда
         """
-        self.name = dict_vacancy['name']
+        if is_dated is None:
+            is_dated = get_currency_rates().is_dated
+        self.name = sys.intern(dict_vacancy['name'])
+        self.published_at = dict_vacancy['published_at']
         if 'salary' in dict_vacancy.keys():
-            self.salary = Salary(salary_avg=dict_vacancy['salary'])
+            self.salary = get_salary('', '', '', dict_vacancy['salary'])
         else:
-            self.salary = Salary(salary_from=dict_vacancy['salary_from'],
-                                 salary_to=dict_vacancy['salary_to'],
-                                 salary_currency=dict_vacancy['salary_currency'])
-        self.area_name = dict_vacancy['area_name']
-        self.published_at = dict_vacancy['published_at']
+            salary_currency = dict_vacancy['salary_currency']
+            self.salary = get_salary(dict_vacancy['salary_from'],
+                                     dict_vacancy['salary_to'],
+                                     salary_currency,
+                                     '',
+                                     self.published_at[:7] if is_dated and salary_currency != 'RUR' else None)
+        self.area_name = sys.intern(dict_vacancy['area_name'])
 
         # str(parser.parse(dict_vacancy['published_at']).date())
         # '.'.join(str(datetime.datetime.strptime(dict_vacancy['published_at'], '%Y-%m-%dT%H:%M:%S%z').date()).split('-'))
 
-        self.published_at_year = int(self.published_at[:4])
+        self.published_at_year = get_year(self.published_at[:4])
@@ -0,0 +1,423 @@
+import hashlib
+import os
+from array import array
+
+import numpy as np
+
+from CurrencyRates import currency_codes, get_currency_rates
+from DataSet import DataSet
+from NameIndex import NameIndex
+from Profiler import profiler
+from QuantileSketch import QuantileSketch
+from VacancyAggregator import VacancyAggregator
+
+cache_version = 5
+
+
+class VacancyFrame:
+    """Колоночное хранилище вакансий на массивах NumPy
+
+    Attributes:
+        salary_from (np.ndarray): Оклад 'от'
+        salary_to (np.ndarray): Оклад 'до'
+        currency (np.ndarray): Код валюты, индекс в currency_codes
+        year (np.ndarray): Год публикации
+        month (np.ndarray): Месяц публикации 1 - 12, нужен для курса валюты по дате
+        day (np.ndarray): День публикации 1 - 31, нужен для статистики по неделям
+        area_id (np.ndarray): Номер региона в списке areas
+        name_id (np.ndarray): Номер названия вакансии в списке names
+        areas (list): Список уникальных регионов
+        names (list): Список уникальных названий вакансий
+        name_index (NameIndex): Индекс названий, строится при первом поиске или загружается из кэша
+    """
+
+    def __init__(self, salary_from, salary_to, currency, year, month, day, area_id, name_id, areas: list,
+                 names: list):
+        """Инициализация колоночного хранилища из готовых столбцов
+
+        :param salary_from: Оклад 'от'
+        :param salary_to: Оклад 'до'
+        :param currency: Код валюты
+        :param year: Год публикации
+        :param month: Месяц публикации
+        :param day: День публикации
+        :param area_id: Номер региона
+        :param name_id: Номер названия вакансии
+        :param areas: Список уникальных регионов
+        :param names: Список уникальных названий вакансий
+        """
+        self.salary_from = np.asarray(salary_from, dtype=np.float64)
+        self.salary_to = np.asarray(salary_to, dtype=np.float64)
+        self.currency = np.asarray(currency, dtype=np.int8)
+        self.year = np.asarray(year, dtype=np.int16)
+        self.month = np.asarray(month, dtype=np.int8)
+        self.day = np.asarray(day, dtype=np.int8)
+        self.area_id = np.asarray(area_id, dtype=np.int32)
+        self.name_id = np.asarray(name_id, dtype=np.int32)
+        self.areas = areas
+        self.names = names
+        self.name_index = None
+
+    def __len__(self):
+        return len(self.year)
+
+    @classmethod
+    def from_file(cls, file_name: str, start=0, end=9999, byte_range=None):
+        """Построение хранилища за один проход по .csv без создания объектов Vacancy и Salary
+
+        :param file_name: Имя файла
+        :param start: С какого года загружать вакансии
+        :param end: По какой год загружать вакансии
+        :param byte_range: Кортеж (начало, конец) в байтах по границам записей, загружать только этот диапазон
+        :return: Колоночное хранилище вакансий
+        """
+        with profiler.stage('read'):
+            salary_from, salary_to = array('d'), array('d')
+            currency, year, month, day = array('b'), array('h'), array('b'), array('b')
+            area_id, name_id = array('i'), array('i')
+            currency_index = {code: index for index, code in enumerate(currency_codes)}
+            area_index, name_index = {}, {}
+            for row in DataSet(file_name, '', start, end, is_stream=True, byte_range=byte_range).iter_rows():
+                if 'salary' in row:
+                    salary_from.append(int(float(row['salary'])))
+                    salary_to.append(int(float(row['salary'])))
+                    currency.append(currency_index['RUR'])
+                else:
+                    if row['salary_currency'] not in currency_index:
+                        raise ValueError('Неверно введна валюта')
+                    salary_from.append(int(float(row['salary_from'])))
+                    salary_to.append(int(float(row['salary_to'])))
+                    currency.append(currency_index[row['salary_currency']])
+                year.append(int(row['published_at'][:4]))
+                month.append(int(row['published_at'][5:7]))
+                day.append(int(row['published_at'][8:10]))
+                area_id.append(area_index.setdefault(row['area_name'], len(area_index)))
+                name_id.append(name_index.setdefault(row['name'], len(name_index)))
+            return cls(np.frombuffer(salary_from, dtype=np.float64),
+                       np.frombuffer(salary_to, dtype=np.float64),
+                       np.frombuffer(currency, dtype=np.int8),
+                       np.frombuffer(year, dtype=np.int16),
+                       np.frombuffer(month, dtype=np.int8),
+                       np.frombuffer(day, dtype=np.int8),
+                       np.frombuffer(area_id, dtype=np.int32),
+                       np.frombuffer(name_id, dtype=np.int32),
+                       list(area_index),
+                       list(name_index))
+
+    @classmethod
+    def from_cache(cls, file_name: str, cache_path='Cache'):
+        """Загрузка хранилища из двоичного кэша .npz, при отсутствии кэша - разбор .csv и сохранение кэша
+
+        Кэш привязан к полному пути, времени изменения и размеру .csv, поэтому изменённый файл разбирается заново.
+        Рядом с кэшем столбцов хранится индекс названий
+
+        :param file_name: Имя файла
+        :param cache_path: Папка кэша
+        :return: Колоночное хранилище вакансий
+        """
+        stat = os.stat(file_name)
+        key = f'{os.path.abspath(file_name)}|{stat.st_mtime_ns}|{stat.st_size}|{cache_version}'
+        cache_name = os.path.join(cache_path, hashlib.sha1(key.encode('utf-8')).hexdigest())
+        cache_file_name, index_file_name = cache_name + '.npz', cache_name + '.names.npz'
+        frame = cls.load(cache_file_name) if os.path.exists(cache_file_name) else None
+        if frame is None:
+            frame = cls.from_file(file_name)
+            os.makedirs(cache_path, exist_ok=True)
+            frame.save(cache_file_name)
+        if os.path.exists(index_file_name):
+            frame.name_index = NameIndex.load(index_file_name, frame.names)
+        else:
+            frame.get_name_index().save(index_file_name)
+        return frame
+
+    def save(self, file_name: str):
+        """Сохранение столбцов в двоичный файл .npz
+
+        Регионы и названия хранятся байтами utf-8 подряд и границами строк: массив строк NumPy фиксированной
+        ширины занимал бы по самой длинной строке на каждую
+
+        :param file_name: Имя файла .npz
+        :return:
+        """
+        areas, area_offsets = self.encode_strings(self.areas)
+        names, name_offsets = self.encode_strings(self.names)
+        temp_file_name = file_name + '.tmp.npz'
+        np.savez(temp_file_name,
+                 version=np.array(cache_version),
+                 salary_from=self.salary_from,
+                 salary_to=self.salary_to,
+                 currency=self.currency,
+                 year=self.year,
+                 month=self.month,
+                 day=self.day,
+                 area_id=self.area_id,
+                 name_id=self.name_id,
+                 areas=areas,
+                 area_offsets=area_offsets,
+                 names=names,
+                 name_offsets=name_offsets)
+        os.replace(temp_file_name, file_name)
+
+    @classmethod
+    def load(cls, file_name: str):
+        """Загрузка столбцов из двоичного файла .npz
+
+        :param file_name: Имя файла .npz
+        :return: Колоночное хранилище вакансий или None, если файл другой версии
+        """
+        with profiler.stage('read_cache'), np.load(file_name, allow_pickle=False) as data:
+            if int(data['version']) != cache_version:
+                return None
+            return cls(data['salary_from'], data['salary_to'], data['currency'], data['year'], data['month'],
+                       data['day'], data['area_id'], data['name_id'],
+                       cls.decode_strings(data['areas'], data['area_offsets']),
+                       cls.decode_strings(data['names'], data['name_offsets']))
+
+    @staticmethod
+    def encode_strings(values: list) -> tuple:
+        """Кодирование списка строк в байты utf-8 подряд и границы строк для .npz без pickle
+
+        :param values: Список строк
+        :return: Кортеж (массив байт uint8, массив границ int64 длины len(values) + 1)
+        >>> VacancyFrame.encode_strings(['ab', 'в'])[1].tolist()
+        [0, 2, 4]
+        """
+        encoded = [value.encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+    @staticmethod
+    def decode_strings(data: np.ndarray, offsets: np.ndarray) -> list:
+        """Декодирование списка строк из encode_strings
+
+        :param data: Массив байт uint8
+        :param offsets: Массив границ строк
+        :return: Список строк
+        >>> VacancyFrame.decode_strings(*VacancyFrame.encode_strings(['ab', '', 'в\\nг']))
+        ['ab', '', 'в\\nг']
+        """
+        blob, offsets = data.tobytes(), offsets.tolist()
+        return [blob[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+    def get_salary_to_rub(self, rows=None) -> np.ndarray:
+        """Векторный подсчёт средней ЗП в рублях, совпадает с Salary.get_salary_to_rub
+
+        Курс берётся из таблицы курсов одной выборкой по номерам валюты и месяца
+
+        :param rows: Номера строк, None - все строки
+        :return: Массив средних ЗП в рублях
+        """
+        rates = get_currency_rates()
+        if rows is None:
+            currency, salary_from, salary_to = self.currency, self.salary_from, self.salary_to
+            year, month = self.year, self.month
+        else:
+            currency, salary_from, salary_to = self.currency[rows], self.salary_from[rows], self.salary_to[rows]
+            year, month = self.year[rows], self.month[rows]
+        if rates.is_dated:
+            currency_rate = rates.rates[currency, rates.get_month_ids(year, month)]
+        else:
+            currency_rate = rates.rates[currency, 0]
+        return currency_rate * (salary_to + salary_from) / 2
+
+    def get_name_index(self) -> NameIndex:
+        """Индекс названий вакансий, строится при первом обращении
+
+        :return: Индекс названий
+        """
+        if self.name_index is None:
+            self.name_index = NameIndex.from_names(self.names, self.name_id)
+        return self.name_index
+
+    def name_rows(self, name: str) -> np.ndarray:
+        """Номера строк вакансий, в названии которых есть подстрока name, в порядке файла
+
+        :param name: Название профессии
+        :return: Массив номеров строк
+        """
+        return self.get_name_index().get_rows(name)
+
+    def name_mask(self, name: str) -> np.ndarray:
+        """Маска вакансий, в названии которых есть подстрока name
+
+        Проверка подстроки выполняется один раз для каждого уникального названия
+
+        :param name: Название профессии
+        :return: Булев массив длины хранилища
+        """
+        return np.array([name in vac_name for vac_name in self.names], dtype=bool)[self.name_id]
+
+    def year_mask(self, start: int, end: int) -> np.ndarray:
+        """Маска вакансий, опубликованных с start по end год
+
+        :param start: С какого года
+        :param end: По какой год
+        :return: Булев массив длины хранилища
+        """
+        return (self.year >= start) & (self.year <= end)
+
+    def to_aggregator(self, name: str, start=2007, end=2014) -> VacancyAggregator:
+        """Векторная агрегация статистики по годам и городам
+
+        Суммы считаются через np.bincount в порядке строк файла, поэтому средние совпадают с построчным подсчётом.
+        Статистика по профессии считается только по строкам из индекса названий
+
+        :param name: Название профессии
+        :param start: С какого года учитывать вакансии
+        :param end: По какой год учитывать вакансии
+        :return: Заполненный агрегатор
+        """
+        return self.to_aggregators([name], start, end)[0]
+
+    def to_aggregators(self, names: list, start=2007, end=2014, period='year', is_quantiles=False) -> list:
+        """Агрегация статистики для нескольких профессий: статистика всех вакансий считается один раз,
+        статистика каждой профессии - по её строкам из индекса названий
+
+        Эскизы квантилей всех вакансий общие для возвращённых агрегаторов, VacancyAggregator.merge их не меняет
+
+        :param names: Названия профессий
+        :param start: С какого года учитывать вакансии
+        :param end: По какой год учитывать вакансии
+        :param period: Период статистики: 'year', 'quarter', 'month' или 'week'
+        :param is_quantiles: Собирать ли эскизы квантилей зарплат
+        :return: Список заполненных агрегаторов в порядке names
+        """
+        with profiler.stage('aggregate_by_year'):
+            mask = self.year_mask(start, end)
+            salary = self.get_salary_to_rub()[mask]
+            dict_sum_slr, dict_count_vac = self.__group_by_period(mask, salary, period)
+            dict_sketch_slr = self.__group_sketches_by_period(mask, salary, period) if is_quantiles else {}
+        with profiler.stage('aggregate_by_city'):
+            area_id = self.area_id[mask].astype(np.int64)
+            dict_sum_slr_cities, dict_count_vac_cities = self.__group_by(area_id, salary)
+            dict_sum_slr_cities = {self.areas[key]: val for key, val in dict_sum_slr_cities.items()}
+            dict_count_vac_cities = {self.areas[key]: val for key, val in dict_count_vac_cities.items()}
+            dict_sketch_slr_cities = {self.areas[key]: val for key, val in
+                                      self.__group_sketches(area_id, salary).items()} if is_quantiles else {}
+        aggregators = []
+        for name in names:
+            aggregator = VacancyAggregator(name, period, is_quantiles)
+            aggregator.dict_sum_slr, aggregator.dict_count_vac = dict(dict_sum_slr), dict(dict_count_vac)
+            with profiler.stage('aggregate_by_name'):
+                aggregator.dict_sum_slr_name, aggregator.dict_count_vac_name = self.get_name_statistics(name, start,
+                                                                                                       end, period)
+                if is_quantiles:
+                    rows = self.__get_name_rows(name, start, end)
+                    aggregator.dict_sketch_slr_name = self.__group_sketches_by_period(
+                        rows, self.get_salary_to_rub(rows), period)
+            aggregator.dict_sum_slr_cities = dict(dict_sum_slr_cities)
+            aggregator.dict_count_vac_cities = dict(dict_count_vac_cities)
+            aggregator.dict_sketch_slr = dict(dict_sketch_slr)
+            aggregator.dict_sketch_slr_cities = dict(dict_sketch_slr_cities)
+            aggregators.append(aggregator)
+        return aggregators
+
+    def get_name_statistics(self, name: str, start=2007, end=2014, period='year'):
+        """Суммы и количества зарплат по периодам для вакансий профессии, стоимость зависит от числа найденных строк
+
+        :param name: Название профессии
+        :param start: С какого года учитывать вакансии
+        :param end: По какой год учитывать вакансии
+        :param period: Период статистики
+        :return: Кортеж словарей сумм и количества по периодам
+        """
+        rows = self.__get_name_rows(name, start, end)
+        salary = self.get_salary_to_rub(rows)
+        return self.__group_by_period(rows, salary, period)
+
+    def __get_name_rows(self, name: str, start: int, end: int) -> np.ndarray:
+        """Номера строк профессии, опубликованных с start по end год
+
+        :param name: Название профессии
+        :param start: С какого года
+        :param end: По какой год
+        :return: Массив номеров строк
+        """
+        rows = self.name_rows(name)
+        year = self.year[rows]
+        return rows[(year >= start) & (year <= end)]
+
+    def __group_by_period(self, rows: np.ndarray, salary: np.ndarray, period: str):
+        """Группировка сумм и количества зарплат по периодам, ключи совпадают с VacancyAggregator
+
+        :param rows: Маска или номера строк
+        :param salary: Массив зарплат строк rows
+        :param period: Период статистики
+        :return: Кортеж словарей сумм и количества по периодам
+        """
+        codes, get_label = self.__get_period_codes(rows, period)
+        dict_sum_slr, dict_count_vac = self.__group_by(codes, salary)
+        return {get_label(code): val for code, val in dict_sum_slr.items()}, \
+               {get_label(code): val for code, val in dict_count_vac.items()}
+
+    def __group_sketches_by_period(self, rows: np.ndarray, salary: np.ndarray, period: str) -> dict:
+        """Эскизы квантилей зарплат по периодам, ключи совпадают с VacancyAggregator
+
+        :param rows: Маска или номера строк
+        :param salary: Массив зарплат строк rows
+        :param period: Период статистики
+        :return: Словарь эскизов по периодам
+        """
+        codes, get_label = self.__get_period_codes(rows, period)
+        return {get_label(code): sketch for code, sketch in self.__group_sketches(codes, salary).items()}
+
+    def __get_period_codes(self, rows: np.ndarray, period: str):
+        """Целые коды периодов строк и функция перевода кода в ключ VacancyAggregator
+
+        Периоды считаются векторно из столбцов года, месяца и дня: квартал и месяц - арифметикой над числами,
+        неделя ISO - через номер дня от 1970-01-01
+
+        :param rows: Маска или номера строк
+        :param period: Период статистики
+        :return: Кортеж массива кодов и функции код - ключ
+        """
+        year = self.year[rows].astype(np.int64)
+        if period == 'year':
+            return year, int
+        month = self.month[rows].astype(np.int64)
+        if period == 'quarter':
+            return year * 10 + (month - 1) // 3 + 1, lambda code: f'{code // 10}-Q{code % 10}'
+        if period == 'month':
+            return year * 100 + month, lambda code: f'{code // 100}-{code % 100:02d}'
+        if period == 'week':
+            days = ((year - 1970) * 12 + month - 1).astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+            thursday = days + self.day[rows] - 1
+            thursday += 3 - (thursday + 3) % 7
+            iso_year = thursday.astype('datetime64[D]').astype('datetime64[Y]').astype(np.int64)
+            week = (thursday - iso_year.astype('datetime64[Y]').astype('datetime64[D]').astype(np.int64)) // 7 + 1
+            return (iso_year + 1970) * 100 + week, lambda code: f'{code // 100}-W{code % 100:02d}'
+        raise ValueError(f'Неизвестный период: {period}')
+
+    @staticmethod
+    def __group_sketches(keys: np.ndarray, salary: np.ndarray) -> dict:
+        """Эскизы квантилей зарплат по ключу: строки сортируются по ключу, каждая группа добавляется одним массивом
+
+        :param keys: Массив неотрицательных целых ключей
+        :param salary: Массив зарплат
+        :return: Словарь ключ - QuantileSketch
+        """
+        order = np.argsort(keys, kind='stable')
+        unique_keys, group_starts = np.unique(keys[order], return_index=True)
+        dict_sketch_slr = {}
+        for key, group in zip(unique_keys.tolist(), np.split(salary[order], group_starts[1:])):
+            dict_sketch_slr[key] = QuantileSketch()
+            dict_sketch_slr[key].update_many(group)
+        return dict_sketch_slr
+
+    @staticmethod
+    def __group_by(keys: np.ndarray, salary: np.ndarray):
+        """Группировка сумм и количества зарплат по ключу в порядке первого появления ключа
+
+        :param keys: Массив неотрицательных целых ключей
+        :param salary: Массив зарплат
+        :return: Кортеж словарей сумм и количества по ключам
+        """
+        if len(keys) == 0:
+            return {}, {}
+        sums = np.bincount(keys, weights=salary)
+        counts = np.bincount(keys)
+        unique_keys, first_index = np.unique(keys, return_index=True)
+        ordered_keys = unique_keys[np.argsort(first_index)]
+        return {int(key): float(sums[key]) for key in ordered_keys}, \
+               {int(key): int(counts[key]) for key in ordered_keys}
@@ -1,37 +1,119 @@
-import cProfile, pstats, io
-from collections import Counter
-from os import walk
-from pstats import SortKey
+import argparse
+import os
+
+from CurrencyRates import rates_env_name
 from DataSet import DataSet
-from InputConnect import InputConnect
+from DateIndex import DateIndex
+from IncrementalStatistics import IncrementalStatistics
+from InputConnect import InputConnect, sort_keys_table
+from Profiler import profiler
 from Report import Report
+from ReportPipeline import ReportPipeline
 from StatisticsByCities import StatisticsByCities
 from StatisticsByYear import StatisticsByYear
+from VacancyAggregator import periods
+from VacancyFrame import VacancyFrame
+
+
+def get_details(file_name: str, frame=None) -> DataSet:
+    """Потоковый датасет листа вакансий .xlsx за 2007 - 2014 годы
+
+    Индекс дат из кэша используется всегда, а строится, только если в файле есть вакансии вне этих годов:
+    иначе индекс не сократит чтение, а его построение - лишний проход по файлу
+
+    :param file_name: Имя файла
+    :param frame: VacancyFrame файла, по которому видны годы вакансий, None - индекс только из кэша
+    :return: Потоковый датасет
+    """
+    date_index = DateIndex.load_cached(file_name)
+    if date_index is None and frame is not None and not frame.year_mask(2007, 2014).all():
+        date_index = DateIndex.from_cache(file_name)
+    return DataSet(file_name, '', 2007, 2014, is_stream=True, date_index=date_index)
+
 
 if __name__ == '__main__':
-    # pr = cProfile.Profile()
-    # pr.enable()
-    input_data = InputConnect()
-    changing_output = int(input('Таблица в консоль или отчет по статистике? (1 или 2): '))
-    if changing_output == 2:
-        dataset = DataSet(input_data.file_name, input_data.name, 2003, 2022)
-        # splitted_file_names = input_data.split()
-        splitted_file_names = list(map(lambda x: 'csv_files_by_year/' + x,
-                                       next(walk('csv_files_by_year'), (None, None, []))[2]))
-        statistics_by_year = StatisticsByYear(input_data.name, splitted_file_names)
-        statistics_by_cities = StatisticsByCities(input_data.file_name, input_data.name)
-        statistics_by_cities.print_statistics()
-        statistics_by_year.print_statistics()
-        report = Report()
-        report.generate_excel(input_data.name, statistics_by_year, statistics_by_cities)
-        report.generate_image(input_data.name, statistics_by_year, statistics_by_cities)
-        report.generate_pdf(input_data.name, statistics_by_year, statistics_by_cities)
-    elif changing_output == 1:
-        dataset = DataSet(input_data.file_name, input_data.name, 2003, 2022)
-        input_data.table_print(dataset.vacancies_objects_name, is_full_slr=False)
-    # pr.disable()
-    # s = io.StringIO()
-    # sortby = SortKey.CUMULATIVE
-    # ps = pstats.Stats(pr, stream=s).sort_stats(sortby)
-    # ps.print_stats()
-    # print(s.getvalue())
+    parser = argparse.ArgumentParser(description='Статистика вакансий')
+    parser.add_argument('--file', help='Имя файла в папке Resources')
+    parser.add_argument('--professions', nargs='+', default=[], help='Названия профессий для пакетного отчёта')
+    parser.add_argument('--professions-file', help='Файл с названиями профессий, по одному в строке')
+    parser.add_argument('--state', help='Файл накопленной статистики: читаются только дописанные в .csv вакансии')
+    parser.add_argument('--details', action='store_true', help='Выгрузить в .xlsx лист со всеми вакансиями профессии')
+    parser.add_argument('--pdf-backend', choices=['wkhtmltopdf', 'matplotlib'],
+                        help='Способ генерации .pdf, по умолчанию wkhtmltopdf, если он установлен')
+    parser.add_argument('--limit', type=int, help='Сколько вакансий вывести в таблицу')
+    parser.add_argument('--offset', type=int, default=0, help='Сколько вакансий таблицы пропустить')
+    parser.add_argument('--sort-by', choices=list(sort_keys_table), help='Столбец сортировки таблицы')
+    parser.add_argument('--reverse', action='store_true', help='Сортировать таблицу по убыванию')
+    parser.add_argument('--currency-rates', metavar='FILE',
+                        help='Курсы валют по месяцам: .csv, .xml ЦБ или папка с .xml, по умолчанию постоянные курсы')
+    parser.add_argument('--period', choices=periods, default='year',
+                        help='Период статистики и отчёта, по умолчанию год, отличный от года - без --state')
+    parser.add_argument('--quantiles', action='store_true',
+                        help='p10, медиана и p90 зарплат по годам и городам, ошибка ранга до ~1.65%%, без --state')
+    parser.add_argument('--profile', nargs='?', const='profile.json', metavar='FILE',
+                        help='Сохранить в .json время этапов, счётчики строк и пиковую память')
+    parser.add_argument('--profile-memory', action='store_true', help='Считать пик памяти через tracemalloc')
+    parser.add_argument('--profile-stats', metavar='FILE', help='Сохранить дамп cProfile для pstats')
+    args = parser.parse_args()
+    if args.state and args.period != 'year':
+        parser.error('--state накапливает статистику только по годам, --period с ним не задаётся')
+    if args.state and args.quantiles:
+        parser.error('--state не хранит эскизы квантилей, --quantiles с ним не задаётся')
+    if args.currency_rates:
+        os.environ[rates_env_name] = args.currency_rates
+    summary_file_name = profiler.start_from_env(args.profile, args.profile_memory, args.profile_stats)
+    try:
+        professions = list(dict.fromkeys(
+            args.professions + (InputConnect.read_professions(args.professions_file) if args.professions_file else [])))
+        input_data = InputConnect(args.file, professions=professions)
+        if input_data.professions:
+            if args.state:
+                incremental_statistics = IncrementalStatistics(input_data.file_name, input_data.professions, args.state)
+                incremental_statistics.update()
+                aggregators = [incremental_statistics.get_aggregator(name) for name in input_data.professions]
+                frame = None
+            else:
+                frame = VacancyFrame.from_cache(input_data.file_name)
+                aggregators = frame.to_aggregators(input_data.professions, period=args.period,
+                                                   is_quantiles=args.quantiles)
+            details = get_details(input_data.file_name, frame) if args.details else None
+            statistics_by_cities = StatisticsByCities(aggregator=aggregators[0])
+            statistics_by_cities.print_statistics()
+            jobs = []
+            for aggregator in aggregators:
+                if not aggregator.dict_count_vac_name:
+                    print(f'Нет данных: {aggregator.name}')
+                    continue
+                report = Report.for_profession(aggregator.name, details=details, pdf_backend=args.pdf_backend)
+                jobs.append((report, aggregator.name, StatisticsByYear(aggregator.name, aggregator=aggregator),
+                             statistics_by_cities))
+            with ReportPipeline() as report_pipeline:
+                report_pipeline.run_all(jobs)
+        else:
+            changing_output = int(input('Таблица в консоль или отчет по статистике? (1 или 2): '))
+            if changing_output == 2:
+                if args.state:
+                    incremental_statistics = IncrementalStatistics(input_data.file_name, [input_data.name], args.state)
+                    incremental_statistics.update()
+                    aggregator = incremental_statistics.get_aggregator(input_data.name)
+                    frame = None
+                else:
+                    frame = VacancyFrame.from_cache(input_data.file_name)
+                    aggregator = frame.to_aggregators([input_data.name], period=args.period,
+                                                      is_quantiles=args.quantiles)[0]
+                details = get_details(input_data.file_name, frame) if args.details else None
+                statistics_by_year = StatisticsByYear(input_data.name, aggregator=aggregator)
+                statistics_by_cities = StatisticsByCities(aggregator=aggregator)
+                statistics_by_cities.print_statistics()
+                statistics_by_year.print_statistics()
+                with ReportPipeline() as report_pipeline:
+                    report_pipeline.run(Report(details=details, pdf_backend=args.pdf_backend), input_data.name,
+                                        statistics_by_year, statistics_by_cities)
+            elif changing_output == 1:
+                dataset = DataSet(input_data.file_name, input_data.name, 2003, 2022, is_stream=True,
+                                  name_filter=input_data.name)
+                input_data.stream_table_print(dataset.iter_vacancies(), is_full_slr=False, limit=args.limit,
+                                              offset=args.offset, sort_title=args.sort_by, reverse=args.reverse)
+    finally:
+        if summary_file_name:
+            profiler.stop(summary_file_name)